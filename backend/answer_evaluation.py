@@ -0,0 +1,194 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from followup_questions import is_answer_text
+
+EVALUATION_PENDING = 'pending'
+EVALUATION_READY = 'ready'
+EVALUATION_FAILED = 'failed'
+
+RUBRIC = ['relevance', 'technical_depth', 'clarity']
+
+SYSTEM_PROMPT = """You are an expert interview assessor. Evaluate ONE answer from a technical interview against this rubric, scoring each criterion from 0 to 10:
+- relevance: does the answer address the question that was asked
+- technical_depth: correctness and depth of the technical content
+- clarity: structure and clarity of the explanation
+
+Return a JSON object with "rubric" (an object with the three criterion scores), "score" (overall score from 0 to 10), "strengths" (list of short strings), "gaps" (list of short strings) and "summary" (one or two sentences).
+
+Return only the JSON object."""
+
+SYNTHESIS_PROMPT = """You are an expert interview assessor. Each answer of the interview has already been evaluated individually. Combine these evaluations into a comprehensive evaluation report without re-scoring the answers.
+
+Structure your response as follows:
+1. CANDIDATE OVERVIEW
+2. STRENGTHS (list key strengths with examples)
+3. AREAS FOR IMPROVEMENT (list weaknesses with specific feedback)
+4. TECHNICAL SKILLS ASSESSMENT
+5. COMMUNICATION SKILLS
+6. OVERALL RECOMMENDATION (Recommend/Consider/Not Recommend)
+7. SCORE (out of 10)
+
+Be professional, constructive and specific. Base the SCORE on the per-answer scores."""
+
+
+class AnswerEvaluationError(Exception):
+    """Raised when an answer evaluation does not have the expected shape."""
+
+
+def build_messages(question, answer):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"Question: {question}\n\nCandidate's answer: {answer}"}
+    ]
+
+
+def _score(value, field):
+    try:
+        return max(0.0, min(10.0, float(value)))
+    except (TypeError, ValueError):
+        raise AnswerEvaluationError(f"'{field}' must be a number")
+
+
+def _string_list(value, field):
+    if not isinstance(value, list):
+        raise AnswerEvaluationError(f"'{field}' must be a list")
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+def parse_evaluation(content):
+    """Validate an evaluation completion and return it as a plain dict."""
+    try:
+        payload = json.loads(content)
+    except (TypeError, ValueError) as e:
+        raise AnswerEvaluationError(f"Response is not valid JSON: {str(e)}")
+    if not isinstance(payload, dict):
+        raise AnswerEvaluationError("Response is not a JSON object")
+
+    rubric = payload.get('rubric') or {}
+    if not isinstance(rubric, dict):
+        raise AnswerEvaluationError("'rubric' must be an object")
+    return {
+        'score': round(_score(payload.get('score'), 'score'), 1),
+        'rubric': {criterion: round(_score(rubric.get(criterion, 0), criterion), 1) for criterion in RUBRIC},
+        'strengths': _string_list(payload.get('strengths', []), 'strengths'),
+        'gaps': _string_list(payload.get('gaps', []), 'gaps'),
+        'summary': str(payload.get('summary', '')).strip()
+    }
+
+
+def unanswered_evaluation():
+    return {
+        'score': 0.0,
+        'rubric': {criterion: 0.0 for criterion in RUBRIC},
+        'strengths': [],
+        'gaps': ['No valid response recorded'],
+        'summary': 'The candidate did not give a usable answer to this question.'
+    }
+
+
+def build_synthesis_messages(questions, evaluations):
+    """Short report prompt built from the stored per-answer evaluations instead of the transcript."""
+    blocks = []
+    for i, (question, evaluation) in enumerate(zip(questions, evaluations)):
+        if not evaluation or evaluation.get('status') != EVALUATION_READY:
+            blocks.append(f"Q{i+1}: {question}\nNot evaluated.")
+            continue
+        rubric = ", ".join(f"{criterion} {evaluation['rubric'].get(criterion, 0)}" for criterion in RUBRIC)
+        blocks.append(
+            f"Q{i+1}: {question}\n"
+            f"Score: {evaluation['score']}/10 ({rubric})\n"
+            f"Strengths: {'; '.join(evaluation['strengths']) or 'none noted'}\n"
+            f"Gaps: {'; '.join(evaluation['gaps']) or 'none noted'}\n"
+            f"Summary: {evaluation['summary']}"
+        )
+    scored = [e['score'] for e in evaluations if e and e.get('status') == EVALUATION_READY]
+    average = f"{sum(scored) / len(scored):.1f}/10" if scored else "n/a"
+    return [
+        {"role": "system", "content": SYNTHESIS_PROMPT},
+        {"role": "user", "content": f"Average answer score: {average}\n\n" + "\n\n".join(blocks)}
+    ]
+
+
+class AnswerEvaluator:
+    """Scores each answer in the background as soon as its transcription is stored.
+
+    Evaluations are persisted under evaluations.<question index> on the
+    interview, so by the time the candidate finishes, the report only needs
+    a short synthesis call over them. Only the first stored answer for a
+    question is evaluated, matching the answer the report uses.
+    """
+
+    def __init__(self, db, evaluate_answer, workers=2, poll_interval=0.2):
+        self.db = db
+        self.evaluate_answer = evaluate_answer
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='answer-eval')
+
+    def on_response(self, interview_id, response):
+        """Start evaluating a freshly stored answer."""
+        try:
+            index = response['question_index']
+            claimed = self.db.interviews.update_one(
+                {'interview_id': interview_id, f'evaluations.{index}': {'$exists': False}},
+                {'$set': {f'evaluations.{index}': {
+                    'status': EVALUATION_PENDING,
+                    'started_at': datetime.now(timezone.utc)
+                }}}
+            )
+            if not claimed.modified_count:
+                return
+            transcription = response.get('transcription')
+            if not is_answer_text(transcription) or transcription.strip() == 'No response recorded':
+                # Nothing to send to the LLM
+                self._store(interview_id, index, unanswered_evaluation(), 0.0)
+                return
+            self._executor.submit(self._evaluate, interview_id, index, response.get('question', ''), transcription)
+        except Exception as e:
+            print(f"Error scheduling answer evaluation for interview {interview_id}: {str(e)}")
+
+    def _evaluate(self, interview_id, index, question, answer):
+        started = time.monotonic()
+        try:
+            evaluation = self.evaluate_answer(question, answer)
+        except Exception as e:
+            print(f"Error evaluating answer {index} of interview {interview_id}: {str(e)}")
+            evaluation = None
+        self._store(interview_id, index, evaluation, time.monotonic() - started)
+
+    def _store(self, interview_id, index, evaluation, seconds):
+        update = {
+            f'evaluations.{index}.status': EVALUATION_READY if evaluation else EVALUATION_FAILED,
+            f'evaluations.{index}.evaluation_seconds': round(seconds, 3),
+            f'evaluations.{index}.evaluated_at': datetime.now(timezone.utc)
+        }
+        if evaluation:
+            update.update({f'evaluations.{index}.{key}': value for key, value in evaluation.items()})
+        self.db.interviews.update_one({'interview_id': interview_id}, {'$set': update})
+
+    def collect(self, interview, timeout):
+        """Evaluations for every question of the interview, in order, or None if some are not done in time.
+
+        Answers that were never scheduled (stored before evaluation was
+        enabled, or questions left unanswered) are scheduled here first.
+        """
+        interview_id = interview['interview_id']
+        questions = interview.get('questions', [])
+        responses = interview.get('responses', [])
+        for i, question in enumerate(questions):
+            response = next((r for r in responses if r.get('question_index') == i), None)
+            self.on_response(interview_id, response or {'question_index': i, 'question': question, 'transcription': ''})
+
+        deadline = time.monotonic() + timeout
+        while True:
+            stored = (self.db.interviews.find_one({'interview_id': interview_id}, {'evaluations': 1}) or {}).get('evaluations', {})
+            evaluations = [stored.get(str(i)) for i in range(len(questions))]
+            if all(e and e['status'] != EVALUATION_PENDING for e in evaluations):
+                return evaluations
+            if time.monotonic() >= deadline:
+                pending = sum(1 for e in evaluations if not e or e['status'] == EVALUATION_PENDING)
+                print(f"{pending} answer evaluations of interview {interview_id} still pending after {timeout}s")
+                return None
+            time.sleep(self.poll_interval)
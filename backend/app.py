@@ -1,7 +1,14 @@
 import json
 import os
+import subprocess
+import sys
+
+if __name__ == '__main__':
+    # Spawned pool workers re-run the main script; serve from run.py so they do not re-run this module
+    sys.exit(subprocess.call([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'run.py')] + sys.argv[1:]))
+
 from datetime import datetime, timedelta, timezone
-from flask import Flask, request, jsonify, send_file, url_for, render_template
+from flask import Flask, request, jsonify, send_file, url_for, render_template, Response, stream_with_context
 from flask_cors import CORS
 from pymongo import MongoClient
 from bson import ObjectId
@@ -13,7 +20,6 @@ import uuid
 from werkzeug.utils import secure_filename
 import shutil
 import openai
-from PyPDF2 import PdfReader
 from twilio.rest import Client
 from twilio.jwt.access_token import AccessToken
 from twilio.jwt.access_token.grants import VideoGrant
@@ -24,17 +30,36 @@ import threading
 import time
 import boto3
 import tempfile
-import whisper
 from pydub import AudioSegment
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_JUSTIFY
 import io
+from transcription_backends import create_backend
+from batching import BatchingTranscriber
+from transcription_cache import create_transcription_cache
+from transcription import transcribe
+from transcription_jobs import TranscriptionJobQueue
+from audio_storage import AudioStore
+from chunked_upload import ChunkedUploadManager, ChunkedUploadError
+from streaming_transcription import StreamingTranscriptionServer
+from resume_pipeline import ResumePipeline
+from resume_cache import MongoResumeCache, file_sha256
+import resume_analysis
+from pdf_extraction import PdfTextExtractor
+from question_bank import QuestionIndex, create_embedder
+from followup_questions import FollowUpPlanner
+import answer_evaluation
+from answer_evaluation import AnswerEvaluator
+from transcript_budget import budget_transcript, count_tokens
+from report_renderer import ReportRenderer, parse_report
+from report_store import ReportPdfStore
+from report_export import stream_report_zip
+from llm_gateway import create_gateway
+from singleflight import Singleflight, MongoLeaseStore
+from report_stream import ReportStreamWriter, REPORT_COMPLETE, REPORT_FAILED
+from report_batches import ReportBatchQueue, LocalBatchExecutor, OpenAIBatchExecutor, REPORT_QUEUED
 
 
 # Load environment variables
@@ -92,6 +117,30 @@ CORS(app, resources={
 client = MongoClient(os.getenv('MONGODB_URI', 'mongodb://localhost:27017/ai_interviewer'))
 db = client.ai_interviewer
 
+# Identical concurrent LLM requests share one upstream call: 'local' within this worker, 'mongo' across workers, 'off'
+LLM_COALESCING = os.getenv('LLM_COALESCING', 'local')
+llm_singleflight = None
+if LLM_COALESCING in ('local', 'mongo'):
+    llm_singleflight = Singleflight(
+        lease_store=MongoLeaseStore(db, result_ttl_seconds=int(os.getenv('LLM_COALESCING_RESULT_TTL', '30')))
+        if LLM_COALESCING == 'mongo' else None
+    )
+
+# LLM gateway - every chat completion goes through it; LLM_PROVIDER=fake serves canned responses for offline load tests
+llm = create_gateway(
+    provider=os.getenv('LLM_PROVIDER', 'openai'),
+    api_key=os.getenv('OPENAI_API_KEY'),
+    base_url=os.getenv('OPENAI_BASE_URL') or None,
+    max_connections=int(os.getenv('LLM_MAX_CONNECTIONS', '20')),
+    fake_latency_ms=int(os.getenv('FAKE_LLM_LATENCY_MS', '800')),
+    fake_failure_rate=float(os.getenv('FAKE_LLM_FAILURE_RATE', '0')),
+    max_concurrency=int(os.getenv('LLM_MAX_CONCURRENCY', '8')),
+    queue_timeout=float(os.getenv('LLM_QUEUE_TIMEOUT', '30')),
+    timeout=float(os.getenv('LLM_TIMEOUT', '60')),
+    max_retries=int(os.getenv('LLM_MAX_RETRIES', '3')),
+    singleflight=llm_singleflight
+)
+
 # File upload configuration
 UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
 if not os.path.exists(UPLOAD_FOLDER):
@@ -103,6 +152,164 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 # JWT configuration
 app.config['SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'your-secret-key-here')
 
+# Recruiters can read every candidate's reports; mark a user with role 'recruiter' or list their email here
+RECRUITER_EMAILS = {email.strip().lower() for email in os.getenv('RECRUITER_EMAILS', '').split(',') if email.strip()}
+
+# Transcription backend - e.g. 'whisper:base' or 'faster-whisper:small:int8'.
+# The model is loaded once per worker process and shared by all requests.
+WHISPER_MODEL = os.getenv('WHISPER_MODEL', 'base')
+TRANSCRIPTION_BACKEND = os.getenv('TRANSCRIPTION_BACKEND', f'whisper:{WHISPER_MODEL}')
+WHISPER_WARM_ON_STARTUP = os.getenv('WHISPER_WARM_ON_STARTUP', 'true').lower() == 'true'
+
+transcription_backend = create_backend(TRANSCRIPTION_BACKEND)
+
+# Voice activity detection trims silence before Whisper and skips silent clips entirely
+VAD_ENABLED = os.getenv('VAD_ENABLED', 'true').lower() == 'true'
+
+# Transcription job configuration - 'process' runs Whisper in worker processes, 'local' in threads
+TRANSCRIPTION_JOB_BACKEND = os.getenv('TRANSCRIPTION_JOB_BACKEND', 'process')
+TRANSCRIPTION_WORKERS = int(os.getenv('TRANSCRIPTION_WORKERS', '2'))
+TRANSCRIPTION_JOB_TIMEOUT = int(os.getenv('TRANSCRIPTION_JOB_TIMEOUT', '120'))
+TRANSCRIPTION_JOB_MAX_ATTEMPTS = int(os.getenv('TRANSCRIPTION_JOB_MAX_ATTEMPTS', '3'))
+
+# Micro-batching groups clips that arrive together into one Whisper forward pass
+WHISPER_BATCHING = os.getenv('WHISPER_BATCHING', 'false').lower() == 'true'
+WHISPER_BATCH_MAX_SIZE = int(os.getenv('WHISPER_BATCH_MAX_SIZE', '8'))
+WHISPER_BATCH_MAX_WAIT_MS = int(os.getenv('WHISPER_BATCH_MAX_WAIT_MS', '50'))
+
+speech_model = transcription_backend
+whisper_batcher = None
+if WHISPER_BATCHING and transcription_backend.engine != 'whisper':
+    print(f"WHISPER_BATCHING is only supported by the whisper backend, ignoring it for {transcription_backend.spec}")
+elif WHISPER_BATCHING and TRANSCRIPTION_JOB_BACKEND == 'process':
+    # Job workers load their own model and streaming calls pass an initial prompt, so nothing would use it
+    print("WHISPER_BATCHING only applies with TRANSCRIPTION_JOB_BACKEND=local, ignoring it for the process backend")
+elif WHISPER_BATCHING:
+    whisper_batcher = BatchingTranscriber(
+        transcription_backend.registry,
+        max_batch_size=WHISPER_BATCH_MAX_SIZE,
+        max_wait_ms=WHISPER_BATCH_MAX_WAIT_MS
+    )
+    speech_model = whisper_batcher
+
+# Transcription cache ('mongo', 'memory' or 'off') keyed by decoded audio plus this version string
+TRANSCRIPTION_CACHE_BACKEND = os.getenv('TRANSCRIPTION_CACHE_BACKEND', 'mongo')
+TRANSCRIPTION_CACHE_MAX_ENTRIES = int(os.getenv('TRANSCRIPTION_CACHE_MAX_ENTRIES', '10000'))
+TRANSCRIPTION_CACHE_TTL_SECONDS = int(os.getenv('TRANSCRIPTION_CACHE_TTL_SECONDS', str(30 * 24 * 3600)))
+TRANSCRIPTION_CACHE_VERSION = f"{transcription_backend.spec}|vad={VAD_ENABLED}|batched={whisper_batcher is not None}"
+
+transcription_cache_config = {
+    'backend': TRANSCRIPTION_CACHE_BACKEND,
+    'version': TRANSCRIPTION_CACHE_VERSION,
+    'mongo_uri': os.getenv('MONGODB_URI', 'mongodb://localhost:27017/ai_interviewer'),
+    'db_name': db.name,
+    'max_entries': TRANSCRIPTION_CACHE_MAX_ENTRIES,
+    'ttl_seconds': TRANSCRIPTION_CACHE_TTL_SECONDS
+}
+transcription_cache = create_transcription_cache(**transcription_cache_config)
+
+# Streaming transcription (websocket) configuration
+STREAMING_ENABLED = os.getenv('STREAMING_ENABLED', 'true').lower() == 'true'
+STREAMING_HOST = os.getenv('STREAMING_HOST', '0.0.0.0')
+STREAMING_PORT = int(os.getenv('STREAMING_PORT', '8765'))
+STREAMING_SEGMENT_SECONDS = float(os.getenv('STREAMING_SEGMENT_SECONDS', '5'))
+
+# Resume pipeline configuration - threads that turn uploaded resumes into interviews
+RESUME_PIPELINE_WORKERS = int(os.getenv('RESUME_PIPELINE_WORKERS', '4'))
+# A resume still processing this long after its run started is rerun once, then marked failed
+RESUME_PIPELINE_STALE_SECONDS = int(os.getenv('RESUME_PIPELINE_STALE_SECONDS', '600'))
+RESUME_ANALYSIS_MODEL = os.getenv('RESUME_ANALYSIS_MODEL', 'gpt-3.5-turbo')
+# 'fused' parses the resume and writes the questions in one structured completion, 'two_step' uses two calls
+RESUME_ANALYSIS_MODE = os.getenv('RESUME_ANALYSIS_MODE', 'fused')
+# 'json_schema' needs a model with structured outputs (gpt-4o-mini and later); 'json_object' works with gpt-3.5-turbo
+RESUME_RESPONSE_FORMAT = os.getenv('RESUME_RESPONSE_FORMAT', 'json_object')
+
+# PDF text extraction - long documents are split across worker processes; caps bound the LLM prompt (0 = no cap)
+PDF_EXTRACT_WORKERS = int(os.getenv('PDF_EXTRACT_WORKERS', '2'))
+PDF_PARALLEL_PAGE_THRESHOLD = int(os.getenv('PDF_PARALLEL_PAGE_THRESHOLD', '8'))
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', '20')) or None
+PDF_MAX_CHARS = int(os.getenv('PDF_MAX_CHARS', '20000')) or None
+
+pdf_extractor = PdfTextExtractor(
+    workers=PDF_EXTRACT_WORKERS,
+    parallel_threshold=PDF_PARALLEL_PAGE_THRESHOLD,
+    max_pages=PDF_MAX_PAGES,
+    max_chars=PDF_MAX_CHARS
+)
+
+# Adaptive interviews replace each planned question with a follow-up to the previous answer when it is ready in time
+ADAPTIVE_INTERVIEWS = os.getenv('ADAPTIVE_INTERVIEWS', 'false').lower() == 'true'
+FOLLOWUP_DEADLINE_SECONDS = float(os.getenv('FOLLOWUP_DEADLINE_SECONDS', '3'))
+FOLLOWUP_WORKERS = int(os.getenv('FOLLOWUP_WORKERS', '2'))
+
+# Stream the report completion and persist it section by section while it is generated
+REPORT_STREAMING = os.getenv('REPORT_STREAMING', 'true').lower() == 'true'
+REPORT_EVENTS_TIMEOUT = int(os.getenv('REPORT_EVENTS_TIMEOUT', '300'))
+# Each event stream holds a server thread, so only this many run at once; other clients poll /report
+REPORT_EVENTS_MAX_STREAMS = int(os.getenv('REPORT_EVENTS_MAX_STREAMS', '8'))
+report_event_streams = threading.BoundedSemaphore(REPORT_EVENTS_MAX_STREAMS)
+
+# Incremental evaluation scores each answer when its transcription is stored; the report then only synthesises the scores
+INCREMENTAL_EVALUATION = os.getenv('INCREMENTAL_EVALUATION', 'false').lower() == 'true'
+ANSWER_EVALUATION_WORKERS = int(os.getenv('ANSWER_EVALUATION_WORKERS', '2'))
+ANSWER_EVALUATION_WAIT_SECONDS = float(os.getenv('ANSWER_EVALUATION_WAIT_SECONDS', '20'))
+
+# Token budget for the interview transcript in the report prompt; longer answers are compacted to fit
+REPORT_PROMPT_BUDGET_TOKENS = int(os.getenv('REPORT_PROMPT_BUDGET_TOKENS', '3000'))
+
+# Report PDFs are rendered in this many worker processes (0 renders on the request thread)
+REPORT_RENDER_WORKERS = int(os.getenv('REPORT_RENDER_WORKERS', '2'))
+report_renderer = ReportRenderer(workers=REPORT_RENDER_WORKERS)
+
+# Rendered report PDFs are kept under their content hash and served with ETag/Range support
+REPORT_PDF_FOLDER = os.getenv('REPORT_PDF_FOLDER') or os.path.join(UPLOAD_FOLDER, 'reports')
+REPORT_PDF_MAX_AGE = int(os.getenv('REPORT_PDF_MAX_AGE', '3600'))
+report_pdf_store = ReportPdfStore(REPORT_PDF_FOLDER)
+# Interviews per page of a bulk export; missing PDFs of a page are rendered in parallel
+REPORT_EXPORT_PAGE_SIZE = int(os.getenv('REPORT_EXPORT_PAGE_SIZE', '50'))
+
+# A completion holds its interview this long; a retried /complete waits for it instead of generating again
+INTERVIEW_COMPLETION_LEASE_SECONDS = int(os.getenv('INTERVIEW_COMPLETION_LEASE_SECONDS', '600'))
+
+# Report mode - 'interactive' scores each report on completion, 'batch' defers non-priority reports to batched scoring
+REPORT_MODE = os.getenv('REPORT_MODE', 'interactive')
+REPORT_BATCH_EXECUTOR = os.getenv('REPORT_BATCH_EXECUTOR', 'local')
+REPORT_BATCH_SIZE = int(os.getenv('REPORT_BATCH_SIZE', '50'))
+REPORT_BATCH_MAX_WAIT_SECONDS = int(os.getenv('REPORT_BATCH_MAX_WAIT_SECONDS', '600'))
+REPORT_BATCH_POLL_SECONDS = int(os.getenv('REPORT_BATCH_POLL_SECONDS', '15'))
+
+# Question source - 'llm', 'bank' (curated question index only) or 'blend' (index plus LLM)
+QUESTION_SOURCE = os.getenv('QUESTION_SOURCE', 'llm')
+QUESTION_BANK_EMBEDDER = os.getenv('QUESTION_BANK_EMBEDDER', 'hashing')
+
+question_index = None
+if QUESTION_SOURCE in ('bank', 'blend'):
+    try:
+        question_index = QuestionIndex.load(embedder=create_embedder(QUESTION_BANK_EMBEDDER))
+    except Exception as e:
+        print(f"Error loading question bank, using LLM questions only: {str(e)}")
+
+# Resume analysis cache keyed by PDF content hash; bump RESUME_ANALYSIS_VERSION when the prompts change
+RESUME_ANALYSIS_VERSION = os.getenv('RESUME_ANALYSIS_VERSION', '1')
+RESUME_CACHE_ENABLED = os.getenv('RESUME_CACHE_ENABLED', 'true').lower() == 'true'
+RESUME_CACHE_MAX_ENTRIES = int(os.getenv('RESUME_CACHE_MAX_ENTRIES', '5000'))
+RESUME_CACHE_TTL_SECONDS = int(os.getenv('RESUME_CACHE_TTL_SECONDS', str(30 * 24 * 3600)))
+
+resume_cache = MongoResumeCache(
+    db,
+    version=(
+        f"{RESUME_ANALYSIS_MODEL}|{RESUME_ANALYSIS_MODE}|{RESUME_ANALYSIS_VERSION}|pages={PDF_MAX_PAGES}|chars={PDF_MAX_CHARS}"
+        f"|questions={QUESTION_SOURCE if question_index else 'llm'}:{question_index.version if question_index else ''}"
+    ),
+    max_entries=RESUME_CACHE_MAX_ENTRIES,
+    ttl_seconds=RESUME_CACHE_TTL_SECONDS
+) if RESUME_CACHE_ENABLED else None
+
+DEFAULT_INTERVIEW_QUESTIONS = [
+    "Tell me about your most challenging technical project and how you overcame the obstacles.",
+    "What technical skills are you most proud of and why?"
+]
+
 # Authentication decorator
 def token_required(f):
     @wraps(f)
@@ -121,15 +328,23 @@ def token_required(f):
         return f(current_user, *args, **kwargs)
     return decorated
 
+def is_recruiter(user):
+    """Candidates register themselves, so recruiter access is granted only by role or by RECRUITER_EMAILS."""
+    return user.get('role') == 'recruiter' or user.get('email', '').lower() in RECRUITER_EMAILS
+
+def recruiter_required(f):
+    @wraps(f)
+    @token_required
+    def decorated(current_user, *args, **kwargs):
+        if not is_recruiter(current_user):
+            return jsonify({'message': 'Recruiter access required'}), 403
+        return f(current_user, *args, **kwargs)
+    return decorated
+
 def extract_text_from_pdf(file_path):
     """Extract text from PDF file."""
     try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text
+        return pdf_extractor.extract(file_path)
     except Exception as e:
         print(f"Error extracting text from PDF: {str(e)}")
         return None
@@ -137,8 +352,8 @@ def extract_text_from_pdf(file_path):
 def parse_resume_with_openai(resume_text):
     """Parse resume using OpenAI to extract key information."""
     try:
-        response = openai.chat.completions.create(
-            model="gpt-3.5-turbo",
+        response = llm.chat('parse_resume',
+            model=RESUME_ANALYSIS_MODEL,
             messages=[
                 {"role": "system", "content": """Extract key information from the resume. 
                 Focus on:
@@ -162,17 +377,15 @@ def parse_resume_with_openai(resume_text):
         print(f"Error parsing resume with OpenAI: {str(e)}")
         return None
 
-def generate_interview_questions(resume_text):
-    """Generate interview questions based on resume content using OpenAI."""
+def generate_questions_from_profile(resume_data):
+    """Generate interview questions from an already parsed resume summary."""
     try:
-        # Parse resume with OpenAI
-        resume_data = parse_resume_with_openai(resume_text)
         if not resume_data:
             raise Exception("Failed to parse resume")
         
         # Generate interview questions based on parsed resume data
-        response = openai.chat.completions.create(
-            model="gpt-3.5-turbo",
+        response = llm.chat('generate_questions',
+            model=RESUME_ANALYSIS_MODEL,
             messages=[
                 {"role": "system", "content": """You are an expert technical interviewer. 
                 Based on the candidate's resume information, generate 2 relevant technical interview questions.
@@ -194,7 +407,7 @@ def generate_interview_questions(resume_text):
             questions = questions[:2]
         elif len(questions) < 2:
             # Add a fallback question if we don't have enough
-            questions.append("Tell me about your most challenging technical project and how you overcame the obstacles.")
+            questions.append(DEFAULT_INTERVIEW_QUESTIONS[0])
         
         print(f"Generated {len(questions)} questions from resume")
         return questions
@@ -202,10 +415,61 @@ def generate_interview_questions(resume_text):
     except Exception as e:
         print(f"Error generating interview questions: {str(e)}")
         # Return fallback questions if there's an error
-        return [
-            "Tell me about your most challenging technical project and how you overcame the obstacles.",
-            "What technical skills are you most proud of and why?"
-        ]
+        return list(DEFAULT_INTERVIEW_QUESTIONS)
+
+def analyse_resume_with_openai(resume_text):
+    """Parse the resume and generate questions in a single structured completion."""
+    try:
+        if not resume_text:
+            raise Exception("No resume text to analyse")
+        
+        response = llm.chat('analyse_resume',
+            model=RESUME_ANALYSIS_MODEL,
+            messages=resume_analysis.build_messages(resume_text),
+            response_format=resume_analysis.response_format(RESUME_RESPONSE_FORMAT),
+            temperature=0.5,
+            max_tokens=700
+        )
+        
+        profile, questions = resume_analysis.parse_analysis(response.choices[0].message.content)
+        print(f"Analysed resume and generated {len(questions)} questions in one call")
+        return {
+            'resume_data': resume_analysis.profile_summary(profile),
+            'profile': profile,
+            'questions': questions
+        }
+        
+    except Exception as e:
+        print(f"Error analysing resume with OpenAI: {str(e)}")
+        return None
+
+def generate_followup_question(question, answer, planned_question):
+    """Generate a follow-up question that builds on the candidate's last answer."""
+    response = llm.chat('followup_question',
+        model=RESUME_ANALYSIS_MODEL,
+        messages=[
+            {"role": "system", "content": """You are an expert technical interviewer. 
+            Based on the candidate's answer, ask ONE follow-up technical question that probes deeper into what they said.
+            If the answer is off-topic or too short to follow up on, return the planned next question unchanged.
+            Return ONLY the question, nothing else."""},
+            {"role": "user", "content": f"Question: {question}\n\nCandidate's answer: {answer}\n\nPlanned next question: {planned_question}"}
+        ],
+        temperature=0.7,
+        max_tokens=100
+    )
+    followup = response.choices[0].message.content.strip().strip('"')
+    return followup or None
+
+def evaluate_answer(question, answer):
+    """Score a single answer against the evaluation rubric."""
+    response = llm.chat('answer_evaluation',
+        model=RESUME_ANALYSIS_MODEL,
+        messages=answer_evaluation.build_messages(question, answer),
+        response_format={'type': 'json_object'},
+        temperature=0.2,
+        max_tokens=300
+    )
+    return answer_evaluation.parse_evaluation(response.choices[0].message.content)
 
 def get_next_question(interview_id, current_question_index):
     """Get the next question for the interview."""
@@ -223,125 +487,68 @@ def get_next_question(interview_id, current_question_index):
         print(f"Error getting next question: {str(e)}")
         return None
 
-def transcribe_audio(audio_file_path):
-    """Transcribe audio file to text using OpenAI Whisper."""
-    try:
-        print(f"Starting Whisper transcription for: {audio_file_path}")
-        
-        # Verify file exists before processing
-        if not os.path.exists(audio_file_path):
-            print(f"ERROR: Audio file does not exist: {audio_file_path}")
-            return f"Error: Audio file not found at {audio_file_path}"
-            
-        # Get absolute path to ensure no path resolution issues
-        audio_file_path = os.path.abspath(audio_file_path)
-        print(f"Using absolute path: {audio_file_path}")
-        
-        # File size verification
-        file_size = os.path.getsize(audio_file_path)
-        print(f"Audio file size: {file_size} bytes")
-        if file_size == 0:
-            return "Error: Audio file is empty (0 bytes)"
-        
-        # Convert audio to wav format using FFmpeg directly
-        wav_path = os.path.join(os.path.dirname(audio_file_path), 
-                              f"whisper_temp_{uuid.uuid4().hex}.wav")
-        
-        print(f"Converting audio to WAV format at: {wav_path}")
-        
-        # Use FFmpeg to convert the audio with explicit path
-        ffmpeg_path = os.path.join(FFMPEG_PATH, "ffmpeg.exe")
-        ffmpeg_cmd = [
-            ffmpeg_path,
-            "-i", audio_file_path,
-            "-ar", "16000",  # Sample rate
-            "-ac", "1",      # Mono channel
-            "-y",            # Overwrite if exists
-            wav_path
-        ]
-        
-        print(f"Running FFmpeg command: {' '.join(ffmpeg_cmd)}")
-        import subprocess
-        subprocess.run(ffmpeg_cmd, check=True, capture_output=True)
-        
-        # Verify the WAV file was created
-        if not os.path.exists(wav_path):
-            print(f"ERROR: FFmpeg failed to create WAV file at {wav_path}")
-            return "Error: Failed to convert audio format"
-            
-        print(f"WAV file created successfully: {wav_path}")
-        print(f"WAV file size: {os.path.getsize(wav_path)} bytes")
-        
-        # Load Whisper model
-        print("Loading Whisper model...")
-        model = whisper.load_model("base")
-        
-        # Transcribe using Whisper
-        print(f"Transcribing audio...")
-        result = model.transcribe(wav_path)
-        transcription = result["text"].strip()
-        
-        print(f"=== WHISPER TRANSCRIPTION RESULT ===")
-        print(f"Original audio file: {audio_file_path}")
-        print(f"Transcribed text: '{transcription}'")
-        print(f"=====================================")
-        
-        if not transcription:
-            transcription = "No speech detected in audio recording"
-            print("Warning: Empty transcription result")
-        
-        return transcription
-        
-    except FileNotFoundError as e:
-        error_msg = f"Audio file not found error: {str(e)}"
-        print(error_msg)
-        return f"Error during Whisper transcription: {error_msg}"
-    except subprocess.CalledProcessError as e:
-        error_msg = f"FFmpeg error: {e.stderr.decode() if e.stderr else str(e)}"
-        print(error_msg)
-        return f"Error during audio conversion: {error_msg}"
-    except Exception as e:
-        error_msg = f"Error transcribing audio: {str(e)}"
-        print(error_msg)
-        import traceback
-        print(traceback.format_exc())
-        return f"Error during Whisper transcription: {str(e)}"
-    finally:
-        # Clean up temporary wav file
-        try:
-            if 'wav_path' in locals() and os.path.exists(wav_path):
-                os.remove(wav_path)
-                print(f"Cleaned up temporary file: {wav_path}")
-        except Exception as cleanup_error:
-            print(f"Error cleaning up temp file: {cleanup_error}")
-
-def generate_interview_report(interview_data):
-    """Generate interview report using OpenAI."""
-    try:
-        # Prepare interview data for analysis
-        qa_pairs = []
-        questions = interview_data.get('questions', [])
-        responses = interview_data.get('responses', [])
-        
-        # Create Q&A pairs
-        for i, question in enumerate(questions):
-            # Find corresponding response
-            response = next((r for r in responses if r.get('question_index') == i), None)
+def transcribe_audio(audio_source):
+    """Transcribe audio bytes or an audio file to text using OpenAI Whisper."""
+    return transcribe(audio_source, speech_model, FFMPEG_BINARY, trim_silence=VAD_ENABLED, cache=transcription_cache)
+
+def build_report_request(interview_data):
+    """Chat completion parameters for an interview's assessment report.
+
+    With incremental evaluation the prompt is a short synthesis of the stored
+    per-answer evaluations; if they are not all done in time the full
+    transcript is sent instead.
+    """
+    if INCREMENTAL_EVALUATION:
+        evaluations = answer_evaluator.collect(interview_data, timeout=ANSWER_EVALUATION_WAIT_SECONDS)
+        if evaluations is not None:
+            messages = answer_evaluation.build_synthesis_messages(interview_data.get('questions', []), evaluations)
+            db.interviews.update_one(
+                {'interview_id': interview_data.get('interview_id')},
+                {'$set': {'report_prompt_stats': {
+                    'prompt_tokens': sum(count_tokens(m['content']) for m in messages),
+                    'answers': len(evaluations),
+                    'source': 'evaluations'
+                }}}
+            )
+            return dict(
+                model="gpt-3.5-turbo",
+                messages=messages,
+                temperature=0.3,
+                max_tokens=800
+            )
+    
+    # Prepare interview data for analysis
+    qa_pairs = []
+    questions = interview_data.get('questions', [])
+    responses = interview_data.get('responses', [])
+    
+    # Create Q&A pairs
+    for i, question in enumerate(questions):
+        # Find corresponding response
+        response = next((r for r in responses if r.get('question_index') == i), None)
+        
+        answer = response.get('transcription', 'No response recorded') if response else 'No response recorded'
+        # Skip error messages in the analysis
+        if answer.startswith('Error during Whisper transcription'):
+            answer = 'No valid response recorded'
             
-            answer = response.get('transcription', 'No response recorded') if response else 'No response recorded'
-            # Skip error messages in the analysis
-            if answer.startswith('Error during Whisper transcription'):
-                answer = 'No valid response recorded'
-                
-            qa_pairs.append(f"Q{i+1}: {question}\nA{i+1}: {answer}")
-        
-        interview_text = "\n\n".join(qa_pairs)
-        
-        # Generate report using OpenAI
-        response = openai.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": """You are an expert interview assessor. Analyze the interview responses and provide a comprehensive evaluation report. 
+        qa_pairs.append((question, answer))
+    
+    # Long interviews are compacted to a fixed token budget so the prompt stops growing with the question count
+    interview_text, prompt_stats = budget_transcript(qa_pairs, REPORT_PROMPT_BUDGET_TOKENS, model="gpt-3.5-turbo")
+    prompt_stats['source'] = 'transcript'
+    print(f"Report prompt for interview {interview_data.get('interview_id')}: {prompt_stats['prompt_tokens']} of "
+          f"{prompt_stats['original_tokens']} transcript tokens, {prompt_stats['compacted_answers']} answers compacted, "
+          f"{prompt_stats['dropped_answers']} left out")
+    if prompt_stats['overrun_tokens']:
+        print(f"Report prompt for interview {interview_data.get('interview_id')} is {prompt_stats['overrun_tokens']} "
+              f"tokens over its budget of {prompt_stats['budget_tokens']}")
+    db.interviews.update_one({'interview_id': interview_data.get('interview_id')}, {'$set': {'report_prompt_stats': prompt_stats}})
+    
+    return dict(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": """You are an expert interview assessor. Analyze the interview responses and provide a comprehensive evaluation report. 
 
 Structure your response as follows:
 1. CANDIDATE OVERVIEW
@@ -353,20 +560,18 @@ Structure your response as follows:
 7. SCORE (out of 10)
 
 Be professional, constructive, and specific in your feedback. If responses are missing or incomplete, note this and provide guidance on what additional information would be helpful."""},
-                {"role": "user", "content": f"Please analyze this interview and provide a detailed assessment report:\n\n{interview_text}"}
-            ],
-            temperature=0.3,
-            max_tokens=1500
-        )
-        
-        return response.choices[0].message.content.strip()
-    except Exception as e:
-        print(f"Error generating report with OpenAI: {str(e)}")
-        # Return a fallback report if OpenAI fails
-        questions = interview_data.get('questions', [])
-        responses = interview_data.get('responses', [])
-        
-        fallback_report = f"""
+            {"role": "user", "content": f"Please analyze this interview and provide a detailed assessment report:\n\n{interview_text}"}
+        ],
+        temperature=0.3,
+        max_tokens=1500
+    )
+
+def fallback_interview_report(interview_data):
+    """Plain summary report used when the LLM report cannot be generated."""
+    questions = interview_data.get('questions', [])
+    responses = interview_data.get('responses', [])
+    
+    fallback_report = f"""
 INTERVIEW ASSESSMENT REPORT
 
 CANDIDATE OVERVIEW:
@@ -381,275 +586,53 @@ Manual review required for assessment.
 
 RESPONSES SUMMARY:
 """
+    
+    for i, question in enumerate(questions):
+        response = next((r for r in responses if r.get('question_index') == i), None)
+        answer = response.get('transcription', 'No response') if response else 'No response'
+        if answer.startswith('Error during Whisper transcription'):
+            answer = 'No valid response recorded'
+            
+        fallback_report += f"\nQ{i+1}: {question}\nA{i+1}: {answer[:100]}{'...' if len(answer) > 100 else ''}\n"
+    
+    fallback_report += "\n\nRECOMMENDATION: Manual review required\nSCORE: Pending detailed analysis"
+    
+    return fallback_report
+
+def generate_interview_report(interview_data, stream_writer=None):
+    """Generate interview report using OpenAI.
+
+    With a stream_writer the completion is streamed and persisted section by
+    section as it arrives.
+    """
+    try:
+        report_request = build_report_request(interview_data)
         
-        for i, question in enumerate(questions):
-            response = next((r for r in responses if r.get('question_index') == i), None)
-            answer = response.get('transcription', 'No response') if response else 'No response'
-            if answer.startswith('Error during Whisper transcription'):
-                answer = 'No valid response recorded'
-                
-            fallback_report += f"\nQ{i+1}: {question}\nA{i+1}: {answer[:100]}{'...' if len(answer) > 100 else ''}\n"
-        
-        fallback_report += "\n\nRECOMMENDATION: Manual review required\nSCORE: Pending detailed analysis"
+        if stream_writer:
+            stream_writer.start()
+            for delta in llm.stream('interview_report', **report_request):
+                stream_writer.feed(delta)
+            return stream_writer.finish().strip()
         
-        return fallback_report
+        response = llm.chat('interview_report', **report_request)
+        return response.choices[0].message.content.strip()
+    except Exception as e:
+        print(f"Error generating report with OpenAI: {str(e)}")
+        if stream_writer:
+            stream_writer.fail(e)
+        # Return a fallback report if OpenAI fails
+        return fallback_interview_report(interview_data)
 
 def create_pdf_report(report_content, candidate_name="Candidate", status="Pending Review", score="N/A"):
     """Create PDF report from text content."""
     try:
-        buffer = io.BytesIO()
-        
-        # Initialize PDF document
-        doc = SimpleDocTemplate(
-            buffer, 
-            pagesize=letter,
-            title=f"Interview Report - {candidate_name}",
-            author="Lsoys Apps & Games - AI Interviewer System",
-            subject="Interview Assessment"
-        )
-        
-        # Extract score from report content if not provided
-        if score == "N/A" and "SCORE:" in report_content:
-            # Try to find the score in the report
-            score_line = [line for line in report_content.split('\n') if "SCORE:" in line]
-            if score_line:
-                try:
-                    score = score_line[0].split("SCORE:")[1].strip()
-                except:
-                    score = "N/A"
-        
-        # Get style sheets and define custom styles
-        styles = getSampleStyleSheet()
-        
-        # Company header style
-        company_style = ParagraphStyle(
-            'CompanyHeader',
-            parent=styles['Heading1'],
-            fontSize=16,
-            alignment=1,  # Center alignment
-            textColor='#1A237E',  # Dark blue
-            fontName='Helvetica-Bold',
-            spaceAfter=6
-        )
-        
-        # Title style
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=5,
-            alignment=1,  # Center alignment
-            textColor='#1A237E'  # Dark blue
-        )
-        
-        # Subtitle style (candidate name)
-        subtitle_style = ParagraphStyle(
-            'Subtitle',
-            parent=styles['Heading2'],
-            fontSize=14,
-            alignment=1,  # Center
-            spaceAfter=10
-        )
-        
-        # Status box style
-        status_style = ParagraphStyle(
-            'StatusStyle',
-            parent=styles['Heading2'],
-            fontSize=12,
-            alignment=1,  # Center
-            textColor='white',
-            backColor=get_status_color(status),
-            borderWidth=1,
-            borderColor='#333333',
-            borderPadding=5,
-            borderRadius=4,
-            spaceAfter=10
-        )
-        
-        # Score style
-        score_style = ParagraphStyle(
-            'ScoreStyle',
-            parent=styles['Heading2'],
-            fontSize=14,
-            alignment=1,  # Center
-            textColor='#333333',
-            spaceAfter=5
-        )
-        
-        # Date style
-        date_style = ParagraphStyle(
-            'DateStyle',
-            parent=styles['Normal'],
-            fontSize=10,
-            alignment=1,  # Center
-            textColor='#666666',
-            spaceAfter=15
-        )
-        
-        # Section heading style
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceBefore=12,
-            spaceAfter=8,
-            textColor='#283593',  # Indigo
-            borderWidth=0,
-            borderColor='#C5CAE9',
-            borderPadding=5,
-            borderRadius=2
-        )
-        
-        # Subheading style
-        subheading_style = ParagraphStyle(
-            'CustomSubheading',
-            parent=styles['Heading3'],
-            fontSize=12,
-            spaceAfter=8,
-            textColor='#303F9F'  # Darker indigo
-        )
-        
-        # Body text style
-        body_style = ParagraphStyle(
-            'CustomBody',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=12,
-            alignment=TA_JUSTIFY,
-            leading=14  # Line spacing
-        )
-        
-        # Question style
-        question_style = ParagraphStyle(
-            'QuestionStyle',
-            parent=styles['Normal'],
-            fontSize=11,
-            fontName='Helvetica-Bold',
-            spaceAfter=2,
-            textColor='#1A237E',
-            leftIndent=10
-        )
-        
-        # Answer style
-        answer_style = ParagraphStyle(
-            'AnswerStyle',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=12,
-            leftIndent=20,
-            leading=14  # Line spacing
-        )
-        
-        # Footer style
-        footer_style = ParagraphStyle(
-            'FooterStyle',
-            parent=styles['Normal'],
-            fontSize=8,
-            alignment=1,  # Center
-            textColor='#666666'
-        )
-        
-        # Build PDF content
-        story = []
-        
-        # Add company header
-        story.append(Paragraph("LSOYS APPS & GAMES", company_style))
-        
-        # Add title
-        story.append(Paragraph("INTERVIEW ASSESSMENT REPORT", title_style))
-        
-        # Add candidate name
-        story.append(Paragraph(f"Candidate: {candidate_name}", subtitle_style))
-        
-        # Add status box
-        story.append(Paragraph(f"Status: {status}", status_style))
-        
-        # Add score prominently
-        story.append(Paragraph(f"SCORE: {score}", score_style))
-        
-        # Add date and time
-        current_time = datetime.now().strftime("%B %d, %Y at %H:%M")
-        story.append(Paragraph(f"Generated on: {current_time}", date_style))
-        
-        # Add horizontal line
-        story.append(Spacer(1, 10))
-        
-        # Split report into sections and format
-        sections = report_content.split('\n')
-        current_section = None
-        in_qa_section = False
-        skip_score_section = False  # Skip the original score section since we've moved it to the top
-        
-        for section in sections:
-            if not section.strip():
-                story.append(Spacer(1, 6))
-                continue
-            
-            # Skip the original score section
-            if "SCORE:" in section:
-                skip_score_section = True
-                continue
-                
-            if skip_score_section and section.strip() and not section.strip().isupper():
-                skip_score_section = False
-                
-            if skip_score_section:
-                continue
-                
-            if "INTERVIEW QUESTIONS & ANSWERS" in section:
-                in_qa_section = True
-                story.append(Spacer(1, 10))
-                story.append(Paragraph(section.strip(), heading_style))
-                story.append(Spacer(1, 10))
-                continue
-            
-            if in_qa_section:
-                if section.strip().startswith("Question"):
-                    story.append(Paragraph(section.strip(), question_style))
-                elif section.strip().startswith("Response:"):
-                    story.append(Paragraph(section.strip(), answer_style))
-            elif section.strip().isupper() and len(section.strip()) < 50:
-                # This is a section heading
-                current_section = section.strip()
-                story.append(Spacer(1, 10))
-                story.append(Paragraph(current_section, heading_style))
-                story.append(Spacer(1, 5))
-            else:
-                story.append(Paragraph(section.strip(), body_style))
-        
-        # Add footer with attribution and website link
-        story.append(Spacer(1, 20))
-
-        story.append(Spacer(1, 10))
-        story.append(Paragraph("Generated by AI Interviewer | www.lsoysappsandgames.com/ai-interviewer", footer_style))
-        
-        # Build the document
-        doc.build(story)
-        buffer.seek(0)
-        return buffer
+        return io.BytesIO(report_renderer.render(report_content, candidate_name, status, score))
     except Exception as e:
         print(f"Error creating PDF: {str(e)}")
         import traceback
         print(traceback.format_exc())
         return None
 
-# Helper function to determine status color
-def get_status_color(status):
-    """Return color code based on candidate status."""
-    status = status.lower()
-    if "selected" in status:
-        return "#4CAF50"  # Green
-    elif "next round" in status:
-        return "#2196F3"  # Blue
-    elif "rejected" in status:
-        return "#F44336"  # Red
-    elif "not good" in status:
-        return "#FF9800"  # Orange
-    elif "good in another role" in status:
-        return "#9C27B0"  # Purple
-    else:
-        return "#757575"  # Grey for pending/unknown
-
 @app.route('/api/register', methods=['POST'])
 def register():
     data = request.get_json()
@@ -690,15 +673,28 @@ def login():
         'user': {
             'id': str(user['_id']),
             'email': user['email'],
-            'name': user.get('name', '')
+            'name': user.get('name', ''),
+            'is_recruiter': is_recruiter(user)
         }
     })
 
+def store_resume_pdf(file):
+    """Save an uploaded resume under its content hash so repeat uploads share one file."""
+    temp_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}_{secure_filename(file.filename)}")
+    file.save(temp_path)
+    resume_sha256 = file_sha256(temp_path)
+    resume_path = os.path.join(app.config['UPLOAD_FOLDER'], f"resume_{resume_sha256}.pdf")
+    if os.path.exists(resume_path):
+        os.remove(temp_path)
+    else:
+        os.replace(temp_path, resume_path)
+    return resume_path, resume_sha256
+
 # Resume routes
 @app.route('/upload-resume', methods=['POST'])
 @token_required
 def upload_resume(current_user):
-    """Handle resume upload and create interview room with simulated processing."""
+    """Store the resume and hand it to the resume pipeline; processing continues in the background."""
     if 'resume' not in request.files:
         return jsonify({'error': 'No resume file provided'}), 400
     
@@ -710,79 +706,60 @@ def upload_resume(current_user):
         return jsonify({'error': 'Only PDF files are allowed'}), 400
     
     try:
-        # Simulate resume processing delay
-        time.sleep(2)  # Simulate 2 seconds of processing
+        interview_id = str(uuid.uuid4())
         
-        # Get the fixed interview questions
-        questions = generate_interview_questions("")
+        # Store the PDF so the pipeline can read it after this request returns
+        resume_path, resume_sha256 = store_resume_pdf(file)
         
-        # Create interview record with simulated resume data
-        interview_id = str(uuid.uuid4())
         interview = {
             '_id': ObjectId(),  # MongoDB document ID
             'interview_id': interview_id,  # Our custom interview ID
             'user_id': current_user['_id'],
             'resume_filename': file.filename,
-            'resume_processed': True,
-            'questions': questions,
-            'status': 'scheduled',
+            'resume_path': resume_path,
+            'resume_sha256': resume_sha256,
+            'resume_processed': False,
+            'role': request.form.get('role') or None,
+            'questions': [],
+            'adaptive': ADAPTIVE_INTERVIEWS,
+            'status': 'processing',
+            'processing': ResumePipeline.initial_processing_state(),
             'created_at': datetime.now(timezone.utc),
             'scheduled_at': datetime.now(timezone.utc),
-            'processing_time': '2 seconds',
-            'current_question_index': 0  # Add initial question index
+            'current_question_index': 0
         }
+        db.interviews.insert_one(interview)
+        print(f"Created interview with ID: {interview_id}, resume processing queued")
         
-        # Insert into database
-        result = db.interviews.insert_one(interview)
-        print(f"Created interview with ID: {interview_id}")
-        
-        # Create video interview room
-        room_details = create_interview_room(interview_id, str(current_user['_id']))
-        
-        # Store the token in the interview document
-        db.interviews.update_one(
-            {'interview_id': interview_id},
-            {'$set': {'candidate_token': room_details['user_token']}}
-        )
-        
-        # Initialize the interview manager
-        interview_manager = InterviewManager(
-            room_name=room_details['room_name'],
-            interview_id=interview_id,
-            questions=questions
-        )
-        
-        # Start the interview
-        interview_manager.start()
-        
-        # Store interview data in database (not the manager object)
-        db.interviews.update_one(
-            {'interview_id': interview_id},
-            {'$set': {
-                'room_name': room_details['room_name'],
-                'questions': questions,
-                'status': 'ready',
-                'current_question_index': 0
-            }}
-        )
+        resume_pipeline.submit(interview_id, resume_path, resume_sha256, str(current_user['_id']))
         
         return jsonify({
-            'message': 'Resume processed successfully. Starting interview...',
+            'message': 'Resume uploaded. Preparing your interview...',
             'interview_id': interview_id,
-            'room_name': room_details['room_name'],
-            'token': room_details['user_token'],
             'interview_url': f'/interview/{interview_id}',
-            'processing_details': {
-                'status': 'success',
-                'time_taken': '2 seconds',
-                'questions_generated': len(questions)
-            }
-        })
+            'status_url': f'/interview/{interview_id}/processing',
+            'processing_details': resume_pipeline.progress(interview)
+        }), 202
         
     except Exception as e:
         print(f"Error in upload_resume: {str(e)}")
         return jsonify({'message': f'Upload failed: {str(e)}'}), 500
 
+@app.route('/interview/<interview_id>/processing', methods=['GET'])
+def resume_processing_status(interview_id):
+    """Per-stage progress of the resume pipeline for an interview."""
+    try:
+        interview = db.interviews.find_one(
+            {'interview_id': interview_id},
+            {'interview_id': 1, 'status': 1, 'processing': 1, 'questions': 1}
+        )
+        if not interview:
+            return jsonify({'message': 'Interview not found'}), 404
+        return jsonify(resume_pipeline.progress(interview))
+    except Exception as e:
+        print(f"Error getting resume processing status: {str(e)}")
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
 # Interview instructions endpoint
 @app.route('/interview-instructions', methods=['GET'])
 @token_required
@@ -851,7 +828,11 @@ def interview_room(interview_id):
         if not interview:
             print(f"Interview not found: {interview_id}")
             return jsonify({'message': 'Interview not found'}), 404
-        
+
+        # The resume pipeline has not provisioned the room yet
+        if interview.get('status') == 'processing':
+            return jsonify(resume_pipeline.progress(interview)), 202
+
         # Get the candidate token
         token = interview.get('candidate_token')
         if not token:
@@ -1021,135 +1002,374 @@ def get_token(interview_id):
         print(f"Error generating token: {str(e)}")
         return jsonify({'message': f'Error: {str(e)}'}), 500
 
+def queue_answer_transcription(interview, question_index, audio_file_id, audio_size, audio_sha256):
+    """Create a transcription job for stored answer audio and build the API response."""
+    interview_id = interview['interview_id']
+    questions = interview.get('questions', [])
+    question = questions[question_index] if question_index < len(questions) else 'Unknown question'
+    
+    # A retried upload of the same answer returns the job that already exists
+    existing_job = transcription_jobs.find_duplicate(interview_id, question_index, audio_sha256)
+    if existing_job:
+        print(f"Duplicate upload for question {question_index}, reusing job {existing_job['job_id']}")
+        audio_store.delete(audio_file_id)
+        return jsonify({
+            'message': 'Response already received',
+            'job_id': existing_job['job_id'],
+            'status': existing_job['status'],
+            'status_url': f"/transcription-jobs/{existing_job['job_id']}",
+            'transcription': existing_job['transcription'],
+            'question_index': question_index,
+            'audio_size': audio_size
+        }), 200 if existing_job['status'] == 'completed' else 202
+    
+    # Hand the stored audio to the background transcription workers
+    job_id = transcription_jobs.submit(interview_id, question_index, question, audio_file_id, audio_size, audio_sha256)
+    
+    return jsonify({
+        'message': 'Response accepted for transcription',
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': f'/transcription-jobs/{job_id}',
+        'question_index': question_index,
+        'audio_size': audio_size
+    }), 202
+
 @app.route('/interview/<interview_id>/record-response', methods=['POST'])
 def record_response(interview_id):
-    """Record and transcribe candidate response."""
-    temp_audio_path = None
+    """Accept a candidate response and queue it for transcription.
+    
+    Accepts, in order of preference:
+    - multipart/form-data with an 'audio' file and a 'question_index' field
+    - a raw audio/* or application/octet-stream body with ?question_index=N
+    - the legacy JSON body with a base64 'audio_blob' data URL
+    The binary forms are copied to storage in fixed-size chunks, so the whole
+    answer is never held in memory.
+    """
     try:
         # Find interview by interview_id
         interview = db.interviews.find_one({'interview_id': interview_id})
         if not interview:
             return jsonify({'message': 'Interview not found'}), 404
         
-        data = request.get_json()
-        question_index = data.get('question_index', 0)
-        audio_blob = data.get('audio_blob')  # Base64 encoded audio data
-        
-        if not audio_blob:
-            return jsonify({'message': 'No audio data provided'}), 400
-        
-        print(f"Processing audio for question {question_index} in interview {interview_id}")
-        
-        # Create unique filename with timestamp to avoid overwriting
+        mimetype = request.mimetype or ''
         timestamp = int(time.time())
-        temp_filename = f"audio_{interview_id}_{question_index}_{timestamp}"
         
-        # Save audio file temporarily with proper extension
-        import base64
-        try:
-            # Handle different audio formats
-            if 'data:audio/webm' in audio_blob:
-                audio_data = base64.b64decode(audio_blob.split(',')[1])
-                temp_audio_path = os.path.join(UPLOAD_FOLDER, f"{temp_filename}.webm")
-            elif 'data:audio/wav' in audio_blob:
-                audio_data = base64.b64decode(audio_blob.split(',')[1])
-                temp_audio_path = os.path.join(UPLOAD_FOLDER, f"{temp_filename}.wav")
-            else:
-                # Default to webm
-                audio_data = base64.b64decode(audio_blob.split(',')[1])
-                temp_audio_path = os.path.join(UPLOAD_FOLDER, f"{temp_filename}.webm")
+        if mimetype == 'multipart/form-data':
+            audio_file = request.files.get('audio')
+            if not audio_file:
+                return jsonify({'message': 'No audio file provided'}), 400
+            question_index = int(request.form.get('question_index', 0))
+            content_type = audio_file.mimetype or 'audio/webm'
+            audio_stream = audio_file.stream
+        elif mimetype.startswith('audio/') or mimetype == 'application/octet-stream':
+            question_index = int(request.args.get('question_index', 0))
+            content_type = mimetype
+            audio_stream = request.stream
+        else:
+            audio_stream = None
+        
+        if audio_stream is not None:
+            print(f"Streaming {content_type} audio for question {question_index} in interview {interview_id}")
+            audio_file_id, audio_size, audio_sha256 = audio_store.save_stream(
+                audio_stream,
+                f"audio_{interview_id}_{question_index}_{timestamp}",
+                content_type=content_type,
+                metadata={'interview_id': interview_id, 'question_index': question_index}
+            )
+        else:
+            # Legacy path: base64 data URL inside a JSON body
+            data = request.get_json()
+            question_index = data.get('question_index', 0)
+            audio_blob = data.get('audio_blob')  # Base64 encoded audio data
             
-            # Ensure the upload folder exists
-            os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+            if not audio_blob:
+                return jsonify({'message': 'No audio data provided'}), 400
             
-            print(f"Saving audio to: {temp_audio_path}")
-            print(f"Audio data size: {len(audio_data)} bytes")
+            print(f"Processing audio for question {question_index} in interview {interview_id}")
             
-            with open(temp_audio_path, 'wb') as f:
-                f.write(audio_data)
+            import base64
+            try:
+                audio_data = base64.b64decode(audio_blob.split(',')[1] if ',' in audio_blob else audio_blob)
+            except Exception as audio_error:
+                print(f"Error decoding audio: {audio_error}")
+                return jsonify({'message': f'Error decoding audio: {str(audio_error)}'}), 400
+            # Release the base64 copy before storing the decoded bytes
+            del audio_blob, data
             
-            # Verify file was written
-            if not os.path.exists(temp_audio_path):
-                return jsonify({'message': 'Failed to save audio file - file not found'}), 500
-                
-            if os.path.getsize(temp_audio_path) == 0:
-                return jsonify({'message': 'Failed to save audio file - file size is 0 bytes'}), 500
+            if not audio_data:
+                return jsonify({'message': 'Audio data is empty (0 bytes)'}), 400
             
-            print(f"Audio file saved successfully at {temp_audio_path}")
-            print(f"File size: {os.path.getsize(temp_audio_path)} bytes")
-            print(f"File exists check: {os.path.exists(temp_audio_path)}")
-            
-        except Exception as audio_error:
-            print(f"Error saving audio: {audio_error}")
-            return jsonify({'message': f'Error saving audio: {str(audio_error)}'}), 500
-        
-        # Transcribe audio
-        print("Starting transcription...")
-        transcription = transcribe_audio(temp_audio_path)
-        print(f"Transcription result: {transcription}")
+            audio_file_id, audio_size, audio_sha256 = audio_store.save_bytes(
+                audio_data,
+                f"audio_{interview_id}_{question_index}_{timestamp}",
+                metadata={'interview_id': interview_id, 'question_index': question_index}
+            )
         
-        if not transcription:
-            transcription = "No speech detected in audio recording"
+        print(f"Audio data size: {audio_size} bytes")
+        if audio_size == 0:
+            audio_store.delete(audio_file_id)
+            return jsonify({'message': 'Audio data is empty (0 bytes)'}), 400
         
-        # Store transcription in database
-        response_data = {
-            'question_index': question_index,
-            'question': interview['questions'][question_index] if question_index < len(interview.get('questions', [])) else 'Unknown question',
-            'transcription': transcription,
-            'timestamp': datetime.now(timezone.utc),
-            'audio_processed': True
-        }
+        return queue_answer_transcription(interview, question_index, audio_file_id, audio_size, audio_sha256)
         
-        print(f"=== STORING RESPONSE DATA ===")
-        print(f"Interview ID: {interview_id}")
-        print(f"Question Index: {question_index}")
-        print(f"Question: {response_data['question']}")
-        print(f"Transcription: '{transcription}'")
-        print(f"Audio Size: {len(audio_data)} bytes")
-        print("============================")
+    except Exception as e:
+        print(f"Error recording response: {str(e)}")
+        import traceback
+        print(traceback.format_exc())
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@app.route('/interview/<interview_id>/answers/<int:question_index>/upload', methods=['POST'])
+def start_answer_upload(interview_id, question_index):
+    """Open a resumable chunked upload for an answer (or resume the open one)."""
+    try:
+        if not db.interviews.find_one({'interview_id': interview_id}, {'_id': 1}):
+            return jsonify({'message': 'Interview not found'}), 404
         
-        # Update interview with response
-        result = db.interviews.update_one(
-            {'interview_id': interview_id},
-            {'$push': {'responses': response_data}}
+        data = request.get_json(silent=True) or {}
+        upload = chunked_uploads.start(
+            interview_id, question_index, data.get('content_type', 'audio/webm'), data.get('recording_id')
         )
+        print(f"Chunked upload {upload['upload_id']} open for question {question_index} in interview {interview_id}")
+        return jsonify(upload)
+    except Exception as e:
+        print(f"Error starting answer upload: {str(e)}")
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@app.route('/interview/<interview_id>/answers/<int:question_index>/upload', methods=['GET'])
+def answer_upload_status(interview_id, question_index):
+    """Report which chunks of the open upload have been received."""
+    try:
+        upload = chunked_uploads.get_open(interview_id, question_index)
+        if not upload:
+            return jsonify({'message': 'No open upload for this answer'}), 404
+        return jsonify(chunked_uploads.status(upload))
+    except Exception as e:
+        print(f"Error reading answer upload: {str(e)}")
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@app.route('/interview/<interview_id>/answers/<int:question_index>/upload/chunks/<int:seq>', methods=['PUT'])
+def append_answer_chunk(interview_id, question_index, seq):
+    """Store one MediaRecorder chunk; the body is the raw chunk bytes and ?upload_id= names the upload."""
+    try:
+        # A late chunk of an abandoned recording must not land in the new recording's upload
+        upload = chunked_uploads.get_open(interview_id, question_index, request.args.get('upload_id'))
+        if not upload:
+            return jsonify({'message': 'No open upload for this answer'}), 404
+        
+        chunk = request.get_data(cache=False)
+        if not chunk:
+            return jsonify({'message': 'Chunk is empty'}), 400
+        
+        chunked_uploads.put_chunk(upload, seq, chunk)
+        return jsonify({'upload_id': upload['upload_id'], 'seq': seq, 'size': len(chunk)})
+    except ChunkedUploadError as e:
+        return jsonify({'message': str(e)}), 409
+    except Exception as e:
+        print(f"Error storing answer chunk: {str(e)}")
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@app.route('/interview/<interview_id>/answers/<int:question_index>/upload/finalize', methods=['POST'])
+def finalize_answer_upload(interview_id, question_index):
+    """Assemble the received chunks in order and queue the answer for transcription."""
+    try:
+        interview = db.interviews.find_one({'interview_id': interview_id})
+        if not interview:
+            return jsonify({'message': 'Interview not found'}), 404
         
-        print(f"Database update result: modified_count={result.modified_count}")
-        
-        # Verify the data was stored
-        updated_interview = db.interviews.find_one({'interview_id': interview_id})
-        responses_count = len(updated_interview.get('responses', []))
-        print(f"Total responses now stored: {responses_count}")
-        
-        return jsonify({
-            'message': 'Response recorded and transcribed successfully',
-            'transcription': transcription,
-            'question_index': question_index,
-            'audio_size': len(audio_data),
-            'total_responses': responses_count
-        })
+        data = request.get_json() or {}
+        total_chunks = data.get('total_chunks')
+        if total_chunks is None:
+            return jsonify({'message': 'total_chunks is required'}), 400
+        
+        upload = chunked_uploads.get_open(interview_id, question_index, data.get('upload_id'))
+        if not upload:
+            # A retried finalize after success gets the original job back
+            finalized = chunked_uploads.find_finalized(interview_id, question_index, data.get('upload_id'))
+            if finalized:
+                job = transcription_jobs.get(finalized['job_id'])
+                return jsonify({
+                    'message': 'Response already received',
+                    'job_id': finalized['job_id'],
+                    'status': job['status'] if job else 'queued',
+                    'status_url': f"/transcription-jobs/{finalized['job_id']}",
+                    'question_index': question_index
+                }), 202
+            return jsonify({'message': 'No open upload for this answer'}), 404
         
+        try:
+            audio_file_id, audio_size, audio_sha256 = chunked_uploads.assemble(upload, int(total_chunks))
+        except ChunkedUploadError as e:
+            status = chunked_uploads.status(upload)
+            return jsonify({'message': str(e), 'received_chunks': status['received_chunks']}), 409
+        
+        print(f"Assembled upload {upload['upload_id']}: {total_chunks} chunks, {audio_size} bytes")
+        response, status_code = queue_answer_transcription(interview, question_index, audio_file_id, audio_size, audio_sha256)
+        chunked_uploads.mark_finalized(upload, response.get_json()['job_id'])
+        return response, status_code
     except Exception as e:
-        print(f"Error recording response: {str(e)}")
+        print(f"Error finalizing answer upload: {str(e)}")
         import traceback
         print(traceback.format_exc())
         return jsonify({'message': f'Error: {str(e)}'}), 500
-    finally:
-        # Clean up temporary file ONLY after transcription is complete
-        try:
-            if temp_audio_path and os.path.exists(temp_audio_path):
-                # Keep the file for debugging if there was an error in the transcription
-                if "Error during Whisper transcription" not in str(transcription):
-                    os.remove(temp_audio_path)
-                    print(f"Cleaned up audio file: {temp_audio_path}")
-                else:
-                    print(f"Keeping audio file for debugging: {temp_audio_path}")
-        except Exception as cleanup_error:
-            print(f"Error cleaning up audio file: {cleanup_error}")
+
+@app.route('/transcription-jobs/<job_id>', methods=['GET'])
+def transcription_job_status(job_id):
+    """Get the status and result of a transcription job."""
+    try:
+        job = transcription_jobs.get(job_id)
+        if not job:
+            return jsonify({'message': 'Transcription job not found'}), 404
+        return jsonify(job)
+    except Exception as e:
+        print(f"Error reading transcription job: {str(e)}")
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+def store_report_pdf(pdf_bytes):
+    """Persist a rendered report PDF; returns the interview fields that reference it."""
+    sha256, size = report_pdf_store.save(pdf_bytes)
+    return {
+        'report_pdf_sha256': sha256,
+        'report_pdf_size': size,
+        'report_pdf_rendered_at': datetime.now(timezone.utc)
+    }
+
+def finish_interview_report(interview, report_content, completion_id):
+    """Append the Q&A, email the PDF report and mark the interview completed.
+
+    Shared by complete_interview and the batch report scheduler. Returns
+    (email_sent, candidate_name), or None if another process took over the
+    completion meanwhile.
+    """
+    interview_id = interview['interview_id']
+    responses = interview.get('responses', [])
+    
+    # Get user details
+    user = db.users.find_one({'_id': interview['user_id']})
+    candidate_name = user.get('name', 'Candidate') if user else 'Candidate'
+    candidate_email = user.get('email', 'unknown@email.com') if user else 'unknown@email.com'
+    
+    print(f"Processing completion for candidate: {candidate_name} ({candidate_email})")
+    
+    # Evaluations finished while the report was generated, so read them fresh rather than from interview
+    stored = db.interviews.find_one({'interview_id': interview_id}, {'evaluations': 1}) or {}
+    evaluations = stored.get('evaluations', {})
+    
+    # Create Q&A section for the report
+    qa_section = "INTERVIEW QUESTIONS & ANSWERS:\n\n"
+    questions = interview.get('questions', [])
+    for i, question in enumerate(questions):
+        # Find corresponding response
+        response = None
+        for r in responses:
+            if r.get('question_index') == i:
+                response = r
+                break
+        
+        answer = response.get('transcription', 'No response recorded') if response else 'No response recorded'
+        qa_section += f"Question {i+1}: {question}\n"
+        qa_section += f"Response: {answer}\n"
+        evaluation = evaluations.get(str(i))
+        if evaluation and evaluation.get('status') == 'ready':
+            qa_section += f"Answer score: {evaluation['score']}/10\n"
+        qa_section += "\n"
+    
+    print("=== GENERATED REPORT PREVIEW ===")
+    print(report_content[:500] + "..." if len(report_content) > 500 else report_content)
+    print("===============================")
+    
+    if not report_content:
+        # Create a basic report if AI generation fails
+        report_content = f"""
+INTERVIEW ASSESSMENT REPORT
+
+CANDIDATE: {candidate_name}
+EMAIL: {candidate_email}
+DATE: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+INTERVIEW SUMMARY:
+The candidate participated in an AI-conducted interview session. Due to technical limitations, 
+detailed analysis could not be completed automatically.
+
+{qa_section}
+
+RECOMMENDATION:
+Manual review recommended for final assessment.
+
+SCORE: Pending manual review
+"""
+        print("Using fallback report due to AI generation failure")
+    else:
+        # Append the Q&A section to the AI-generated report
+        report_content += f"\n\n{qa_section}"
+    
+    # Create PDF report
+    print("Creating PDF report...")
+    pdf_buffer = create_pdf_report(report_content, candidate_name)
+    report_pdf = {}
+    if pdf_buffer:
+        report_pdf = store_report_pdf(pdf_buffer.getvalue())
+    
+    # Check if report already sent to prevent duplicate emails
+    report_already_sent = interview.get('report_sent', False)
+    
+    # Send email with report (only if not already sent)
+    email_sent = False
+    if pdf_buffer and not report_already_sent:
+        print("Sending email with report...")
+        email_sent = send_report_email(pdf_buffer, candidate_name, recipient_email="piyushkrishna11@gmail.com")
+        print(f"Email sent: {email_sent}")
+    elif report_already_sent:
+        print("Skipping email send - report was already sent previously")
+        email_sent = True
+    else:
+        print("Skipping email (PDF creation failed)")
+    
+    # Update interview status with completion ID to ensure this process is still the active one
+    update_result = db.interviews.update_one(
+        {
+            'interview_id': interview_id,
+            'completion_process_id': completion_id  # Ensure we're still the active process
+        },
+        {'$set': {
+            'status': 'completed',
+            'completed_at': datetime.now(timezone.utc),
+            'report_generated': True,
+            'report_status': REPORT_COMPLETE,
+            'report_sent': email_sent,
+            'report_content': report_content,
+            'report_score': parse_report(report_content).score,
+            'candidate_name': candidate_name,
+            **report_pdf
+        },
+         '$unset': {'completion_lease_until': ''}}
+    )
+    
+    if update_result.modified_count == 0:
+        return None
+    return email_sent, candidate_name
+
+def wait_for_completion(interview_id, timeout, poll_interval=1.0):
+    """Wait until no request holds the interview's completion lease; returns the interview, or None on timeout."""
+    deadline = time.monotonic() + timeout
+    while True:
+        interview = db.interviews.find_one(
+            {'interview_id': interview_id},
+            {'status': 1, 'report_status': 1, 'report_generated': 1, 'report_sent': 1, 'candidate_name': 1,
+             'completion_lease_until': 1}
+        )
+        lease_until = interview.get('completion_lease_until') if interview else None
+        if lease_until is None or lease_until.replace(tzinfo=timezone.utc) < datetime.now(timezone.utc):
+            return interview
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(poll_interval)
 
 @app.route('/interview/<interview_id>/complete', methods=['POST'])
 def complete_interview(interview_id):
     """Complete interview and generate report."""
+    # Unique per request, so only this request's updates apply while it holds the completion lease
+    completion_id = str(uuid.uuid4())
     try:
         print(f"=== COMPLETING INTERVIEW {interview_id} ===")
         
@@ -1161,7 +1381,7 @@ def complete_interview(interview_id):
         
         # Enhanced duplicate check: Check completion status and report_sent flag
         # Use an atomic update with a unique completion ID to prevent race conditions
-        completion_id = str(uuid.uuid4())
+        now = datetime.now(timezone.utc)
         
         # Use findAndModify (find_one_and_update) to atomically check and update
         # Only proceed if the interview is not already completed or email not sent
@@ -1171,11 +1391,19 @@ def complete_interview(interview_id):
                 '$or': [
                     {'status': {'$ne': 'completed'}},
                     {'report_sent': {'$ne': True}}
-                ]
+                ],
+                # A report waiting in a batch is finished by the batch scheduler
+                'report_status': {'$ne': REPORT_QUEUED},
+                # Nor is another request completing it right now
+                '$and': [{'$or': [
+                    {'completion_lease_until': {'$exists': False}},
+                    {'completion_lease_until': {'$lt': now}}
+                ]}]
             },
             {'$set': {
                 'completion_process_id': completion_id,
-                'completion_started_at': datetime.now(timezone.utc)
+                'completion_started_at': now,
+                'completion_lease_until': now + timedelta(seconds=INTERVIEW_COMPLETION_LEASE_SECONDS)
             }},
             return_document=False
         )
@@ -1183,6 +1411,22 @@ def complete_interview(interview_id):
         # If no document was updated, another process is already completing it
         if not result:
             print(f"Interview {interview_id} already being completed or email already sent")
+            # A retried or double-clicked request reports the running completion's outcome instead of generating again
+            finished = wait_for_completion(interview_id, INTERVIEW_COMPLETION_LEASE_SECONDS)
+            if finished and finished.get('report_status') == REPORT_QUEUED:
+                return jsonify({
+                    'message': 'Interview completed, report queued',
+                    'report_generated': False,
+                    'report_status': REPORT_QUEUED,
+                    'report_url': f'/interview/{interview_id}/report'
+                }), 202
+            if finished and finished.get('status') == 'completed':
+                return jsonify({
+                    'message': 'Interview completed successfully',
+                    'report_generated': finished.get('report_generated', False),
+                    'email_sent': finished.get('report_sent', False),
+                    'candidate_name': finished.get('candidate_name', 'Candidate')
+                })
             return jsonify({
                 'message': 'Interview already completed or being processed',
                 'report_generated': True,
@@ -1190,12 +1434,10 @@ def complete_interview(interview_id):
                 'candidate_name': interview.get('candidate_name', 'Candidate')
             })
         
-        # Get user details
-        user = db.users.find_one({'_id': interview['user_id']})
-        candidate_name = user.get('name', 'Candidate') if user else 'Candidate'
-        candidate_email = user.get('email', 'unknown@email.com') if user else 'unknown@email.com'
-        
-        print(f"Processing completion for candidate: {candidate_name} ({candidate_email})")
+        # Make sure answers still being transcribed make it into the report
+        if not transcription_jobs.wait_for_interview(interview_id, timeout=TRANSCRIPTION_JOB_TIMEOUT):
+            print(f"Completing interview {interview_id} with transcriptions still pending")
+        interview = db.interviews.find_one({'interview_id': interview_id})
         
         # Check if interview has responses, if not create a basic structure
         responses = interview.get('responses', [])
@@ -1231,91 +1473,39 @@ def complete_interview(interview_id):
             interview['responses'] = responses
             print("Created dummy responses for empty interview")
         
-        # Create Q&A section for the report
-        qa_section = "INTERVIEW QUESTIONS & ANSWERS:\n\n"
-        questions = interview.get('questions', [])
-        for i, question in enumerate(questions):
-            # Find corresponding response
-            response = None
-            for r in responses:
-                if r.get('question_index') == i:
-                    response = r
-                    break
-            
-            answer = response.get('transcription', 'No response recorded') if response else 'No response recorded'
-            qa_section += f"Question {i+1}: {question}\n"
-            qa_section += f"Response: {answer}\n\n"
+        request_data = request.get_json(silent=True) or {}
+        priority = bool(request_data.get('priority') or interview.get('report_priority'))
+        if REPORT_MODE == 'batch' and not priority:
+            # Scored with the next report batch; the scheduler finishes the interview
+            report_batches.enqueue(interview_id, build_report_request(interview))
+            db.interviews.update_one(
+                {'interview_id': interview_id, 'completion_process_id': completion_id},
+                {'$set': {
+                    'status': 'completed',
+                    'completed_at': datetime.now(timezone.utc),
+                    'report_generated': False,
+                    'report_status': REPORT_QUEUED,
+                    'report_queued_at': datetime.now(timezone.utc)
+                },
+                 '$unset': {'completion_lease_until': ''}}
+            )
+            print(f"Interview {interview_id} report queued for batch scoring")
+            return jsonify({
+                'message': 'Interview completed, report queued',
+                'report_generated': False,
+                'report_status': REPORT_QUEUED,
+                'report_url': f'/interview/{interview_id}/report'
+            }), 202
         
         # Generate report
         print("Generating interview report...")
-        report_content = generate_interview_report(interview)
-        
-        print("=== GENERATED REPORT PREVIEW ===")
-        print(report_content[:500] + "..." if len(report_content) > 500 else report_content)
-        print("===============================")
-        
-        if not report_content:
-            # Create a basic report if AI generation fails
-            report_content = f"""
-INTERVIEW ASSESSMENT REPORT
-
-CANDIDATE: {candidate_name}
-EMAIL: {candidate_email}
-DATE: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-INTERVIEW SUMMARY:
-The candidate participated in an AI-conducted interview session. Due to technical limitations, 
-detailed analysis could not be completed automatically.
-
-{qa_section}
-
-RECOMMENDATION:
-Manual review recommended for final assessment.
-
-SCORE: Pending manual review
-"""
-            print("Using fallback report due to AI generation failure")
-        else:
-            # Append the Q&A section to the AI-generated report
-            report_content += f"\n\n{qa_section}"
-        
-        # Create PDF report
-        print("Creating PDF report...")
-        pdf_buffer = create_pdf_report(report_content, candidate_name)
-        
-        # Check if report already sent to prevent duplicate emails
-        report_already_sent = interview.get('report_sent', False)
-        
-        # Send email with report (only if not already sent)
-        email_sent = False
-        if pdf_buffer and not report_already_sent:
-            print("Sending email with report...")
-            email_sent = send_report_email(pdf_buffer, candidate_name, recipient_email="piyushkrishna11@gmail.com")
-            print(f"Email sent: {email_sent}")
-        elif report_already_sent:
-            print("Skipping email send - report was already sent previously")
-            email_sent = True
-        else:
-            print("Skipping email (PDF creation failed)")
+        stream_writer = ReportStreamWriter(db, interview_id) if REPORT_STREAMING else None
+        report_content = generate_interview_report(interview, stream_writer=stream_writer)
         
-        # Update interview status with completion ID to ensure this process is still the active one
-        update_result = db.interviews.update_one(
-            {
-                'interview_id': interview_id,
-                'completion_process_id': completion_id  # Ensure we're still the active process
-            },
-            {'$set': {
-                'status': 'completed',
-                'completed_at': datetime.now(timezone.utc),
-                'report_generated': True,
-                'report_sent': email_sent,
-                'report_content': report_content,
-                'candidate_name': candidate_name
-            }}
-        )
+        finished = finish_interview_report(interview, report_content, completion_id)
         
         # Check if our update was successful
-        if update_result.modified_count == 0:
+        if finished is None:
             print(f"Interview completion collision detected for {interview_id}")
             return jsonify({
                 'message': 'Interview was completed by another process',
@@ -1323,6 +1513,7 @@ SCORE: Pending manual review
                 'email_sent': True,
             })
         
+        email_sent, candidate_name = finished
         print(f"Interview {interview_id} completion processed successfully")
         
         return jsonify({
@@ -1336,8 +1527,117 @@ SCORE: Pending manual review
         print(f"Error completing interview: {str(e)}")
         import traceback
         print(traceback.format_exc())
+        db.interviews.update_one(
+            {'interview_id': interview_id, 'completion_process_id': completion_id},
+            {'$unset': {'completion_lease_until': ''}}
+        )
         return jsonify({'message': f'Error completing interview: {str(e)}'}), 500
 
+@app.route('/interview/<interview_id>/report', methods=['GET'])
+@recruiter_required
+def interview_report(current_user, interview_id):
+    """Report sections generated so far, for rendering while the report is still streaming."""
+    try:
+        interview = db.interviews.find_one(
+            {'interview_id': interview_id},
+            {'report_status': 1, 'report_sections': 1, 'report_partial': 1, 'report_generated': 1, 'report_content': 1,
+             'report_prompt_stats': 1}
+        )
+        if not interview:
+            return jsonify({'message': 'Interview not found'}), 404
+        
+        return jsonify({
+            'interview_id': interview_id,
+            'status': interview.get('report_status', REPORT_COMPLETE if interview.get('report_generated') else 'pending'),
+            'sections': interview.get('report_sections', []),
+            'content': interview.get('report_content') or interview.get('report_partial', ''),
+            'report_generated': interview.get('report_generated', False),
+            'prompt_stats': interview.get('report_prompt_stats'),
+            'pdf_url': f'/interview/{interview_id}/report.pdf' if interview.get('report_content') else None
+        })
+    except Exception as e:
+        print(f"Error getting interview report: {str(e)}")
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@app.route('/interview/<interview_id>/report.pdf', methods=['GET'])
+@recruiter_required
+def download_report_pdf(current_user, interview_id):
+    """Stored report PDF with ETag, conditional GET and Range support; rendered only if never stored."""
+    try:
+        interview = db.interviews.find_one(
+            {'interview_id': interview_id},
+            {'report_pdf_sha256': 1, 'report_content': 1, 'candidate_name': 1}
+        )
+        if not interview:
+            return jsonify({'message': 'Interview not found'}), 404
+        
+        sha256 = interview.get('report_pdf_sha256')
+        if not report_pdf_store.exists(sha256):
+            if not interview.get('report_content'):
+                return jsonify({'message': 'Report not ready'}), 404
+            # Reports completed before PDFs were stored are rendered once, then served from disk
+            pdf_buffer = create_pdf_report(interview['report_content'], interview.get('candidate_name', 'Candidate'))
+            if not pdf_buffer:
+                return jsonify({'message': 'Error creating report PDF'}), 500
+            report_pdf = store_report_pdf(pdf_buffer.getvalue())
+            db.interviews.update_one({'interview_id': interview_id}, {'$set': report_pdf})
+            sha256 = report_pdf['report_pdf_sha256']
+        
+        response = send_file(
+            report_pdf_store.path(sha256),
+            mimetype='application/pdf',
+            as_attachment=request.args.get('download') == '1',
+            download_name=f"interview_report_{interview_id}.pdf",
+            conditional=True,
+            etag=sha256,
+            max_age=REPORT_PDF_MAX_AGE
+        )
+        # Candidate reports may be cached by the recruiter's browser, not by shared proxies
+        response.cache_control.public = False
+        response.cache_control.private = True
+        return response
+    except Exception as e:
+        print(f"Error serving report PDF: {str(e)}")
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@app.route('/interview/<interview_id>/report/events', methods=['GET'])
+@recruiter_required
+def interview_report_events(current_user, interview_id):
+    """Server-sent events: one 'section' event per completed report section, then 'done'."""
+    if not db.interviews.find_one({'interview_id': interview_id}, {'_id': 1}):
+        return jsonify({'message': 'Interview not found'}), 404
+    if not report_event_streams.acquire(blocking=False):
+        response = jsonify({
+            'message': 'Too many report event streams, poll the report instead',
+            'report_url': f'/interview/{interview_id}/report'
+        })
+        response.headers['Retry-After'] = '2'
+        return response, 503
+    
+    def events():
+        sent = 0
+        deadline = time.monotonic() + REPORT_EVENTS_TIMEOUT
+        while time.monotonic() < deadline:
+            interview = db.interviews.find_one(
+                {'interview_id': interview_id},
+                {'report_status': 1, 'report_sections': 1, 'report_generated': 1}
+            )
+            sections = interview.get('report_sections', [])
+            for section in sections[sent:]:
+                yield f"event: section\ndata: {json.dumps(section)}\n\n"
+            sent = len(sections)
+            status = interview.get('report_status')
+            if status in (REPORT_COMPLETE, REPORT_FAILED) or (status is None and interview.get('report_generated')):
+                yield f"event: done\ndata: {json.dumps({'status': status or REPORT_COMPLETE})}\n\n"
+                return
+            time.sleep(0.5)
+        yield "event: timeout\ndata: {}\n\n"
+    
+    response = Response(stream_with_context(events()), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+    # Runs when the server closes the response, even if the client left before the first event
+    response.call_on_close(report_event_streams.release)
+    return response
+
 @app.route('/interview/<interview_id>/next-question', methods=['POST'])
 def next_question(interview_id):
     """Move to the next question in the interview."""
@@ -1361,16 +1661,26 @@ def next_question(interview_id):
                 'current_question_index': manager.current_question_index
             })
             
+        # Adaptive interviews ask the precomputed follow-up if it is ready by the deadline
+        question_source = 'planned'
+        if interview.get('adaptive'):
+            question, question_source = followup_planner.resolve(
+                interview_id, manager.current_question_index, manager.questions[manager.current_question_index]
+            )
+            manager.questions[manager.current_question_index] = question
+        
         # Update status
         manager.update_interview_status('in_progress', {
-            'current_question_index': manager.current_question_index
+            'current_question_index': manager.current_question_index,
+            f'questions.{manager.current_question_index}': manager.questions[manager.current_question_index]
         })
         
         return jsonify({
             'message': 'Moved to next question',
             'has_more_questions': True,
             'current_question_index': manager.current_question_index,
-            'question': manager.questions[manager.current_question_index]
+            'question': manager.questions[manager.current_question_index],
+            'question_source': question_source
         })
         
     except Exception as e:
@@ -1480,9 +1790,102 @@ def create_interview_room(interview_id, user_id):
         print(traceback.format_exc())
         raise e
 
+resume_pipeline = ResumePipeline(
+    db,
+    extract_text=extract_text_from_pdf,
+    parse_resume=parse_resume_with_openai,
+    generate_questions=generate_questions_from_profile,
+    provision_room=create_interview_room,
+    analyse_resume=analyse_resume_with_openai if RESUME_ANALYSIS_MODE == 'fused' else None,
+    workers=RESUME_PIPELINE_WORKERS,
+    stale_seconds=RESUME_PIPELINE_STALE_SECONDS,
+    cache=resume_cache,
+    fallback_questions=DEFAULT_INTERVIEW_QUESTIONS,
+    question_index=question_index,
+    question_source=QUESTION_SOURCE
+)
+
 # Set FFmpeg path
 FFMPEG_PATH = r"C:\Users\HP\Downloads\ffmpeg-2025-06-11-git-f019dd69f0-essentials_build\ffmpeg-2025-06-11-git-f019dd69f0-essentials_build\bin"
 os.environ["PATH"] = FFMPEG_PATH + os.pathsep + os.environ["PATH"]
+FFMPEG_BINARY = os.getenv('FFMPEG_BINARY', os.path.join(FFMPEG_PATH, "ffmpeg.exe"))
+
+audio_store = AudioStore(db)
+chunked_uploads = ChunkedUploadManager(db, audio_store)
+
+followup_planner = FollowUpPlanner(
+    db,
+    generate_followup_question,
+    deadline_seconds=FOLLOWUP_DEADLINE_SECONDS,
+    workers=FOLLOWUP_WORKERS,
+    # The previous answer is usually still being transcribed when the next question is requested
+    answer_pending=lambda interview_id, question_index: transcription_jobs.has_pending(interview_id, question_index)
+)
+
+answer_evaluator = AnswerEvaluator(db, evaluate_answer, workers=ANSWER_EVALUATION_WORKERS)
+
+def on_response_stored(interview_id, response):
+    """Background work started as soon as an answer's transcription is stored."""
+    followup_planner.on_response(interview_id, response)
+    if INCREMENTAL_EVALUATION:
+        answer_evaluator.on_response(interview_id, response)
+
+transcription_jobs = TranscriptionJobQueue(
+    db,
+    audio_store,
+    backend=TRANSCRIPTION_JOB_BACKEND,
+    workers=TRANSCRIPTION_WORKERS,
+    job_timeout=TRANSCRIPTION_JOB_TIMEOUT,
+    max_attempts=TRANSCRIPTION_JOB_MAX_ATTEMPTS,
+    registry=speech_model,
+    backend_spec=transcription_backend.spec,
+    ffmpeg_binary=FFMPEG_BINARY,
+    trim_silence=VAD_ENABLED,
+    cache=transcription_cache,
+    cache_config=transcription_cache_config if transcription_cache else None,
+    on_response=on_response_stored
+)
+
+streaming_server = StreamingTranscriptionServer(
+    db,
+    speech_model,
+    ffmpeg_binary=FFMPEG_BINARY,
+    host=STREAMING_HOST,
+    port=STREAMING_PORT,
+    segment_seconds=STREAMING_SEGMENT_SECONDS,
+    skip_silence=VAD_ENABLED,
+    on_response=on_response_stored
+)
+
+def finish_batch_report(interview_id, report_content):
+    """Batch scheduler callback: finish an interview whose report came back from a batch."""
+    interview = db.interviews.find_one({'interview_id': interview_id})
+    if not interview:
+        print(f"Batch report for unknown interview {interview_id}")
+        return
+    if finish_interview_report(interview, report_content, interview.get('completion_process_id')) is None:
+        print(f"Batch report for interview {interview_id} was superseded")
+
+def fail_batch_report(interview_id, error):
+    """Batch scheduler callback: fall back to the summary report when batch scoring failed."""
+    print(f"Batch report failed for interview {interview_id}: {str(error)}")
+    interview = db.interviews.find_one({'interview_id': interview_id})
+    if interview:
+        finish_batch_report(interview_id, fallback_interview_report(interview))
+
+if REPORT_BATCH_EXECUTOR == 'openai':
+    report_batch_executor = OpenAIBatchExecutor(openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY')))
+else:
+    report_batch_executor = LocalBatchExecutor(llm)
+report_batches = ReportBatchQueue(
+    db,
+    report_batch_executor,
+    on_result=finish_batch_report,
+    on_error=fail_batch_report,
+    batch_size=REPORT_BATCH_SIZE,
+    max_wait_seconds=REPORT_BATCH_MAX_WAIT_SECONDS,
+    poll_interval=REPORT_BATCH_POLL_SECONDS
+)
 
 # Also set the paths directly for pydub
 AudioSegment.converter = os.path.join(FFMPEG_PATH, "ffmpeg.exe")
@@ -1491,6 +1894,129 @@ AudioSegment.ffprobe = os.path.join(FFMPEG_PATH, "ffprobe.exe")
 
 print(f"FFmpeg path set to: {FFMPEG_PATH}")
 
+@app.route('/transcription/models', methods=['GET'])
+def transcription_models():
+    """Report load time and memory usage of the Whisper models in this worker."""
+    try:
+        stats = transcription_backend.stats()
+        stats['batching'] = whisper_batcher.stats() if whisper_batcher else None
+        stats['cache'] = transcription_cache.stats() if transcription_cache else None
+        return jsonify(stats)
+    except Exception as e:
+        print(f"Error reading Whisper model stats: {str(e)}")
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@app.route('/llm/stats', methods=['GET'])
+def llm_stats():
+    """In-flight LLM calls plus token and latency totals per call site in this worker."""
+    try:
+        return jsonify(llm.stats())
+    except Exception as e:
+        print(f"Error getting LLM stats: {str(e)}")
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+@app.route('/reports/batches', methods=['GET'])
+def report_batch_stats():
+    """Reports waiting for or being scored in a batch."""
+    try:
+        stats = report_batches.stats()
+        stats['mode'] = REPORT_MODE
+        return jsonify(stats)
+    except Exception as e:
+        print(f"Error getting report batch stats: {str(e)}")
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
+def export_report_page(page):
+    """Export rows of one page of interviews, rendering the PDFs that were never stored in parallel."""
+    missing_pdf = [i for i in page if not report_pdf_store.exists(i.get('report_pdf_sha256'))]
+    missing_pdf_ids = {i['interview_id'] for i in missing_pdf}
+    missing = [i['interview_id'] for i in page if i['interview_id'] in missing_pdf_ids or not i.get('report_score')]
+    contents = {}
+    if missing:
+        contents = {
+            doc['interview_id']: doc.get('report_content')
+            for doc in db.interviews.find({'interview_id': {'$in': missing}}, {'interview_id': 1, 'report_content': 1})
+        }
+    
+    to_render = [i for i in missing_pdf if contents.get(i['interview_id'])]
+    if to_render:
+        try:
+            pdfs = report_renderer.render_many([
+                (contents[i['interview_id']], i.get('candidate_name') or 'Candidate') for i in to_render
+            ])
+            for interview, pdf in zip(to_render, pdfs):
+                report_pdf = store_report_pdf(pdf)
+                db.interviews.update_one({'interview_id': interview['interview_id']}, {'$set': report_pdf})
+                interview.update(report_pdf)
+        except Exception as e:
+            print(f"Error rendering report PDFs for export: {str(e)}")
+    
+    for interview in page:
+        interview_id = interview['interview_id']
+        sha256 = interview.get('report_pdf_sha256')
+        score = interview.get('report_score')
+        if not score and contents.get(interview_id):
+            score = parse_report(contents[interview_id]).score
+        completed_at = interview.get('completed_at')
+        row = {
+            'interview_id': interview_id,
+            'candidate_name': interview.get('candidate_name', ''),
+            'role': interview.get('role') or '',
+            'status': interview.get('status', ''),
+            'report_status': interview.get('report_status', ''),
+            'score': score or '',
+            'completed_at': completed_at.isoformat() if completed_at else ''
+        }
+        pdf_name = f"{secure_filename(interview.get('candidate_name') or 'candidate')}_{interview_id[:8]}.pdf"
+        yield row, report_pdf_store.path(sha256) if report_pdf_store.exists(sha256) else None, pdf_name
+
+def iter_report_export(query):
+    """(row, pdf path, zip entry name) per interview, a page at a time."""
+    cursor = db.interviews.find(query, {
+        'interview_id': 1, 'candidate_name': 1, 'role': 1, 'status': 1, 'report_status': 1,
+        'report_score': 1, 'report_pdf_sha256': 1, 'completed_at': 1
+    }).sort('completed_at', 1).batch_size(REPORT_EXPORT_PAGE_SIZE)
+    page = []
+    for interview in cursor:
+        page.append(interview)
+        if len(page) >= REPORT_EXPORT_PAGE_SIZE:
+            yield from export_report_page(page)
+            page = []
+    if page:
+        yield from export_report_page(page)
+
+@app.route('/reports/export.zip', methods=['GET'])
+@recruiter_required
+def export_reports(current_user):
+    """Stream a zip of the report PDFs of completed interviews plus a CSV summary.
+    
+    Optional filters: role, and from/to as ISO dates on the completion time.
+    """
+    try:
+        query = {'status': 'completed'}
+        if request.args.get('role'):
+            query['role'] = request.args['role']
+        completed_at = {}
+        if request.args.get('from'):
+            completed_at['$gte'] = datetime.fromisoformat(request.args['from'])
+        if request.args.get('to'):
+            completed_at['$lte'] = datetime.fromisoformat(request.args['to'])
+        if completed_at:
+            query['completed_at'] = completed_at
+        
+        filename = f"interview_reports_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        print(f"Exporting interview reports for {query}")
+        return Response(
+            stream_with_context(stream_report_zip(iter_report_export(query))),
+            mimetype='application/zip',
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+    except ValueError as e:
+        return jsonify({'message': f'Invalid date filter: {str(e)}'}), 400
+    except Exception as e:
+        print(f"Error exporting reports: {str(e)}")
+        return jsonify({'message': f'Error: {str(e)}'}), 500
+
 @app.route('/test-ffmpeg', methods=['GET'])
 def test_ffmpeg():
     """Test if FFmpeg is properly configured."""
@@ -1612,6 +2138,24 @@ AI Interviewer System
         print(traceback.format_exc())
         return False
 
-if __name__ == '__main__':
-    app.run(debug=True)
+_services_started = False
+
+def start_services():
+    """Start the background work of the serving process.
 
+    Called by run.py and wsgi.py rather than at import, so importing this
+    module never warms Whisper, requeues jobs or resume runs, binds the
+    streaming port or runs the batch scheduler.
+    """
+    global _services_started
+    if _services_started:
+        return
+    _services_started = True
+    if WHISPER_WARM_ON_STARTUP:
+        transcription_backend.warm_in_background()
+    transcription_jobs.requeue_stale_jobs()
+    resume_pipeline.start_in_background()
+    if STREAMING_ENABLED:
+        streaming_server.start_in_background()
+    if REPORT_MODE == 'batch':
+        report_batches.start_in_background()
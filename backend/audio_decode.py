@@ -0,0 +1,76 @@
+import subprocess
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+class AudioDecodeError(Exception):
+    """Raised when ffmpeg cannot decode the uploaded audio."""
+
+
+def decode_audio_bytes(audio_data, ffmpeg_binary="ffmpeg", sample_rate=SAMPLE_RATE, timeout=60):
+    """Decode encoded audio (webm/ogg/wav/...) into a mono float32 NumPy array.
+
+    The encoded bytes are piped to ffmpeg on stdin and raw 16-bit PCM is read
+    back from stdout, so nothing is written to disk.
+    """
+    if not audio_data:
+        raise AudioDecodeError("Audio data is empty (0 bytes)")
+
+    ffmpeg_cmd = [
+        ffmpeg_binary,
+        "-hide_banner",
+        "-loglevel", "error",
+        "-threads", "0",
+        "-i", "pipe:0",
+        "-f", "s16le",
+        "-acodec", "pcm_s16le",
+        "-ac", "1",
+        "-ar", str(sample_rate),
+        "pipe:1"
+    ]
+
+    try:
+        result = subprocess.run(
+            ffmpeg_cmd,
+            input=audio_data,
+            capture_output=True,
+            check=True,
+            timeout=timeout
+        )
+    except subprocess.CalledProcessError as e:
+        raise AudioDecodeError(f"FFmpeg error: {e.stderr.decode(errors='replace') if e.stderr else str(e)}")
+    except subprocess.TimeoutExpired:
+        raise AudioDecodeError(f"FFmpeg timed out after {timeout} seconds")
+
+    return pcm16_to_float32(result.stdout)
+
+
+def pcm16_to_float32(pcm_bytes):
+    """Convert little-endian 16-bit PCM bytes to float32 samples in [-1, 1)."""
+    # Drop a trailing odd byte rather than failing on a truncated stream
+    usable = len(pcm_bytes) - (len(pcm_bytes) % 2)
+    return np.frombuffer(pcm_bytes[:usable], dtype='<i2').astype(np.float32) / 32768.0
+
+
+def audio_duration_seconds(samples, sample_rate=SAMPLE_RATE):
+    """Return the duration of a decoded buffer in seconds."""
+    return len(samples) / float(sample_rate)
+
+
+def find_quiet_cut(samples, search_seconds=1.5, frame_seconds=0.03, sample_rate=SAMPLE_RATE):
+    """Return the index of the quietest frame near the end of samples.
+
+    Cutting a segment there keeps words from being split across two
+    transcription windows.
+    """
+    frame = int(frame_seconds * sample_rate)
+    search = min(len(samples), int(search_seconds * sample_rate))
+    if frame <= 0 or search < frame:
+        return len(samples)
+    tail = samples[len(samples) - search:]
+    frames = tail[:len(tail) - len(tail) % frame].reshape(-1, frame)
+    energy = np.square(frames).mean(axis=1)
+    quietest = int(np.argmin(energy))
+    return len(samples) - search + quietest * frame + frame // 2
@@ -0,0 +1,54 @@
+import hashlib
+
+from bson import ObjectId
+from gridfs import GridFSBucket
+
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+
+class AudioStore:
+    """Keeps uploaded answer audio in GridFS until it has been transcribed."""
+
+    def __init__(self, db, bucket_name='answer_audio', chunk_size=UPLOAD_CHUNK_SIZE):
+        self.bucket = GridFSBucket(db, bucket_name=bucket_name, chunk_size_bytes=chunk_size)
+        self.chunk_size = chunk_size
+
+    def save_stream(self, stream, filename, content_type=None, metadata=None):
+        """Copy a file-like stream into GridFS in fixed-size chunks.
+
+        Only one chunk is held in memory at a time. Returns the file id, the
+        size in bytes and the SHA-256 of the content.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        metadata = dict(metadata or {})
+        if content_type:
+            metadata['content_type'] = content_type
+        with self.bucket.open_upload_stream(filename, metadata=metadata) as upload:
+            while True:
+                chunk = stream.read(self.chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                size += len(chunk)
+                upload.write(chunk)
+            file_id = upload._id
+        return file_id, size, digest.hexdigest()
+
+    def save_bytes(self, data, filename, content_type=None, metadata=None):
+        """Store audio that is already in memory (the base64 JSON upload path)."""
+        metadata = dict(metadata or {})
+        if content_type:
+            metadata['content_type'] = content_type
+        file_id = self.bucket.upload_from_stream(filename, data, metadata=metadata)
+        return file_id, len(data), hashlib.sha256(data).hexdigest()
+
+    def read(self, file_id):
+        with self.bucket.open_download_stream(ObjectId(file_id)) as download:
+            return download.read()
+
+    def delete(self, file_id):
+        try:
+            self.bucket.delete(ObjectId(file_id))
+        except Exception as e:
+            print(f"Error deleting stored audio {file_id}: {str(e)}")
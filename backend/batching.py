@@ -0,0 +1,143 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import torch
+import whisper
+
+from audio_decode import find_quiet_cut
+
+# Whisper's encoder always sees 30 second windows
+SEGMENT_SAMPLES = whisper.audio.N_SAMPLES
+
+
+def split_into_segments(samples, segment_samples=SEGMENT_SAMPLES):
+    """Split a clip into <=30 s pieces, cutting at quiet points near each boundary."""
+    segments = []
+    start = 0
+    while len(samples) - start > segment_samples:
+        window = samples[start:start + segment_samples]
+        cut = find_quiet_cut(window)
+        segments.append(window[:cut])
+        start += cut
+    segments.append(samples[start:])
+    return segments
+
+
+class _BatchRequest:
+    def __init__(self, samples):
+        self.segments = split_into_segments(samples)
+        self.texts = [None] * len(self.segments)
+        self.future = Future()
+
+
+class BatchingTranscriber:
+    """Micro-batches clips from concurrent requests into one Whisper forward pass.
+
+    Callers block in transcribe() while a scheduler thread collects whatever
+    arrives within max_wait_ms (up to max_batch_size 30 s segments), decodes
+    them as a single batch and hands each caller its own text. Calls that pass
+    decoding options such as initial_prompt cannot share a batch and go
+    straight to the registry.
+    """
+
+    def __init__(self, registry, max_batch_size=8, max_wait_ms=50, model_name=None, language=None):
+        self.registry = registry
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.model_name = model_name
+        self.language = language
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._segments = 0
+        self._clips = 0
+        self._thread = threading.Thread(target=self._loop, name='whisper-batcher', daemon=True)
+        self._thread.start()
+
+    def transcribe(self, samples, **options):
+        """Transcribe a decoded 16 kHz clip, returning {'text': ...} like model.transcribe."""
+        if options:
+            return self.registry.transcribe(samples, name=self.model_name, **options)
+        request = _BatchRequest(samples)
+        self._queue.put(request)
+        texts = request.future.result()
+        return {'text': " ".join(t for t in texts if t).strip()}
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        segment_count = len(batch[0].segments)
+        deadline = time.monotonic() + self.max_wait
+        while segment_count < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            segment_count += len(request.segments)
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            try:
+                self._run_batch(batch)
+            except Exception as e:
+                print(f"Error in batched transcription: {str(e)}")
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+
+    def _run_batch(self, batch):
+        items = [(request, i, segment) for request in batch for i, segment in enumerate(request.segments)]
+        for start in range(0, len(items), self.max_batch_size):
+            chunk = items[start:start + self.max_batch_size]
+            texts = self.registry.run(lambda model: self._decode(model, [segment for _, _, segment in chunk]),
+                                      name=self.model_name)
+            for (request, i, _), text in zip(chunk, texts):
+                request.texts[i] = text
+
+        for request in batch:
+            request.future.set_result(request.texts)
+
+        with self._lock:
+            self._batches += 1
+            self._segments += len(items)
+            self._clips += len(batch)
+        print(f"Transcribed batch of {len(batch)} clips ({len(items)} segments)")
+
+    def _decode(self, model, segments):
+        mels = [
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(segment), model.dims.n_mels)
+            for segment in segments
+        ]
+        mel_batch = torch.stack(mels).to(model.device)
+        options = whisper.DecodingOptions(
+            language=self.language,
+            without_timestamps=True,
+            fp16=model.device.type == 'cuda'
+        )
+        results = whisper.decode(model, mel_batch, options)
+        texts = []
+        for result in results:
+            # Same silence rule model.transcribe applies to each segment
+            if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0:
+                texts.append('')
+            else:
+                texts.append(result.text.strip())
+        return texts
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': int(self.max_wait * 1000),
+                'batches': self._batches,
+                'clips': self._clips,
+                'segments': self._segments,
+                'avg_clips_per_batch': round(self._clips / self._batches, 2) if self._batches else 0
+            }
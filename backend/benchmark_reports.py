@@ -0,0 +1,134 @@
+"""Benchmark report PDF rendering for short, typical and long interviews.
+
+Renders synthetic reports with 2, 15 and 50 questions and prints reports per
+second and the peak Python heap of one render for:
+  - uncached: styles rebuilt for every report, as the renderer used to
+  - inline:   precompiled styles, one report at a time on this thread
+  - pool:     precompiled styles in a pool of worker processes
+
+Each scenario runs in its own fresh process so peak memory is not polluted
+by the previous one.
+
+Usage:
+    python benchmark_reports.py [--questions 2 15 50] [--reports 40] [--workers 4]
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+SENTENCES = [
+    "I designed the service around a queue so slow jobs never block the request path.",
+    "We measured p95 latency before and after the change and it dropped by about forty percent.",
+    "The main trade-off was consistency, so we used idempotent writes and retried on conflict.",
+    "I would start by reading the slow query log and checking which indexes the planner chose.",
+    "Caching helped, but we had to invalidate entries whenever the upstream profile changed.",
+    "For testing I wrote integration tests against a disposable database container.",
+    "In hindsight I would have added tracing earlier to find the bottleneck faster.",
+]
+
+
+def sample_report(question_count, seed=0):
+    """An LLM-style assessment followed by the Q&A section, like the reports the app renders."""
+    rng = random.Random(seed)
+    sections = [
+        "1. CANDIDATE OVERVIEW", "2. STRENGTHS", "3. AREAS FOR IMPROVEMENT",
+        "4. TECHNICAL SKILLS ASSESSMENT", "5. COMMUNICATION SKILLS", "6. OVERALL RECOMMENDATION: Consider"
+    ]
+    lines = []
+    for title in sections:
+        lines += [title.split('. ', 1)[1].split(':')[0], ' '.join(rng.choice(SENTENCES) for _ in range(3)), '']
+    lines += ["SCORE: 7/10", "", "INTERVIEW QUESTIONS & ANSWERS:", ""]
+    for i in range(question_count):
+        lines.append(f"Question {i+1}: How did you approach problem number {i+1} in your last project?")
+        lines.append("Response: " + ' '.join(rng.choice(SENTENCES) for _ in range(rng.randint(4, 10))))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def run_scenario(mode, question_count, reports, workers):
+    """Render `reports` reports of one size; runs inside a dedicated process."""
+    from report_renderer import ReportRenderer, compile_styles, render_report_pdf
+
+    contents = [sample_report(question_count, seed) for seed in range(reports)]
+    # One untimed render so imports and font loading are not in the timings
+    render_report_pdf(contents[0])
+
+    started = time.perf_counter()
+    if mode == 'uncached':
+        sizes = [len(render_report_pdf(c, styles=compile_styles())) for c in contents]
+    elif mode == 'inline':
+        sizes = [len(render_report_pdf(c)) for c in contents]
+    else:
+        renderer = ReportRenderer(workers=workers)
+        renderer.render_many([(c,) for c in contents[:workers]])  # start the workers outside the timing
+        started = time.perf_counter()
+        sizes = [len(pdf) for pdf in renderer.render_many([(c,) for c in contents])]
+        renderer.shutdown()
+    elapsed = time.perf_counter() - started
+
+    # Peak heap of a single render, traced separately because tracing slows rendering down
+    tracemalloc.start()
+    if mode == 'uncached':
+        render_report_pdf(contents[0], styles=compile_styles())
+    else:
+        render_report_pdf(contents[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'mode': mode,
+        'questions': question_count,
+        'reports': reports,
+        'workers': workers if mode == 'pool' else 1,
+        'reports_per_second': round(reports / elapsed, 2),
+        'ms_per_report': round(elapsed / reports * 1000, 1),
+        'peak_heap_mb': round(peak / (1024 * 1024), 2),
+        'avg_pdf_kb': round(sum(sizes) / len(sizes) / 1024, 1)
+    }
+
+
+def print_table(results):
+    header = f"{'questions':>9} {'mode':<9} {'workers':>7} {'reports/s':>10} {'ms/report':>10} {'peak heap MB':>13} {'PDF KB':>7}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['questions']:>9} {r['mode']:<9} {r['workers']:>7} {r['reports_per_second']:>10.2f} "
+              f"{r['ms_per_report']:>10.1f} {r['peak_heap_mb']:>13.2f} {r['avg_pdf_kb']:>7.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark report PDF rendering")
+    parser.add_argument('--questions', type=int, nargs='+', default=[2, 15, 50], help="Interview lengths to render")
+    parser.add_argument('--reports', type=int, default=40, help="Reports rendered per scenario")
+    parser.add_argument('--workers', type=int, default=4, help="Worker processes for the pool scenario")
+    parser.add_argument('--mode', action='append', dest='modes', choices=['uncached', 'inline', 'pool'],
+                        help="Scenario, repeatable (default: all)")
+    parser.add_argument('--json', dest='json_path', help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for question_count in args.questions:
+        for mode in args.modes or ['uncached', 'inline', 'pool']:
+            print(f"Rendering {args.reports} reports with {question_count} questions ({mode})...")
+            try:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    results.append(executor.submit(run_scenario, mode, question_count, args.reports, args.workers).result())
+            except Exception as e:
+                print(f"Error benchmarking {mode} with {question_count} questions: {str(e)}")
+
+    print()
+    print_table(results)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote results to {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
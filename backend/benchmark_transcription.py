@@ -0,0 +1,198 @@
+"""Benchmark transcription backends on a fixed corpus of recorded answers.
+
+The corpus is a directory of audio files (webm, wav, ogg, mp3, m4a). A file
+named like the clip with a .txt extension holds its reference transcript and
+is used for WER; clips without one are timed but not scored.
+
+Each backend runs in its own fresh process so load time and peak memory are
+not polluted by the other backends.
+
+Usage:
+    python benchmark_transcription.py --corpus path/to/corpus \\
+        --backend whisper:base --backend faster-whisper:base:int8 --backend faster-whisper:small:int8
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from audio_decode import decode_audio_bytes, audio_duration_seconds
+from model_registry import get_process_rss
+
+AUDIO_EXTENSIONS = ('.webm', '.wav', '.ogg', '.mp3', '.m4a')
+
+
+def normalize_words(text):
+    """Lowercase, strip punctuation and split into words for WER."""
+    return re.sub(r"[^a-z0-9' ]+", " ", text.lower()).split()
+
+
+def word_errors(reference, hypothesis):
+    """Return (edit distance in words, reference word count)."""
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,      # deletion
+                current[j - 1] + 1,   # insertion
+                previous[j - 1] + (ref_word != hyp_word)  # substitution
+            )
+        previous = current
+    return previous[-1], len(ref)
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def load_corpus(corpus_dir, ffmpeg_binary):
+    """Decode every clip once up front so decoding is not part of the timings."""
+    clips = []
+    for name in sorted(os.listdir(corpus_dir)):
+        base, ext = os.path.splitext(name)
+        if ext.lower() not in AUDIO_EXTENSIONS:
+            continue
+        with open(os.path.join(corpus_dir, name), 'rb') as f:
+            samples = decode_audio_bytes(f.read(), ffmpeg_binary=ffmpeg_binary)
+        reference_path = os.path.join(corpus_dir, base + '.txt')
+        reference = None
+        if os.path.exists(reference_path):
+            with open(reference_path, 'r', encoding='utf-8') as f:
+                reference = f.read().strip()
+        clips.append({'name': name, 'samples': samples, 'reference': reference})
+    return clips
+
+
+class PeakMemorySampler:
+    """Samples process RSS on a background thread and keeps the maximum."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = get_process_rss() or 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, get_process_rss() or 0)
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, get_process_rss() or 0)
+
+
+def run_backend(spec, corpus_dir, ffmpeg_binary, repeat):
+    """Benchmark one backend; runs inside a dedicated worker process."""
+    from transcription_backends import create_backend
+
+    clips = load_corpus(corpus_dir, ffmpeg_binary)
+    with PeakMemorySampler() as memory:
+        started = time.perf_counter()
+        backend = create_backend(spec)
+        backend.load()
+        load_seconds = time.perf_counter() - started
+
+        # One untimed pass so lazy initialisation does not land in the first clip
+        if clips:
+            backend.transcribe(clips[0]['samples'])
+
+        latencies = []
+        audio_seconds = 0.0
+        processing_seconds = 0.0
+        errors = 0
+        reference_words = 0
+        per_clip = []
+        for clip in clips:
+            duration = audio_duration_seconds(clip['samples'])
+            text = ''
+            for _ in range(repeat):
+                clip_started = time.perf_counter()
+                text = backend.transcribe(clip['samples'])['text'].strip()
+                elapsed = time.perf_counter() - clip_started
+                latencies.append(elapsed)
+                audio_seconds += duration
+                processing_seconds += elapsed
+            clip_result = {'clip': clip['name'], 'audio_seconds': round(duration, 2), 'text': text}
+            if clip['reference'] is not None:
+                clip_errors, clip_words = word_errors(clip['reference'], text)
+                errors += clip_errors
+                reference_words += clip_words
+                clip_result['wer'] = round(clip_errors / clip_words, 4) if clip_words else None
+            per_clip.append(clip_result)
+
+    return {
+        'backend': spec,
+        'clips': len(clips),
+        'load_seconds': round(load_seconds, 3),
+        'real_time_factor': round(processing_seconds / audio_seconds, 4) if audio_seconds else None,
+        'p50_latency_seconds': round(percentile(latencies, 50), 3) if latencies else None,
+        'p95_latency_seconds': round(percentile(latencies, 95), 3) if latencies else None,
+        'peak_rss_mb': round(memory.peak / (1024 * 1024), 1) if memory.peak else None,
+        'wer': round(errors / reference_words, 4) if reference_words else None,
+        'per_clip': per_clip
+    }
+
+
+def print_table(results):
+    header = f"{'backend':<32} {'load s':>8} {'RTF':>8} {'p50 s':>8} {'p95 s':>8} {'peak MB':>9} {'WER':>7}"
+    print(header)
+    print('-' * len(header))
+
+    def fmt(value, pattern):
+        return pattern.format(value) if value is not None else 'n/a'
+
+    for r in results:
+        print(f"{r['backend']:<32} {fmt(r['load_seconds'], '{:.2f}'):>8} {fmt(r['real_time_factor'], '{:.3f}'):>8} "
+              f"{fmt(r['p50_latency_seconds'], '{:.2f}'):>8} {fmt(r['p95_latency_seconds'], '{:.2f}'):>8} "
+              f"{fmt(r['peak_rss_mb'], '{:.0f}'):>9} {fmt(r['wer'], '{:.3f}'):>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transcription backends")
+    parser.add_argument('--corpus', required=True, help="Directory of answer recordings with optional .txt references")
+    parser.add_argument('--backend', action='append', dest='backends',
+                        help="Backend spec, repeatable (default: whisper:base)")
+    parser.add_argument('--repeat', type=int, default=1, help="Times each clip is transcribed")
+    parser.add_argument('--ffmpeg', default=os.getenv('FFMPEG_BINARY') or shutil.which('ffmpeg') or 'ffmpeg')
+    parser.add_argument('--json', dest='json_path', help="Also write the full results to this file")
+    args = parser.parse_args()
+
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for spec in args.backends or ['whisper:base']:
+        print(f"Benchmarking {spec}...")
+        try:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                results.append(executor.submit(run_backend, spec, args.corpus, args.ffmpeg, args.repeat).result())
+        except Exception as e:
+            print(f"Error benchmarking {spec}: {str(e)}")
+
+    print()
+    print_table(results)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote results to {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
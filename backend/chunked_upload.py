@@ -0,0 +1,168 @@
+import hashlib
+import uuid
+from datetime import datetime, timezone
+
+from bson import Binary
+from pymongo import ASCENDING
+
+UPLOAD_OPEN = 'open'
+UPLOAD_FINALIZED = 'finalized'
+UPLOAD_ABANDONED = 'abandoned'
+
+
+class ChunkedUploadError(Exception):
+    """Raised when an upload cannot be appended to or finalized."""
+
+
+class _ChunkReader:
+    """File-like view over stored chunks, loading one chunk at a time in order."""
+
+    def __init__(self, chunks_collection, upload_id, total_chunks):
+        self.collection = chunks_collection
+        self.upload_id = upload_id
+        self.total_chunks = total_chunks
+        self.next_seq = 0
+        self.buffer = b''
+
+    def read(self, size=-1):
+        while (size < 0 or len(self.buffer) < size) and self.next_seq < self.total_chunks:
+            chunk = self.collection.find_one({'upload_id': self.upload_id, 'seq': self.next_seq})
+            self.buffer += bytes(chunk['data'])
+            self.next_seq += 1
+        if size < 0:
+            data, self.buffer = self.buffer, b''
+        else:
+            data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
+class ChunkedUploadManager:
+    """Resumable answer uploads sent while the candidate is still recording.
+
+    There is at most one open upload per interview and question, tied to
+    the client's recording id; starting a different recording abandons it
+    and discards its chunks, so an answer is never spliced from two
+    recordings. Chunks are stored by sequence number, so they may arrive out
+    of order and a retried chunk simply overwrites itself. Finalizing
+    streams the chunks in order into the AudioStore and removes them.
+    """
+
+    def __init__(self, db, audio_store, chunk_ttl_seconds=24 * 3600):
+        self.uploads = db.answer_uploads
+        self.chunks = db.answer_upload_chunks
+        self.audio_store = audio_store
+        try:
+            self.chunks.create_index([('upload_id', ASCENDING), ('seq', ASCENDING)], unique=True)
+            # Chunks of abandoned uploads expire on their own
+            self.chunks.create_index('received_at', expireAfterSeconds=chunk_ttl_seconds)
+            # Concurrent starts for the same answer must not open two uploads
+            self.uploads.create_index(
+                [('interview_id', ASCENDING), ('question_index', ASCENDING)],
+                unique=True,
+                partialFilterExpression={'status': UPLOAD_OPEN}
+            )
+        except Exception as e:
+            print(f"Error creating upload indexes: {str(e)}")
+
+    def start(self, interview_id, question_index, content_type='audio/webm', recording_id=None):
+        """Open an upload for a recording, or return the one already open for it so the client can resume.
+
+        Without a recording_id every call is a new recording.
+        """
+        current = self.get_open(interview_id, question_index)
+        if current and (recording_id is None or current.get('recording_id') != recording_id):
+            self.abandon(current)
+        upload = self.uploads.find_one_and_update(
+            {'interview_id': interview_id, 'question_index': question_index, 'status': UPLOAD_OPEN},
+            {'$setOnInsert': {
+                'upload_id': str(uuid.uuid4()),
+                'recording_id': recording_id,
+                'content_type': content_type,
+                'created_at': datetime.now(timezone.utc)
+            }},
+            upsert=True,
+            return_document=True
+        )
+        return self.status(upload)
+
+    def abandon(self, upload):
+        """Close an unfinished upload and discard its chunks."""
+        self.uploads.update_one(
+            {'upload_id': upload['upload_id'], 'status': UPLOAD_OPEN},
+            {'$set': {'status': UPLOAD_ABANDONED, 'abandoned_at': datetime.now(timezone.utc)}}
+        )
+        self.chunks.delete_many({'upload_id': upload['upload_id']})
+        print(f"Abandoned upload {upload['upload_id']} for question {upload['question_index']} "
+              f"in interview {upload['interview_id']}")
+
+    def get_open(self, interview_id, question_index, upload_id=None):
+        """The open upload of an answer; with upload_id, only if that upload is still the open one."""
+        query = {'interview_id': interview_id, 'question_index': question_index, 'status': UPLOAD_OPEN}
+        if upload_id:
+            query['upload_id'] = upload_id
+        return self.uploads.find_one(query)
+
+    def status(self, upload):
+        received = [c['seq'] for c in self.chunks.find({'upload_id': upload['upload_id']}, {'seq': 1}).sort('seq', 1)]
+        return {
+            'upload_id': upload['upload_id'],
+            'recording_id': upload.get('recording_id'),
+            'interview_id': upload['interview_id'],
+            'question_index': upload['question_index'],
+            'status': upload['status'],
+            'received_chunks': received,
+            'job_id': upload.get('job_id')
+        }
+
+    def put_chunk(self, upload, seq, data):
+        """Store chunk number seq; sending the same chunk again is harmless."""
+        if upload['status'] != UPLOAD_OPEN:
+            raise ChunkedUploadError('Upload is already finalized')
+        if seq < 0:
+            raise ChunkedUploadError('Chunk sequence numbers start at 0')
+        self.chunks.replace_one(
+            {'upload_id': upload['upload_id'], 'seq': seq},
+            {
+                'upload_id': upload['upload_id'],
+                'seq': seq,
+                'data': Binary(data),
+                'size': len(data),
+                'sha256': hashlib.sha256(data).hexdigest(),
+                'received_at': datetime.now(timezone.utc)
+            },
+            upsert=True
+        )
+
+    def assemble(self, upload, total_chunks):
+        """Stream chunks 0..total_chunks-1 into the AudioStore.
+
+        Returns (file_id, size, sha256) or raises ChunkedUploadError listing
+        the missing chunks so the client can resend just those.
+        """
+        received = set(c['seq'] for c in self.chunks.find({'upload_id': upload['upload_id']}, {'seq': 1}))
+        missing = [seq for seq in range(total_chunks) if seq not in received]
+        if missing:
+            raise ChunkedUploadError(f"Missing chunks: {missing}")
+
+        reader = _ChunkReader(self.chunks, upload['upload_id'], total_chunks)
+        return self.audio_store.save_stream(
+            reader,
+            f"audio_{upload['interview_id']}_{upload['question_index']}_{upload['upload_id']}",
+            content_type=upload.get('content_type'),
+            metadata={'interview_id': upload['interview_id'], 'question_index': upload['question_index']}
+        )
+
+    def mark_finalized(self, upload, job_id):
+        self.uploads.update_one(
+            {'upload_id': upload['upload_id']},
+            {'$set': {'status': UPLOAD_FINALIZED, 'job_id': job_id, 'finalized_at': datetime.now(timezone.utc)}}
+        )
+        self.chunks.delete_many({'upload_id': upload['upload_id']})
+
+    def find_finalized(self, interview_id, question_index, upload_id):
+        return self.uploads.find_one({
+            'interview_id': interview_id,
+            'question_index': question_index,
+            'upload_id': upload_id,
+            'status': UPLOAD_FINALIZED
+        })
@@ -0,0 +1,122 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from transcription import NO_SPEECH_TEXT
+
+FOLLOWUP_PENDING = 'pending'
+FOLLOWUP_READY = 'ready'
+FOLLOWUP_FAILED = 'failed'
+
+
+def is_answer_text(transcription):
+    """False for empty, silent or failed transcriptions, which give nothing to follow up on."""
+    text = (transcription or '').strip()
+    return bool(text) and text != NO_SPEECH_TEXT and not text.startswith('Error during')
+
+
+class FollowUpPlanner:
+    """Speculatively writes the next question of an adaptive interview.
+
+    As soon as an answer's transcription is stored, a follow-up to it is
+    generated in the background and parked under followups.<next index>, so
+    by the time the candidate asks for the next question it is usually ready.
+    resolve() waits at most deadline_seconds for it - also while the answer
+    it follows is still being transcribed, as answer_pending(interview_id,
+    question_index) reports - and otherwise returns the pre-planned
+    question. State lives in the interview document, so any web worker can
+    resolve a follow-up another worker generated.
+    """
+
+    def __init__(self, db, generate_followup, deadline_seconds=3.0, workers=2, poll_interval=0.1, answer_pending=None):
+        self.db = db
+        self.generate_followup = generate_followup
+        self.answer_pending = answer_pending
+        self.deadline_seconds = deadline_seconds
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='followup')
+
+    def on_response(self, interview_id, response):
+        """Start generating the follow-up to a freshly stored answer."""
+        try:
+            question_index = response['question_index']
+            target = question_index + 1
+            if not is_answer_text(response.get('transcription')):
+                return
+
+            interview = self.db.interviews.find_one(
+                {'interview_id': interview_id},
+                {'adaptive': 1, 'questions': 1, 'current_question_index': 1}
+            )
+            if not interview or not interview.get('adaptive'):
+                return
+            questions = interview.get('questions', [])
+            # No planned question to replace, or the candidate has already moved past it
+            if target >= len(questions) or interview.get('current_question_index', 0) >= target:
+                return
+
+            # Only the first stored answer for a question starts a generation
+            claimed = self.db.interviews.update_one(
+                {'interview_id': interview_id, f'followups.{target}': {'$exists': False}},
+                {'$set': {f'followups.{target}': {
+                    'status': FOLLOWUP_PENDING,
+                    'based_on': question_index,
+                    'planned_question': questions[target],
+                    'started_at': datetime.now(timezone.utc)
+                }}}
+            )
+            if claimed.modified_count:
+                self._executor.submit(
+                    self._generate, interview_id, target,
+                    response.get('question') or questions[question_index], response['transcription'], questions[target]
+                )
+        except Exception as e:
+            print(f"Error scheduling follow-up question for interview {interview_id}: {str(e)}")
+
+    def _generate(self, interview_id, target, question, answer, planned_question):
+        started = time.monotonic()
+        try:
+            followup = self.generate_followup(question, answer, planned_question)
+        except Exception as e:
+            print(f"Error generating follow-up question for interview {interview_id}: {str(e)}")
+            followup = None
+
+        update = {
+            f'followups.{target}.status': FOLLOWUP_READY if followup else FOLLOWUP_FAILED,
+            f'followups.{target}.generation_seconds': round(time.monotonic() - started, 3),
+            f'followups.{target}.generated_at': datetime.now(timezone.utc)
+        }
+        if followup:
+            update[f'followups.{target}.question'] = followup
+        self.db.interviews.update_one({'interview_id': interview_id}, {'$set': update})
+        print(f"Follow-up for interview {interview_id}, question {target}: {'ready' if followup else 'failed'} "
+              f"in {time.monotonic() - started:.2f}s")
+
+    def resolve(self, interview_id, index, planned_question):
+        """Return (question, source) for question index, waiting up to the deadline for a pending follow-up."""
+        deadline = time.monotonic() + self.deadline_seconds
+        waited = False
+        while True:
+            # Checked before the record: a job claims its follow-up before it stops counting as pending
+            answer_pending = bool(self.answer_pending and self.answer_pending(interview_id, index - 1))
+            interview = self.db.interviews.find_one({'interview_id': interview_id}, {f'followups.{index}': 1}) or {}
+            followup = interview.get('followups', {}).get(str(index))
+            if followup and followup['status'] == FOLLOWUP_READY:
+                source = 'followup'
+                question = followup['question']
+                break
+            # Without a record there is only something to wait for while the previous answer is transcribed
+            nothing_coming = not followup and not answer_pending
+            if nothing_coming or (followup and followup['status'] == FOLLOWUP_FAILED) or time.monotonic() >= deadline:
+                source = 'planned'
+                question = planned_question
+                break
+            waited = True
+            time.sleep(self.poll_interval)
+
+        if followup:
+            self.db.interviews.update_one(
+                {'interview_id': interview_id},
+                {'$set': {f'followups.{index}.used': source == 'followup', f'followups.{index}.waited': waited}}
+            )
+        return question, source
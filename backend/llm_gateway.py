@@ -0,0 +1,377 @@
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+
+import openai
+
+try:
+    import httpx
+except ImportError:  # installed with openai; only needed to size the connection pool
+    httpx = None
+
+from singleflight import request_key
+
+
+class LLMGatewayError(Exception):
+    """Raised when a chat completion cannot be obtained within the call's deadline."""
+
+
+class RetryableProviderError(Exception):
+    """A transient provider failure that is worth retrying."""
+
+
+# Transient OpenAI failures; anything else (bad request, auth) fails immediately
+RETRYABLE_ERRORS = tuple(
+    error for error in (
+        getattr(openai, 'APITimeoutError', None),
+        getattr(openai, 'APIConnectionError', None),
+        getattr(openai, 'RateLimitError', None),
+        getattr(openai, 'InternalServerError', None),
+    ) if error is not None
+) + (RetryableProviderError,)
+
+
+class OpenAIProvider:
+    """OpenAI client with one persistent, bounded HTTP connection pool.
+
+    The SDK's own retries are disabled so the gateway's backoff and deadline
+    are the only retry policy.
+    """
+
+    name = 'openai'
+
+    def __init__(self, api_key, base_url=None, max_connections=20):
+        http_client = None
+        if httpx is not None:
+            http_client = httpx.Client(limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ))
+        self.client = openai.OpenAI(api_key=api_key, base_url=base_url, max_retries=0, http_client=http_client)
+
+    def create(self, timeout, **kwargs):
+        return self.client.chat.completions.create(timeout=timeout, **kwargs)
+
+    def stream(self, timeout, **kwargs):
+        return self.client.chat.completions.create(
+            timeout=timeout, stream=True, stream_options={'include_usage': True}, **kwargs
+        )
+
+
+class FakeProvider:
+    """Offline stand-in for load testing: canned completions with simulated latency.
+
+    Responses have the same shape as the OpenAI SDK's, so call sites cannot
+    tell the difference. failure_rate injects retryable errors.
+    """
+
+    name = 'fake'
+
+    def __init__(self, latency_ms=800, jitter_ms=200, failure_rate=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+
+    def _content(self, messages, response_format):
+        prompt = " ".join(m.get('content', '') for m in messages).lower()
+        if response_format and 'rubric' in prompt:
+            return json.dumps({
+                'rubric': {'relevance': 8, 'technical_depth': 6, 'clarity': 7},
+                'score': 7,
+                'strengths': ['Addresses the question directly'],
+                'gaps': ['Few concrete examples'],
+                'summary': 'A relevant answer that would benefit from more technical detail.'
+            })
+        if response_format:
+            return json.dumps({
+                'profile': {
+                    'skills': ['Python', 'Flask', 'MongoDB', 'React'],
+                    'experience': ['Built REST APIs for an interview platform'],
+                    'education': ['B.E. Computer Engineering'],
+                    'achievements': ['Reduced API latency by 40%']
+                },
+                'questions': [
+                    'How did you design the REST APIs for your interview platform?',
+                    'How would you find and fix a slow MongoDB query in production?'
+                ]
+            })
+        if 'assessor' in prompt or 'assessment' in prompt:
+            return ("1. CANDIDATE OVERVIEW\nThe candidate answered every question.\n\n"
+                    "2. STRENGTHS\n- Clear explanations\n\n3. AREAS FOR IMPROVEMENT\n- More concrete examples\n\n"
+                    "4. TECHNICAL SKILLS ASSESSMENT\nSolid fundamentals.\n\n5. COMMUNICATION SKILLS\nGood.\n\n"
+                    "6. OVERALL RECOMMENDATION: Consider\n\n7. SCORE: 7/10")
+        if 'follow-up' in prompt:
+            return "Can you walk me through a specific trade-off you made there?"
+        if 'generate 2' in prompt:
+            return "1. Describe a system you designed end to end.\n2. How do you debug a production incident?"
+        return "Skills: Python, Flask, MongoDB. Experience: backend development. Education: B.E."
+
+    def create(self, timeout, messages, model=None, max_tokens=None, response_format=None, **kwargs):
+        delay = max(0.0, self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000.0
+        if delay > timeout:
+            time.sleep(timeout)
+            raise RetryableProviderError(f"Fake provider timed out after {timeout:.1f}s")
+        time.sleep(delay)
+        if self._random.random() < self.failure_rate:
+            raise RetryableProviderError("Fake provider injected failure")
+
+        content = self._content(messages, response_format)
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(index=0, finish_reason='stop', message=SimpleNamespace(role='assistant', content=content))],
+            usage=self._usage(messages, content)
+        )
+
+    @staticmethod
+    def _usage(messages, content):
+        prompt_tokens = sum(len(m.get('content', '')) for m in messages) // 4
+        completion_tokens = len(content) // 4
+        return SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens
+        )
+
+    def stream(self, timeout, messages, model=None, max_tokens=None, response_format=None, **kwargs):
+        """Same canned content, delivered a word at a time after the first-token latency."""
+        first_token = max(0.0, self.latency_ms / 4 + self._random.uniform(-self.jitter_ms, self.jitter_ms) / 4) / 1000.0
+        if first_token > timeout:
+            time.sleep(timeout)
+            raise RetryableProviderError(f"Fake provider timed out after {timeout:.1f}s")
+        time.sleep(first_token)
+        if self._random.random() < self.failure_rate:
+            raise RetryableProviderError("Fake provider injected failure")
+
+        content = self._content(messages, response_format)
+        pieces = re.findall(r'\S+\s*|\s+', content)
+        per_piece = (self.latency_ms * 3 / 4) / 1000.0 / max(1, len(pieces))
+        for piece in pieces:
+            yield SimpleNamespace(usage=None, choices=[SimpleNamespace(index=0, delta=SimpleNamespace(content=piece))])
+            time.sleep(per_piece)
+        yield SimpleNamespace(usage=self._usage(messages, content), choices=[])
+
+
+class _CallSiteStats:
+    def __init__(self, window=500):
+        self.calls = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latencies = deque(maxlen=window)
+        self.first_token_latencies = deque(maxlen=window)
+        self.queue_waits = deque(maxlen=window)
+
+    def snapshot(self):
+        def pct(values, p):
+            if not values:
+                return None
+            ordered = sorted(values)
+            return round(ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))], 3)
+
+        return {
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'retries': self.retries,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'p50_latency_seconds': pct(self.latencies, 50),
+            'p95_latency_seconds': pct(self.latencies, 95),
+            'p50_first_token_seconds': pct(self.first_token_latencies, 50),
+            'p95_queue_wait_seconds': pct(self.queue_waits, 95)
+        }
+
+
+class LLMGateway:
+    """Single path for every chat completion the app makes.
+
+    - at most max_concurrency requests are in flight; callers queue for up to
+      queue_timeout seconds and then fail instead of piling up
+    - each call has a deadline covering all of its attempts
+    - transient errors are retried with jittered exponential backoff
+    - tokens, latency, retries and errors are counted per call site
+    - identical concurrent requests can be coalesced by a Singleflight
+    """
+
+    def __init__(self, provider, max_concurrency=8, queue_timeout=30.0, timeout=30.0, max_retries=3,
+                 backoff_base=0.5, backoff_max=8.0, singleflight=None):
+        self.provider = provider
+        self.singleflight = singleflight
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._in_flight = 0
+        self._waiting = 0
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _site(self, call_site):
+        with self._lock:
+            if call_site not in self._stats:
+                self._stats[call_site] = _CallSiteStats()
+            return self._stats[call_site]
+
+    def _backoff(self, attempt):
+        # Full jitter keeps retrying workers from hitting the provider in lockstep
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def chat(self, call_site, timeout=None, coalesce=True, **kwargs):
+        """Run a chat completion; kwargs are passed to chat.completions.create.
+
+        With a singleflight, concurrent calls with identical model, messages
+        and parameters share one upstream request.
+        """
+        if not (self.singleflight and coalesce):
+            return self._complete(call_site, timeout, kwargs)
+
+        response, shared = self.singleflight.do(
+            request_key(**kwargs),
+            lambda: self._complete(call_site, timeout, kwargs),
+            timeout or self.timeout
+        )
+        if shared:
+            stats = self._site(call_site)
+            with self._lock:
+                stats.coalesced += 1
+        return response
+
+    def _acquire(self, call_site, stats, deadline):
+        queued = time.monotonic()
+        with self._lock:
+            self._waiting += 1
+        acquired = self._slots.acquire(timeout=min(self.queue_timeout, max(0.0, deadline - queued)))
+        with self._lock:
+            self._waiting -= 1
+            if acquired:
+                self._in_flight += 1
+            stats.calls += 1
+            stats.queue_waits.append(time.monotonic() - queued)
+            if not acquired:
+                stats.errors += 1
+        if not acquired:
+            raise LLMGatewayError(f"{call_site}: no LLM slot free within {self.queue_timeout:.0f}s")
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _with_retries(self, call_site, stats, deadline, attempt_fn):
+        """Call attempt_fn(remaining_seconds), retrying transient errors until the deadline."""
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise LLMGatewayError(f"{call_site}: deadline exceeded after {attempt} attempts")
+            try:
+                return attempt_fn(remaining)
+            except RETRYABLE_ERRORS as e:
+                wait = self._backoff(attempt)
+                attempt += 1
+                if attempt > self.max_retries or time.monotonic() + wait >= deadline:
+                    raise LLMGatewayError(f"{call_site}: {type(e).__name__}: {str(e)}")
+                with self._lock:
+                    stats.retries += 1
+                print(f"LLM call {call_site} failed ({type(e).__name__}), retry {attempt} in {wait:.2f}s")
+                time.sleep(wait)
+
+    def _record(self, stats, started, usage):
+        with self._lock:
+            stats.latencies.append(time.monotonic() - started)
+            if usage is not None:
+                stats.prompt_tokens += getattr(usage, 'prompt_tokens', 0) or 0
+                stats.completion_tokens += getattr(usage, 'completion_tokens', 0) or 0
+
+    def _complete(self, call_site, timeout, kwargs):
+        stats = self._site(call_site)
+        deadline = time.monotonic() + (timeout or self.timeout)
+        self._acquire(call_site, stats, deadline)
+
+        started = time.monotonic()
+        try:
+            response = self._with_retries(
+                call_site, stats, deadline, lambda remaining: self.provider.create(timeout=remaining, **kwargs)
+            )
+        except Exception:
+            with self._lock:
+                stats.errors += 1
+            raise
+        finally:
+            self._release()
+
+        self._record(stats, started, getattr(response, 'usage', None))
+        return response
+
+    def stream(self, call_site, timeout=None, **kwargs):
+        """Yield the content of a chat completion piece by piece as it is generated.
+
+        Transient errors are retried only until the first piece arrives; a
+        failure after that ends the stream with an error. Streams are not
+        coalesced.
+        """
+        stats = self._site(call_site)
+        deadline = time.monotonic() + (timeout or self.timeout)
+        self._acquire(call_site, stats, deadline)
+
+        started = time.monotonic()
+        usage = None
+
+        def open_stream(remaining):
+            chunks = iter(self.provider.stream(timeout=remaining, **kwargs))
+            # Reading the first chunk surfaces connection errors while they can still be retried
+            return chunks, next(chunks, None)
+
+        try:
+            chunks, first = self._with_retries(call_site, stats, deadline, open_stream)
+            with self._lock:
+                stats.first_token_latencies.append(time.monotonic() - started)
+            while first is not None:
+                chunk, first = first, next(chunks, None)
+                if getattr(chunk, 'usage', None) is not None:
+                    usage = chunk.usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                if time.monotonic() > deadline:
+                    raise LLMGatewayError(f"{call_site}: deadline exceeded while streaming")
+        except Exception:
+            with self._lock:
+                stats.errors += 1
+            raise
+        finally:
+            self._release()
+
+        self._record(stats, started, usage)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'provider': self.provider.name,
+                'coalescing': 'off' if not self.singleflight else ('mongo' if self.singleflight.lease_store else 'local'),
+                'max_concurrency': self.max_concurrency,
+                'in_flight': self._in_flight,
+                'waiting': self._waiting,
+                'call_sites': {site: s.snapshot() for site, s in self._stats.items()}
+            }
+
+
+def create_gateway(provider='openai', api_key=None, base_url=None, max_connections=20, fake_latency_ms=800,
+                   fake_failure_rate=0.0, **gateway_options):
+    """Build the gateway for provider 'openai' or 'fake'; other options go to LLMGateway."""
+    if provider == 'fake':
+        backend = FakeProvider(latency_ms=fake_latency_ms, failure_rate=fake_failure_rate)
+    elif provider == 'openai':
+        backend = OpenAIProvider(api_key, base_url=base_url, max_connections=max_connections)
+    else:
+        raise ValueError(f"Unknown LLM provider: {provider}")
+    return LLMGateway(backend, **gateway_options)
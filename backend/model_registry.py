@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+
+import numpy as np
+import whisper
+
+try:
+    import psutil
+except ImportError:  # psutil is optional, fall back to the resource module
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # resource is not available on Windows
+    resource = None
+
+
+def get_process_rss():
+    """Return the resident set size of this process in bytes, or None if unknown."""
+    try:
+        if psutil is not None:
+            return psutil.Process(os.getpid()).memory_info().rss
+        if resource is not None:
+            # ru_maxrss is the peak RSS in kilobytes on Linux
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except Exception as e:
+        print(f"Error reading process memory: {str(e)}")
+    return None
+
+
+class ModelRegistry:
+    """Loads each Whisper model once per process and shares it across request threads."""
+
+    def __init__(self, default_model="base", loader=None):
+        self.default_model = default_model
+        self._loader = loader or whisper.load_model
+        self._models = {}
+        self._stats = {}
+        self._load_locks = {}
+        self._inference_locks = {}
+        self._lock = threading.Lock()
+
+    def _load_lock(self, name):
+        with self._lock:
+            if name not in self._load_locks:
+                self._load_locks[name] = threading.Lock()
+            return self._load_locks[name]
+
+    def get(self, name=None):
+        """Return the loaded model, loading it on first use."""
+        name = name or self.default_model
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        # Only one thread loads a given model; the others wait for it
+        with self._load_lock(name):
+            model = self._models.get(name)
+            if model is not None:
+                return model
+
+            print(f"Loading Whisper model '{name}'...")
+            rss_before = get_process_rss()
+            started = time.perf_counter()
+            model = self._loader(name)
+            load_seconds = time.perf_counter() - started
+            rss_after = get_process_rss()
+
+            with self._lock:
+                self._models[name] = model
+                self._inference_locks[name] = threading.Lock()
+                self._stats[name] = {
+                    'model': name,
+                    'load_seconds': round(load_seconds, 3),
+                    'rss_before_bytes': rss_before,
+                    'rss_after_bytes': rss_after,
+                    'rss_delta_bytes': (rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+                    'loaded_at': time.time(),
+                    'inference_count': 0,
+                    'inference_seconds': 0.0
+                }
+            print(f"Loaded Whisper model '{name}' in {load_seconds:.2f}s")
+            return model
+
+    def run(self, fn, name=None):
+        """Call fn(model) while holding the model's inference lock.
+
+        Whisper installs forward hooks on the shared model during decoding,
+        so concurrent calls on one model instance must be serialized.
+        """
+        name = name or self.default_model
+        model = self.get(name)
+        started = time.perf_counter()
+        with self._inference_locks[name]:
+            result = fn(model)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            stats = self._stats[name]
+            stats['inference_count'] += 1
+            stats['inference_seconds'] = round(stats['inference_seconds'] + elapsed, 3)
+        return result
+
+    def transcribe(self, audio, name=None, **options):
+        """Run model.transcribe on the shared model."""
+        return self.run(lambda model: model.transcribe(audio, **options), name=name)
+
+    def warm(self, names=None, run_inference=True):
+        """Load the given models and optionally run a short dummy inference."""
+        for name in names or [self.default_model]:
+            try:
+                self.get(name)
+                if run_inference:
+                    # One second of silence is enough to initialise the decoder
+                    self.transcribe(np.zeros(16000, dtype=np.float32), name=name, fp16=False)
+                print(f"Warmed Whisper model '{name}'")
+            except Exception as e:
+                print(f"Error warming Whisper model '{name}': {str(e)}")
+
+    def warm_in_background(self, names=None, run_inference=True):
+        """Warm models on a daemon thread so startup is not blocked."""
+        thread = threading.Thread(target=self.warm, args=(names, run_inference), daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        """Return load time and memory figures for every loaded model."""
+        with self._lock:
+            models = [dict(s) for s in self._stats.values()]
+        return {
+            'default_model': self.default_model,
+            'loaded_models': models,
+            'process_rss_bytes': get_process_rss()
+        }
@@ -0,0 +1,79 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+
+class MongoCache:
+    """Key/value cache shared by every worker through MongoDB.
+
+    Entries expire through a TTL index on created_at; when the collection
+    grows past max_entries the least recently used entries are removed.
+    Hit and miss counters live in one counters document per version so they
+    add up across worker processes. Values are stored under value_field.
+    """
+
+    EVICT_EVERY = 100
+
+    def __init__(self, collection, counters, version, max_entries, ttl_seconds, value_field='value', name='cache'):
+        self.collection = collection
+        self.counters = counters
+        self.version = version
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.value_field = value_field
+        self.name = name
+        self._puts = 0
+        self._lock = threading.Lock()
+        try:
+            self.collection.create_index('created_at', expireAfterSeconds=ttl_seconds)
+            self.collection.create_index('last_used_at')
+        except Exception as e:
+            print(f"Error creating {name} indexes: {str(e)}")
+
+    def _count(self, field):
+        self.counters.update_one({'_id': self.version}, {'$inc': {field: 1}}, upsert=True)
+
+    def get(self, key):
+        entry = self.collection.find_one_and_update(
+            {'_id': key, 'created_at': {'$gt': datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)}},
+            {'$set': {'last_used_at': datetime.now(timezone.utc)}, '$inc': {'hits': 1}}
+        )
+        self._count('hits' if entry else 'misses')
+        return entry[self.value_field] if entry else None
+
+    def put(self, key, value):
+        now = datetime.now(timezone.utc)
+        self.collection.replace_one(
+            {'_id': key},
+            {'_id': key, 'version': self.version, self.value_field: value, 'created_at': now, 'last_used_at': now,
+             'hits': 0},
+            upsert=True
+        )
+        with self._lock:
+            self._puts += 1
+            evict = self._puts % self.EVICT_EVERY == 0
+        if evict:
+            self.evict()
+
+    def evict(self):
+        """Drop least recently used entries above max_entries."""
+        excess = self.collection.estimated_document_count() - self.max_entries
+        if excess <= 0:
+            return 0
+        oldest = [doc['_id'] for doc in self.collection.find({}, {'_id': 1}).sort('last_used_at', 1).limit(excess)]
+        result = self.collection.delete_many({'_id': {'$in': oldest}})
+        print(f"Evicted {result.deleted_count} {self.name} entries")
+        return result.deleted_count
+
+    def stats(self):
+        counters = self.counters.find_one({'_id': self.version}) or {}
+        hits = counters.get('hits', 0)
+        misses = counters.get('misses', 0)
+        return {
+            'version': self.version,
+            'entries': self.collection.estimated_document_count(),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 3) if hits + misses else 0
+        }
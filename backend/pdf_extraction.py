@@ -0,0 +1,91 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from PyPDF2 import PdfReader
+
+
+def count_pages(path):
+    with open(path, 'rb') as f:
+        return len(PdfReader(f).pages)
+
+
+def extract_page_range(path, start, stop):
+    """Text of pages start..stop-1; runs in a worker process for large documents."""
+    with open(path, 'rb') as f:
+        pages = PdfReader(f).pages
+        return [pages[i].extract_text() or '' for i in range(start, min(stop, len(pages)))]
+
+
+class PdfTextExtractor:
+    """Extracts resume text page by page, in parallel for long documents.
+
+    Documents with at least parallel_threshold pages are split into ranges
+    of pages_per_task pages and extracted in a process pool; shorter ones are
+    read in the calling thread, where a pool would only add overhead. Either
+    way pages are produced in order and extraction stops as soon as the page
+    or character cap for the LLM prompt is reached.
+    """
+
+    def __init__(self, workers=2, parallel_threshold=8, pages_per_task=4, max_pages=20, max_chars=20000):
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self.pages_per_task = pages_per_task
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers re-import the main script; run.py and wsgi.py keep app.py out of them
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def _iter_raw_pages(self, path):
+        total = count_pages(path)
+        if self.max_pages:
+            total = min(total, self.max_pages)
+
+        if self.workers > 1 and total >= self.parallel_threshold:
+            ranges = [(start, min(start + self.pages_per_task, total)) for start in range(0, total, self.pages_per_task)]
+            futures = [self._get_executor().submit(extract_page_range, path, start, stop) for start, stop in ranges]
+            try:
+                for future in futures:
+                    for text in future.result():
+                        yield text
+            finally:
+                # Pages past the cap are not needed
+                for future in futures:
+                    future.cancel()
+            return
+
+        with open(path, 'rb') as f:
+            pages = PdfReader(f).pages
+            for i in range(total):
+                yield pages[i].extract_text() or ''
+
+    def iter_pages(self, path):
+        """Yield page texts in order, truncating at max_chars."""
+        remaining = self.max_chars
+        for text in self._iter_raw_pages(path):
+            if remaining is not None:
+                text = text[:remaining]
+                remaining -= len(text)
+            yield text
+            if remaining is not None and remaining <= 0:
+                break
+
+    def extract(self, path):
+        """Whole (capped) document text, joined once."""
+        return "\n".join(self.iter_pages(path))
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
@@ -0,0 +1,200 @@
+"""Curated interview question bank with a local embedding index.
+
+Questions live in data/question_bank.json, tagged by skill. Their embeddings
+are computed offline into a NumPy matrix next to the bank and memory-mapped
+at startup, so choosing questions for a resume is one matrix-vector product.
+
+Build or rebuild the index after editing the bank:
+    python question_bank.py --build [--embedder sentence-transformers:all-MiniLM-L6-v2]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import zlib
+
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # sentence-transformers is optional
+    SentenceTransformer = None
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DEFAULT_BANK_PATH = os.path.join(DATA_DIR, 'question_bank.json')
+
+
+class HashingEmbedder:
+    """Dependency-free embedder: signed feature hashing of words and word pairs."""
+
+    def __init__(self, dim=1024):
+        self.dim = dim
+
+    @property
+    def spec(self):
+        return f"hashing:{self.dim}"
+
+    def embed(self, texts):
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = re.findall(r"[a-z0-9+#./]+", text.lower())
+            for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                h = zlib.crc32(feature.encode('utf-8'))
+                matrix[row, h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+        return normalize_rows(matrix)
+
+
+class SentenceTransformerEmbedder:
+    """CPU sentence-transformers model, e.g. all-MiniLM-L6-v2."""
+
+    def __init__(self, model_name='all-MiniLM-L6-v2'):
+        if SentenceTransformer is None:
+            raise ImportError("sentence-transformers is not installed. Install it with: pip install sentence-transformers")
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name, device='cpu')
+
+    @property
+    def spec(self):
+        return f"sentence-transformers:{self.model_name}"
+
+    def embed(self, texts):
+        return normalize_rows(np.asarray(self.model.encode(list(texts)), dtype=np.float32))
+
+
+def create_embedder(spec):
+    """Build an embedder from 'hashing[:dim]' or 'sentence-transformers[:model]'."""
+    engine, _, arg = spec.partition(':')
+    if engine == 'hashing':
+        return HashingEmbedder(int(arg) if arg else 1024)
+    if engine == 'sentence-transformers':
+        return SentenceTransformerEmbedder(arg or 'all-MiniLM-L6-v2')
+    raise ValueError(f"Unknown embedder: {spec}")
+
+
+def normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def question_text(question):
+    """Text that gets embedded for a bank entry."""
+    return f"{question['question']} Skills: {', '.join(question['skills'])}"
+
+
+def profile_query(profile=None, summary=None, resume_text=None):
+    """Query text for a candidate, preferring the structured profile."""
+    if profile:
+        parts = profile.get('skills', []) * 2 + profile.get('experience', []) + profile.get('achievements', [])
+        if parts:
+            return " ".join(parts)
+    return summary or resume_text or ''
+
+
+def _index_paths(bank_path, embedder_spec):
+    base = os.path.splitext(bank_path)[0]
+    slug = re.sub(r'[^a-zA-Z0-9]+', '_', embedder_spec)
+    return f"{base}.{slug}.npy", f"{base}.{slug}.json"
+
+
+def _file_sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build_index(bank_path, embedder):
+    """Embed every question and write the matrix plus its metadata next to the bank."""
+    with open(bank_path, 'r', encoding='utf-8') as f:
+        questions = json.load(f)
+    embeddings = embedder.embed([question_text(q) for q in questions])
+    matrix_path, meta_path = _index_paths(bank_path, embedder.spec)
+    np.save(matrix_path, embeddings)
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump({'embedder': embedder.spec, 'bank_sha256': _file_sha256(bank_path), 'count': len(questions)}, f, indent=2)
+    return matrix_path
+
+
+class QuestionIndex:
+    """Top-k cosine search over the question bank."""
+
+    def __init__(self, questions, embeddings, embedder, version):
+        self.questions = questions
+        self.embeddings = embeddings
+        self.embedder = embedder
+        self.version = version
+
+    @classmethod
+    def load(cls, bank_path=DEFAULT_BANK_PATH, embedder=None):
+        """Memory-map the prebuilt index, rebuilding it if the bank or embedder changed."""
+        embedder = embedder or HashingEmbedder()
+        with open(bank_path, 'r', encoding='utf-8') as f:
+            questions = json.load(f)
+        bank_sha256 = _file_sha256(bank_path)
+        matrix_path, meta_path = _index_paths(bank_path, embedder.spec)
+
+        meta = None
+        if os.path.exists(meta_path) and os.path.exists(matrix_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        if not meta or meta.get('bank_sha256') != bank_sha256 or meta.get('count') != len(questions):
+            print(f"Question bank index is missing or stale, rebuilding with {embedder.spec}")
+            try:
+                build_index(bank_path, embedder)
+            except OSError as e:
+                print(f"Could not write question bank index, keeping it in memory: {str(e)}")
+                embeddings = embedder.embed([question_text(q) for q in questions])
+                return cls(questions, embeddings, embedder, f"{embedder.spec}|{bank_sha256[:12]}")
+
+        embeddings = np.load(matrix_path, mmap_mode='r')
+        print(f"Loaded question bank index: {len(questions)} questions, {embedder.spec}")
+        return cls(questions, embeddings, embedder, f"{embedder.spec}|{bank_sha256[:12]}")
+
+    def search(self, query, k=5):
+        """Return up to k (question, score) pairs, best first."""
+        if not query or not len(self.questions):
+            return []
+        scores = self.embeddings @ self.embedder.embed([query])[0]
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.questions[i], float(scores[i])) for i in top]
+
+    def select(self, query, count=2, exclude=(), candidates=10):
+        """Best matching questions, preferring a different main skill for each."""
+        exclude = set(q.strip().lower() for q in exclude)
+        results = [(q, score) for q, score in self.search(query, candidates) if q['question'].lower() not in exclude]
+        chosen, skills = [], set()
+        for question, _ in results:
+            if question['skills'][0] not in skills:
+                chosen.append(question)
+                skills.add(question['skills'][0])
+            if len(chosen) == count:
+                break
+        for question, _ in results:
+            if len(chosen) == count:
+                break
+            if question not in chosen:
+                chosen.append(question)
+        return [q['question'] for q in chosen]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the question bank embedding index")
+    parser.add_argument('--build', action='store_true', help="Embed the bank and write the index")
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH)
+    parser.add_argument('--embedder', default=os.getenv('QUESTION_BANK_EMBEDDER', 'hashing'))
+    parser.add_argument('--query', help="Print the top matches for this text")
+    args = parser.parse_args()
+
+    embedder = create_embedder(args.embedder)
+    if args.build:
+        print(f"Wrote {build_index(args.bank, embedder)}")
+    if args.query:
+        index = QuestionIndex.load(args.bank, embedder)
+        for question, score in index.search(args.query):
+            print(f"{score:.3f}  {question['question']}")
+
+
+if __name__ == '__main__':
+    main()
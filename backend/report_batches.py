@@ -0,0 +1,283 @@
+import io
+import json
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ASCENDING
+
+QUEUED = 'queued'
+BATCHED = 'batched'
+COLLECTING = 'collecting'
+DONE = 'done'
+FAILED = 'failed'
+
+# report_status of an interview whose report waits in the queue
+REPORT_QUEUED = 'queued'
+
+
+class BatchFailedError(RuntimeError):
+    """The provider finished a batch without results; any other poll error is retried on the next pass."""
+
+
+class LocalBatchExecutor:
+    """Offline stand-in for the provider's batch API.
+
+    Runs a batch's requests through the LLM gateway in the background, so
+    with LLM_PROVIDER=fake the whole batch flow works without network access.
+    Batches do not survive a restart; their interviews are re-queued by
+    another worker once the batch stops sending heartbeats.
+    """
+
+    name = 'local'
+
+    def __init__(self, gateway, workers=4):
+        self.gateway = gateway
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report-batch')
+        self._batches = {}
+
+    def _run(self, request):
+        response = self.gateway.chat('interview_report_batch', **request)
+        return response.choices[0].message.content.strip()
+
+    def submit(self, requests):
+        """requests maps custom_id -> chat completion kwargs; returns a provider batch id."""
+        batch_id = f"local-{uuid.uuid4().hex}"
+        self._batches[batch_id] = {custom_id: self._executor.submit(self._run, request) for custom_id, request in requests.items()}
+        return batch_id
+
+    def poll(self, batch_id):
+        """None while running, then {custom_id: text or Exception}."""
+        futures = self._batches.get(batch_id)
+        if futures is None:
+            raise BatchFailedError(f"Unknown local batch {batch_id}")
+        if not all(f.done() for f in futures.values()):
+            return None
+        del self._batches[batch_id]
+        return {custom_id: (f.exception() or f.result()) for custom_id, f in futures.items()}
+
+
+class OpenAIBatchExecutor:
+    """OpenAI Batch API: one JSONL file of chat completions, results within the completion window."""
+
+    name = 'openai'
+
+    def __init__(self, client, completion_window='24h'):
+        self.client = client
+        self.completion_window = completion_window
+
+    def submit(self, requests):
+        lines = [
+            json.dumps({'custom_id': custom_id, 'method': 'POST', 'url': '/v1/chat/completions', 'body': request})
+            for custom_id, request in requests.items()
+        ]
+        batch_file = self.client.files.create(
+            file=('report_batch.jsonl', io.BytesIO("\n".join(lines).encode('utf-8'))),
+            purpose='batch'
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window=self.completion_window
+        )
+        return batch.id
+
+    def poll(self, batch_id):
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status in ('failed', 'expired', 'cancelled'):
+            raise BatchFailedError(f"Batch {batch_id} ended with status {batch.status}")
+        if batch.status != 'completed':
+            return None
+
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                response = item.get('response') or {}
+                if item.get('error') or response.get('status_code') != 200:
+                    results[item['custom_id']] = RuntimeError(str(item.get('error') or response.get('body')))
+                else:
+                    results[item['custom_id']] = response['body']['choices'][0]['message']['content'].strip()
+        return results
+
+
+class ReportBatchQueue:
+    """Accumulates report prompts of completed interviews and scores them in batches.
+
+    complete_interview enqueues the report request instead of calling the
+    LLM. A scheduler thread submits a batch once batch_size requests are
+    waiting or the oldest has waited max_wait_seconds, polls the executor and
+    hands each finished report to on_result(interview_id, text) - or
+    on_error(interview_id, error) - which finishes the interview the same way
+    the interactive path does.
+    """
+
+    def __init__(self, db, executor, on_result, on_error, batch_size=50, max_wait_seconds=600, poll_interval=15):
+        self.queue = db.report_queue
+        self.batches = db.report_batches
+        self.executor = executor
+        self.on_result = on_result
+        self.on_error = on_error
+        self.batch_size = batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.poll_interval = poll_interval
+        # Local batches can only be collected by the process that runs them
+        self.owner = uuid.uuid4().hex
+        self._wake = threading.Event()
+        self._thread = None
+        try:
+            self.queue.create_index('interview_id', unique=True)
+            self.queue.create_index([('status', ASCENDING), ('enqueued_at', ASCENDING)])
+        except Exception as e:
+            print(f"Error creating report queue indexes: {str(e)}")
+
+    def enqueue(self, interview_id, request):
+        """Queue a report request; returns False if the interview is already waiting or in a batch.
+
+        An interview whose earlier request finished (done or failed) is queued
+        again with the new request, so a regenerated report is not dropped.
+        """
+        now = datetime.now(timezone.utc)
+        requeued = self.queue.update_one(
+            {'interview_id': interview_id, 'status': {'$nin': [QUEUED, BATCHED]}},
+            {'$set': {'request': request, 'status': QUEUED, 'enqueued_at': now},
+             '$unset': {'batch_id': '', 'finished_at': ''}}
+        )
+        if requeued.matched_count:
+            queued = True
+        else:
+            result = self.queue.update_one(
+                {'interview_id': interview_id},
+                {'$setOnInsert': {
+                    'interview_id': interview_id,
+                    'request': request,
+                    'status': QUEUED,
+                    'enqueued_at': now
+                }},
+                upsert=True
+            )
+            queued = result.upserted_id is not None
+        if self.queue.count_documents({'status': QUEUED}) >= self.batch_size:
+            self._wake.set()
+        return queued
+
+    def requeue_stale_local_batches(self):
+        """Local batches die with their process; put the interviews of abandoned ones back in the queue."""
+        if self.executor.name != 'local':
+            return
+        # Owners refresh heartbeat_at on every scheduler pass
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=self.poll_interval * 5)
+        for batch in self.batches.find({'executor': 'local', 'status': BATCHED, 'heartbeat_at': {'$lt': stale_before}}):
+            claimed = self.batches.update_one(
+                {'batch_id': batch['batch_id'], 'status': BATCHED},
+                {'$set': {'status': FAILED, 'error': 'Owner process stopped'}}
+            )
+            if claimed.modified_count:
+                self.queue.update_many(
+                    {'batch_id': batch['batch_id'], 'status': BATCHED},
+                    {'$set': {'status': QUEUED}, '$unset': {'batch_id': ''}}
+                )
+                print(f"Re-queued interviews of abandoned report batch {batch['batch_id']}")
+
+    def _due(self):
+        oldest = self.queue.find_one({'status': QUEUED}, sort=[('enqueued_at', 1)])
+        if not oldest:
+            return False
+        waited = (datetime.now(timezone.utc) - oldest['enqueued_at'].replace(tzinfo=timezone.utc)).total_seconds()
+        return waited >= self.max_wait_seconds or self.queue.count_documents({'status': QUEUED}) >= self.batch_size
+
+    def submit_batch(self):
+        """Claim up to batch_size queued requests and submit them as one batch."""
+        batch_id = uuid.uuid4().hex
+        ids = [doc['_id'] for doc in self.queue.find({'status': QUEUED}, {'_id': 1}).sort('enqueued_at', 1).limit(self.batch_size)]
+        self.queue.update_many({'_id': {'$in': ids}, 'status': QUEUED}, {'$set': {'status': BATCHED, 'batch_id': batch_id}})
+        items = list(self.queue.find({'batch_id': batch_id}))
+        if not items:
+            return None
+        try:
+            provider_batch_id = self.executor.submit({item['interview_id']: item['request'] for item in items})
+        except Exception as e:
+            print(f"Error submitting report batch: {str(e)}")
+            self.queue.update_many({'batch_id': batch_id}, {'$set': {'status': QUEUED}, '$unset': {'batch_id': ''}})
+            return None
+        self.batches.insert_one({
+            'batch_id': batch_id,
+            'provider_batch_id': provider_batch_id,
+            'executor': self.executor.name,
+            'owner': self.owner,
+            'heartbeat_at': datetime.now(timezone.utc),
+            'interview_ids': [item['interview_id'] for item in items],
+            'status': BATCHED,
+            'submitted_at': datetime.now(timezone.utc)
+        })
+        print(f"Submitted report batch {batch_id} with {len(items)} interviews ({self.executor.name})")
+        return batch_id
+
+    def _collect(self, batch):
+        try:
+            results = self.executor.poll(batch['provider_batch_id'])
+        except BatchFailedError as e:
+            results = {interview_id: e for interview_id in batch['interview_ids']}
+        except Exception as e:
+            # A network or server error says nothing about the batch; poll it again on the next pass
+            print(f"Error polling report batch {batch['batch_id']}: {str(e)}")
+            return
+        if results is None:
+            return
+        # Another worker may be collecting the same provider batch
+        claimed = self.batches.update_one({'batch_id': batch['batch_id'], 'status': BATCHED}, {'$set': {'status': COLLECTING}})
+        if not claimed.modified_count:
+            return
+
+        for interview_id in batch['interview_ids']:
+            result = results.get(interview_id, RuntimeError('Missing from batch output'))
+            try:
+                if isinstance(result, Exception):
+                    self.on_error(interview_id, result)
+                else:
+                    self.on_result(interview_id, result)
+                status = FAILED if isinstance(result, Exception) else DONE
+            except Exception as e:
+                print(f"Error applying batch report for interview {interview_id}: {str(e)}")
+                status = FAILED
+            self.queue.update_one({'interview_id': interview_id}, {'$set': {'status': status, 'finished_at': datetime.now(timezone.utc)}})
+        self.batches.update_one({'batch_id': batch['batch_id']}, {'$set': {'status': DONE, 'finished_at': datetime.now(timezone.utc)}})
+        print(f"Report batch {batch['batch_id']} finished")
+
+    def _loop(self):
+        while True:
+            try:
+                mine = {'status': BATCHED, 'executor': self.executor.name}
+                if self.executor.name == 'local':
+                    mine['owner'] = self.owner
+                    self.batches.update_many(mine, {'$set': {'heartbeat_at': datetime.now(timezone.utc)}})
+                    self.requeue_stale_local_batches()
+                for batch in self.batches.find(mine):
+                    self._collect(batch)
+                while self._due():
+                    if not self.submit_batch():
+                        break
+            except Exception as e:
+                print(f"Error in report batch scheduler: {str(e)}")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def start_in_background(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, daemon=True, name='report-batches')
+            self._thread.start()
+
+    def stats(self):
+        return {
+            'executor': self.executor.name,
+            'queued': self.queue.count_documents({'status': QUEUED}),
+            'batched': self.queue.count_documents({'status': BATCHED}),
+            'open_batches': self.batches.count_documents({'status': BATCHED}),
+            'batch_size': self.batch_size,
+            'max_wait_seconds': self.max_wait_seconds
+        }
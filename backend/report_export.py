@@ -0,0 +1,73 @@
+import csv
+import tempfile
+import zipfile
+
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+CSV_FIELDS = ['interview_id', 'candidate_name', 'role', 'status', 'report_status', 'score', 'completed_at', 'pdf']
+
+
+class _ZipSink:
+    """Write-only file for ZipFile whose bytes are handed out as soon as they are written.
+
+    Without tell() or seek() ZipFile streams each entry with a data
+    descriptor instead of seeking back to patch its header, so nothing
+    already written has to be kept.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_report_zip(entries, csv_name='reports.csv', chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield a zip archive of report PDFs plus a CSV summary, piece by piece.
+
+    entries yields (row, pdf_path, pdf_name); row holds the CSV_FIELDS and
+    pdf_path may be None when an interview has no report PDF. Each PDF is
+    copied from disk chunk_size bytes at a time and the CSV is spooled to a
+    temporary file, so memory use does not grow with the number of reports.
+    """
+    sink = _ZipSink()
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024, mode='w+', newline='', encoding='utf-8') as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=CSV_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+            for row, pdf_path, pdf_name in entries:
+                if pdf_path:
+                    with open(pdf_path, 'rb') as pdf, archive.open(pdf_name, 'w') as entry:
+                        while True:
+                            chunk = pdf.read(chunk_size)
+                            if not chunk:
+                                break
+                            entry.write(chunk)
+                            data = sink.drain()
+                            if data:
+                                yield data
+                    row = dict(row, pdf=pdf_name)
+                writer.writerow(row)
+                data = sink.drain()
+                if data:
+                    yield data
+
+            csv_file.seek(0)
+            with archive.open(csv_name, 'w') as entry:
+                while True:
+                    text = csv_file.read(chunk_size)
+                    if not text:
+                        break
+                    entry.write(text.encode('utf-8'))
+                    yield sink.drain()
+        # Central directory
+        yield sink.drain()
@@ -0,0 +1,215 @@
+import io
+import multiprocessing
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+from reportlab.lib.enums import TA_JUSTIFY
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+# Block kinds of the parsed report
+BLANK = 'blank'
+HEADING = 'heading'
+QA_HEADING = 'qa_heading'
+BODY = 'body'
+QUESTION = 'question'
+ANSWER = 'answer'
+
+ReportBlock = namedtuple('ReportBlock', ['kind', 'text'])
+ParsedReport = namedtuple('ParsedReport', ['score', 'blocks'])
+
+QA_MARKER = "INTERVIEW QUESTIONS & ANSWERS"
+FOOTER_TEXT = "Generated by AI Interviewer | www.lsoysappsandgames.com/ai-interviewer"
+
+STATUS_COLORS = [
+    ("selected", "#4CAF50"),              # Green
+    ("next round", "#2196F3"),            # Blue
+    ("rejected", "#F44336"),              # Red
+    ("not good", "#FF9800"),              # Orange
+    ("good in another role", "#9C27B0"),  # Purple
+]
+DEFAULT_STATUS_COLOR = "#757575"  # Grey for pending/unknown
+
+
+def get_status_color(status):
+    """Return color code based on candidate status."""
+    status = status.lower()
+    for keyword, color in STATUS_COLORS:
+        if keyword in status:
+            return color
+    return DEFAULT_STATUS_COLOR
+
+
+def compile_styles():
+    """Build every paragraph style the report uses, including one status style per status color."""
+    base = getSampleStyleSheet()
+    styles = {
+        'company': ParagraphStyle('CompanyHeader', parent=base['Heading1'], fontSize=16, alignment=1,
+                                  textColor='#1A237E', fontName='Helvetica-Bold', spaceAfter=6),
+        'title': ParagraphStyle('CustomTitle', parent=base['Heading1'], fontSize=18, spaceAfter=5, alignment=1,
+                                textColor='#1A237E'),
+        'subtitle': ParagraphStyle('Subtitle', parent=base['Heading2'], fontSize=14, alignment=1, spaceAfter=10),
+        'score': ParagraphStyle('ScoreStyle', parent=base['Heading2'], fontSize=14, alignment=1,
+                                textColor='#333333', spaceAfter=5),
+        'date': ParagraphStyle('DateStyle', parent=base['Normal'], fontSize=10, alignment=1,
+                               textColor='#666666', spaceAfter=15),
+        HEADING: ParagraphStyle('CustomHeading', parent=base['Heading2'], fontSize=14, spaceBefore=12, spaceAfter=8,
+                                textColor='#283593', borderWidth=0, borderColor='#C5CAE9', borderPadding=5,
+                                borderRadius=2),
+        BODY: ParagraphStyle('CustomBody', parent=base['Normal'], fontSize=10, spaceAfter=12, alignment=TA_JUSTIFY,
+                             leading=14),
+        QUESTION: ParagraphStyle('QuestionStyle', parent=base['Normal'], fontSize=11, fontName='Helvetica-Bold',
+                                 spaceAfter=2, textColor='#1A237E', leftIndent=10),
+        ANSWER: ParagraphStyle('AnswerStyle', parent=base['Normal'], fontSize=10, spaceAfter=12, leftIndent=20,
+                               leading=14),
+        'footer': ParagraphStyle('FooterStyle', parent=base['Normal'], fontSize=8, alignment=1, textColor='#666666'),
+    }
+    styles[QA_HEADING] = styles[HEADING]
+    styles['status'] = {
+        color: ParagraphStyle('StatusStyle', parent=base['Heading2'], fontSize=12, alignment=1, textColor='white',
+                              backColor=color, borderWidth=1, borderColor='#333333', borderPadding=5,
+                              borderRadius=4, spaceAfter=10)
+        for color in [c for _, c in STATUS_COLORS] + [DEFAULT_STATUS_COLOR]
+    }
+    return styles
+
+
+# Compiled once per process; styles are only read while rendering
+STYLES = compile_styles()
+
+
+def parse_report(report_content):
+    """Split report text into typed blocks in one pass.
+
+    The first SCORE: line becomes the headline score and is dropped from the
+    body together with the upper-case lines that follow it. Lines after the
+    Q&A marker are questions and answers; elsewhere short upper-case lines
+    are section headings and everything else is body text.
+    """
+    score = None
+    blocks = []
+    in_qa_section = False
+    skip_score_section = False
+    for line in report_content.split('\n'):
+        text = line.strip()
+        if not text:
+            blocks.append(ReportBlock(BLANK, ''))
+            continue
+        if "SCORE:" in line:
+            if score is None:
+                score = line.split("SCORE:", 1)[1].strip()
+            skip_score_section = True
+            continue
+        if skip_score_section:
+            if text.isupper():
+                continue
+            skip_score_section = False
+
+        if QA_MARKER in line:
+            in_qa_section = True
+            blocks.append(ReportBlock(QA_HEADING, text))
+        elif in_qa_section:
+            if text.startswith("Question"):
+                blocks.append(ReportBlock(QUESTION, text))
+            elif text.startswith("Response:") or text.startswith("Answer score:"):
+                blocks.append(ReportBlock(ANSWER, text))
+        elif text.isupper() and len(text) < 50:
+            blocks.append(ReportBlock(HEADING, text))
+        else:
+            blocks.append(ReportBlock(BODY, text))
+    return ParsedReport(score, blocks)
+
+
+def build_story(parsed, candidate_name, status, score, generated_at, styles=STYLES):
+    """ReportLab flowables for a parsed report."""
+    story = [
+        Paragraph("LSOYS APPS &amp; GAMES", styles['company']),
+        Paragraph("INTERVIEW ASSESSMENT REPORT", styles['title']),
+        Paragraph(f"Candidate: {escape(candidate_name)}", styles['subtitle']),
+        Paragraph(f"Status: {escape(status)}", styles['status'][get_status_color(status)]),
+        Paragraph(f"SCORE: {escape(score)}", styles['score']),
+        Paragraph(f"Generated on: {generated_at}", styles['date']),
+        Spacer(1, 10)
+    ]
+    for block in parsed.blocks:
+        if block.kind == BLANK:
+            story.append(Spacer(1, 6))
+        elif block.kind == QA_HEADING:
+            story.extend([Spacer(1, 10), Paragraph(escape(block.text), styles[QA_HEADING]), Spacer(1, 10)])
+        elif block.kind == HEADING:
+            story.extend([Spacer(1, 10), Paragraph(escape(block.text), styles[HEADING]), Spacer(1, 5)])
+        else:
+            story.append(Paragraph(escape(block.text), styles[block.kind]))
+
+    story.append(Spacer(1, 30))
+    story.append(Paragraph(FOOTER_TEXT, styles['footer']))
+    return story
+
+
+def render_report_pdf(report_content, candidate_name="Candidate", status="Pending Review", score="N/A",
+                      generated_at=None, styles=None):
+    """Render a report to PDF bytes; also the entry point of the render worker processes."""
+    parsed = parse_report(report_content)
+    if score == "N/A" and parsed.score is not None:
+        score = parsed.score
+    if generated_at is None:
+        generated_at = datetime.now().strftime("%B %d, %Y at %H:%M")
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        title=f"Interview Report - {candidate_name}",
+        author="Lsoys Apps & Games - AI Interviewer System",
+        subject="Interview Assessment"
+    )
+    doc.build(build_story(parsed, candidate_name, status, score, generated_at, styles or STYLES))
+    return buffer.getvalue()
+
+
+class ReportRenderer:
+    """Renders report PDFs in a process pool so layout work stays off the request threads.
+
+    ReportLab layout is pure Python and holds the GIL, so concurrent
+    completions rendering in threads slow every other request down. With
+    workers > 0 renders run in spawned worker processes, each of which
+    compiles the styles once at import; with workers=0 they run inline.
+    """
+
+    def __init__(self, workers=2):
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers re-import the main script; run.py and wsgi.py keep app.py out of them
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def render(self, report_content, candidate_name="Candidate", status="Pending Review", score="N/A"):
+        """PDF bytes of one report."""
+        return self.render_many([(report_content, candidate_name, status, score)])[0]
+
+    def render_many(self, reports):
+        """PDF bytes for each (report_content, candidate_name, status, score), rendered concurrently."""
+        generated_at = datetime.now().strftime("%B %d, %Y at %H:%M")
+        if self.workers <= 0:
+            return [render_report_pdf(*report, generated_at=generated_at) for report in reports]
+        executor = self._get_executor()
+        futures = [executor.submit(render_report_pdf, *report, generated_at=generated_at) for report in reports]
+        return [future.result() for future in futures]
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
@@ -0,0 +1,33 @@
+import hashlib
+import os
+import uuid
+
+
+class ReportPdfStore:
+    """Rendered report PDFs on disk, named by the SHA-256 of their content.
+
+    The hash doubles as the ETag of the download, and identical PDFs are
+    stored once. Files are written to a temporary name and renamed into
+    place, so a reader never sees a partially written PDF.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def path(self, sha256):
+        return os.path.join(self.folder, f"report_{sha256}.pdf")
+
+    def exists(self, sha256):
+        return bool(sha256) and os.path.exists(self.path(sha256))
+
+    def save(self, pdf_bytes):
+        """Store a rendered PDF; returns (sha256, size in bytes)."""
+        sha256 = hashlib.sha256(pdf_bytes).hexdigest()
+        path = self.path(sha256)
+        if not os.path.exists(path):
+            temp_path = os.path.join(self.folder, f".{uuid.uuid4().hex}.tmp")
+            with open(temp_path, 'wb') as f:
+                f.write(pdf_bytes)
+            os.replace(temp_path, path)
+        return sha256, len(pdf_bytes)
@@ -0,0 +1,109 @@
+import re
+import threading
+import time
+from datetime import datetime, timezone
+
+REPORT_STREAMING = 'streaming'
+REPORT_COMPLETE = 'complete'
+REPORT_FAILED = 'failed'
+
+# "1. CANDIDATE OVERVIEW", "**2. STRENGTHS**", "### 7. SCORE: 8/10"
+HEADING_PATTERN = re.compile(r"^[\s#*]*(\d+)\.\s*\**\s*([A-Z][A-Z0-9 &/()'-]{2,}?)\s*\**\s*(?::\s*(.*))?$")
+
+
+def parse_heading(line):
+    """Return (title, inline text) if the line starts a numbered report section."""
+    match = HEADING_PATTERN.match(line.strip())
+    if not match:
+        return None
+    return match.group(2).strip(), (match.group(3) or '').strip('* ')
+
+
+class ReportStreamWriter:
+    """Persists a streamed report to the interview document section by section.
+
+    Text is fed in as it arrives. Each time a new numbered section heading
+    appears the previous section is complete and report_sections is written,
+    so a recruiter view polling the interview (or the report event stream)
+    can render the first sections while the rest is still being generated.
+    The raw text so far is also saved at most every flush_interval seconds.
+    """
+
+    def __init__(self, db, interview_id, flush_interval=1.0):
+        self.db = db
+        self.interview_id = interview_id
+        self.flush_interval = flush_interval
+        self.text = ''
+        self.sections = []
+        self._pending = ''
+        self._current = None
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.db.interviews.update_one(
+            {'interview_id': self.interview_id},
+            {'$set': {
+                'report_status': REPORT_STREAMING,
+                'report_sections': [],
+                'report_partial': '',
+                'report_started_at': datetime.now(timezone.utc)
+            }}
+        )
+
+    def _close_section(self):
+        if self._current is not None:
+            self._current['content'] = self._current['content'].strip()
+            self.sections.append(self._current)
+            self._current = None
+            return True
+        return False
+
+    def _handle_line(self, line):
+        heading = parse_heading(line)
+        if heading:
+            closed = self._close_section()
+            title, inline = heading
+            self._current = {'title': title, 'content': inline + '\n' if inline else ''}
+            return closed
+        if self._current is not None:
+            self._current['content'] += line + '\n'
+        return False
+
+    def feed(self, delta):
+        with self._lock:
+            self.text += delta
+            self._pending += delta
+            *lines, self._pending = self._pending.split('\n')
+            section_closed = False
+            for line in lines:
+                section_closed = self._handle_line(line) or section_closed
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if section_closed or due:
+            self._flush()
+
+    def _flush(self, status=REPORT_STREAMING, extra=None):
+        with self._lock:
+            update = {
+                'report_status': status,
+                'report_sections': list(self.sections),
+                'report_partial': self.text,
+                'report_updated_at': datetime.now(timezone.utc)
+            }
+            self._last_flush = time.monotonic()
+        if extra:
+            update.update(extra)
+        self.db.interviews.update_one({'interview_id': self.interview_id}, {'$set': update})
+
+    def finish(self):
+        """Persist the final section and mark the report text complete; returns the full text."""
+        with self._lock:
+            if self._pending:
+                self._handle_line(self._pending)
+                self._pending = ''
+            self._close_section()
+        self._flush(REPORT_COMPLETE, {'report_finished_at': datetime.now(timezone.utc)})
+        return self.text
+
+    def fail(self, error):
+        self._flush(REPORT_FAILED, {'report_error': str(error)})
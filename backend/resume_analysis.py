@@ -0,0 +1,94 @@
+import json
+
+QUESTION_COUNT = 2
+
+# Parsed profile and interview questions, produced by one structured completion
+RESUME_ANALYSIS_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'profile': {
+            'type': 'object',
+            'properties': {
+                'skills': {'type': 'array', 'items': {'type': 'string'}},
+                'experience': {'type': 'array', 'items': {'type': 'string'}},
+                'education': {'type': 'array', 'items': {'type': 'string'}},
+                'achievements': {'type': 'array', 'items': {'type': 'string'}}
+            },
+            'required': ['skills', 'experience', 'education', 'achievements'],
+            'additionalProperties': False
+        },
+        'questions': {'type': 'array', 'items': {'type': 'string'}}
+    },
+    'required': ['profile', 'questions'],
+    'additionalProperties': False
+}
+
+PROFILE_SECTIONS = [
+    ('skills', 'Technical skills'),
+    ('experience', 'Work experience and projects'),
+    ('education', 'Education and certifications'),
+    ('achievements', 'Notable achievements')
+]
+
+SYSTEM_PROMPT = f"""You are an expert technical interviewer. Read the candidate's resume and return a JSON object with:
+- "profile": the key information from the resume as lists of short strings under "skills" (technical skills and programming languages), "experience" (work experience and projects), "education" (education and certifications) and "achievements" (notable achievements)
+- "questions": exactly {QUESTION_COUNT} technical interview questions specific to the candidate's experience and skills, each a single question without numbering
+
+Return only the JSON object."""
+
+
+class ResumeAnalysisError(Exception):
+    """Raised when a structured resume analysis does not match the schema."""
+
+
+def build_messages(resume_text):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"Resume:\n\n{resume_text}"}
+    ]
+
+
+def response_format(mode):
+    """OpenAI response_format for 'json_schema' (structured outputs) or 'json_object' (JSON mode)."""
+    if mode == 'json_schema':
+        return {
+            'type': 'json_schema',
+            'json_schema': {'name': 'resume_analysis', 'strict': True, 'schema': RESUME_ANALYSIS_SCHEMA}
+        }
+    return {'type': 'json_object'}
+
+
+def _string_list(value, field):
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ResumeAnalysisError(f"'{field}' must be a list of strings")
+    return [item.strip() for item in value if item.strip()]
+
+
+def parse_analysis(content, question_count=QUESTION_COUNT):
+    """Validate the completion and return (profile, questions).
+
+    JSON mode only guarantees well-formed JSON, so the shape is checked here
+    for both response formats.
+    """
+    try:
+        payload = json.loads(content)
+    except (TypeError, ValueError) as e:
+        raise ResumeAnalysisError(f"Response is not valid JSON: {str(e)}")
+    if not isinstance(payload, dict) or not isinstance(payload.get('profile'), dict):
+        raise ResumeAnalysisError("Response has no 'profile' object")
+
+    profile = {key: _string_list(payload['profile'].get(key, []), key) for key, _ in PROFILE_SECTIONS}
+    questions = _string_list(payload.get('questions'), 'questions')
+    if len(questions) < question_count:
+        raise ResumeAnalysisError(f"Expected {question_count} questions, got {len(questions)}")
+    return profile, questions[:question_count]
+
+
+def profile_summary(profile):
+    """Render a profile as the plain-text summary stored on the interview."""
+    lines = []
+    for key, title in PROFILE_SECTIONS:
+        if profile.get(key):
+            lines.append(f"{title}:")
+            lines.extend(f"- {item}" for item in profile[key])
+    return "\n".join(lines)
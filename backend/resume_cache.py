@@ -0,0 +1,32 @@
+import hashlib
+
+from mongo_cache import MongoCache
+
+HASH_CHUNK_SIZE = 256 * 1024
+
+
+def file_sha256(path):
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def resume_cache_key(pdf_sha256, version):
+    """Key a resume analysis by PDF content together with the prompt/model version."""
+    return hashlib.sha256(f"{version}|{pdf_sha256}".encode('utf-8')).hexdigest()
+
+
+class MongoResumeCache(MongoCache):
+    """Resume analyses (extracted text, parsed summary, questions) by PDF hash."""
+
+    EVICT_EVERY = 50
+
+    def __init__(self, db, version, max_entries=5000, ttl_seconds=30 * 24 * 3600):
+        super().__init__(db.resume_cache, db.resume_cache_stats, version, max_entries, ttl_seconds,
+                         value_field='analysis', name='resume cache')
+
+    def key(self, pdf_sha256):
+        return resume_cache_key(pdf_sha256, self.version)
@@ -0,0 +1,257 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from question_bank import profile_query
+
+STAGES = ['store', 'extract', 'parse', 'questions', 'room']
+
+STAGE_PENDING = 'pending'
+STAGE_RUNNING = 'running'
+STAGE_COMPLETED = 'completed'
+STAGE_FAILED = 'failed'
+STAGE_SKIPPED = 'skipped'
+
+
+class ResumePipeline:
+    """Turns an uploaded resume into a ready interview off the request thread.
+
+    The request handler only saves the PDF and creates the interview document;
+    extraction, the LLM calls and room provisioning run here, and every stage
+    records its status and timing under the interview's 'processing' field so
+    the client can poll progress. With a cache, a resume that has been
+    analysed before skips extraction and both LLM calls. With analyse_resume
+    the parse and questions stages are a single structured LLM call.
+
+    question_source picks where questions come from: 'llm', 'bank' (the
+    question index only, no LLM call at all) or 'blend' (half from the index,
+    the rest from the LLM; all from the index if the LLM call failed).
+
+    Runs live only in this process's thread pool. Interviews still
+    processing stale_seconds after their run started belong to a stopped
+    worker; the requeue loop runs each of them once more, then marks it
+    failed so the client stops polling.
+    """
+
+    def __init__(self, db, extract_text, parse_resume, generate_questions, provision_room, analyse_resume=None,
+                 workers=4, cache=None, fallback_questions=None, question_index=None, question_source='llm',
+                 question_count=2, stale_seconds=600):
+        self.db = db
+        self.stale_seconds = stale_seconds
+        self._requeue_thread = None
+        self.analyse_resume = analyse_resume
+        self.question_index = question_index
+        self.question_source = question_source if question_index else 'llm'
+        self.question_count = question_count
+        self.cache = cache
+        self.fallback_questions = list(fallback_questions or [])
+        self.extract_text = extract_text
+        self.parse_resume = parse_resume
+        self.generate_questions = generate_questions
+        self.provision_room = provision_room
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='resume-pipeline')
+
+    @staticmethod
+    def initial_processing_state():
+        """Processing state for an interview whose PDF has just been stored."""
+        now = datetime.now(timezone.utc)
+        stages = {stage: {'status': STAGE_PENDING} for stage in STAGES}
+        stages['store'] = {'status': STAGE_COMPLETED, 'started_at': now, 'finished_at': now}
+        return {'stage': 'extract', 'stages': stages, 'started_at': now}
+
+    def submit(self, interview_id, resume_path, resume_sha256, user_id):
+        self._executor.submit(self._run, interview_id, resume_path, resume_sha256, user_id)
+
+    def requeue_stale_runs(self):
+        """Restart runs interrupted by a stopped worker; a run that was already restarted is marked failed."""
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=self.stale_seconds)
+        count = 0
+        for interview in self.db.interviews.find(
+            {'status': 'processing', 'processing.started_at': {'$lt': stale_before}},
+            {'interview_id': 1, 'resume_path': 1, 'resume_sha256': 1, 'user_id': 1, 'processing': 1}
+        ):
+            interview_id = interview['interview_id']
+            # Matching the old start time lets only one worker claim the run
+            claim = {'interview_id': interview_id, 'status': 'processing',
+                     'processing.started_at': interview['processing']['started_at']}
+            if interview['processing'].get('requeued') or not interview.get('resume_path'):
+                self.db.interviews.update_one(claim, {'$set': {
+                    'status': 'failed',
+                    'processing.error': 'Resume processing was interrupted'
+                }})
+                print(f"Resume pipeline for interview {interview_id} was interrupted twice, marked failed")
+                continue
+            claimed = self.db.interviews.update_one(
+                claim, {'$set': {'processing': dict(self.initial_processing_state(), requeued=True)}}
+            )
+            if claimed.modified_count:
+                self.submit(interview_id, interview['resume_path'], interview.get('resume_sha256'), str(interview['user_id']))
+                count += 1
+        if count:
+            print(f"Requeued {count} interrupted resume pipeline runs")
+        return count
+
+    def _requeue_loop(self):
+        while True:
+            try:
+                self.requeue_stale_runs()
+            except Exception as e:
+                print(f"Error requeueing resume pipeline runs: {str(e)}")
+            time.sleep(max(1, self.stale_seconds // 4))
+
+    def start_in_background(self):
+        if self._requeue_thread is None:
+            self._requeue_thread = threading.Thread(target=self._requeue_loop, daemon=True, name='resume-pipeline-requeue')
+            self._requeue_thread.start()
+
+    def _set_stage(self, interview_id, stage, status, extra=None):
+        now = datetime.now(timezone.utc)
+        update = {f'processing.stages.{stage}.status': status}
+        if status == STAGE_RUNNING:
+            update['processing.stage'] = stage
+            update[f'processing.stages.{stage}.started_at'] = now
+        else:
+            update[f'processing.stages.{stage}.finished_at'] = now
+        if extra:
+            update.update(extra)
+        self.db.interviews.update_one({'interview_id': interview_id}, {'$set': update})
+
+    def _stage(self, interview_id, stage, fn, *args):
+        self._set_stage(interview_id, stage, STAGE_RUNNING)
+        result = fn(*args)
+        self._set_stage(interview_id, stage, STAGE_COMPLETED)
+        return result
+
+    def _mark_cached(self, interview_id):
+        now = datetime.now(timezone.utc)
+        update = {'processing.resume_cache_hit': True}
+        for stage in ('extract', 'parse', 'questions'):
+            update[f'processing.stages.{stage}'] = {'status': STAGE_COMPLETED, 'started_at': now, 'finished_at': now, 'cached': True}
+        self.db.interviews.update_one({'interview_id': interview_id}, {'$set': update})
+
+    def _analyse(self, interview_id, resume_path):
+        """Extract, parse and generate questions; returns (analysis, cacheable)."""
+        resume_text = self._stage(interview_id, 'extract', self.extract_text, resume_path) or ''
+        print(f"Extracted {len(resume_text)} characters from resume for interview {interview_id}")
+
+        if self.question_source == 'bank':
+            return self._analyse_from_bank(interview_id, resume_text)
+
+        if self.analyse_resume:
+            analysis, cacheable = self._analyse_fused(interview_id, resume_text)
+        else:
+            resume_data = self._stage(interview_id, 'parse', self.parse_resume, resume_text)
+            questions = self._stage(interview_id, 'questions', self.generate_questions, resume_data)
+
+            # Fallback questions mean an LLM call failed; do not pin that result in the cache
+            cacheable = bool(resume_text and resume_data) and questions != self.fallback_questions
+            analysis = {'resume_text': resume_text, 'resume_data': resume_data, 'questions': questions}
+
+        if self.question_source == 'blend' and resume_text:
+            analysis['questions'] = self._blend_questions(analysis, cacheable)
+        return analysis, cacheable
+
+    def _bank_query(self, analysis):
+        return profile_query(analysis.get('profile'), analysis.get('resume_data'), analysis.get('resume_text'))
+
+    def _analyse_from_bank(self, interview_id, resume_text):
+        """Pick questions from the local index by the raw resume text, skipping the LLM."""
+        self._set_stage(interview_id, 'parse', STAGE_SKIPPED)
+        if not resume_text:
+            self._set_stage(interview_id, 'questions', STAGE_SKIPPED)
+            return {'resume_text': resume_text, 'resume_data': None, 'questions': list(self.fallback_questions)}, False
+
+        questions = self._stage(interview_id, 'questions', self.question_index.select, resume_text, self.question_count)
+        questions += self.fallback_questions[:self.question_count - len(questions)]
+        return {'resume_text': resume_text, 'resume_data': None, 'questions': questions}, True
+
+    def _blend_questions(self, analysis, llm_succeeded):
+        query = self._bank_query(analysis)
+        if not llm_succeeded:
+            bank_questions = self.question_index.select(query, self.question_count)
+            return bank_questions + self.fallback_questions[:self.question_count - len(bank_questions)]
+
+        llm_questions = analysis['questions']
+        bank_count = max(1, self.question_count // 2)
+        llm_questions = llm_questions[:self.question_count - bank_count]
+        bank_questions = self.question_index.select(query, bank_count, exclude=llm_questions)
+        return llm_questions + bank_questions
+
+    def _analyse_fused(self, interview_id, resume_text):
+        """One structured completion covers both the parse and questions stages."""
+        self._set_stage(interview_id, 'questions', STAGE_RUNNING)
+        self._set_stage(interview_id, 'parse', STAGE_RUNNING)
+        result = self.analyse_resume(resume_text)
+        self._set_stage(interview_id, 'parse', STAGE_COMPLETED)
+        self._set_stage(interview_id, 'questions', STAGE_COMPLETED, {'processing.stages.questions.fused': True})
+
+        if not result:
+            return {'resume_text': resume_text, 'resume_data': None, 'questions': list(self.fallback_questions)}, False
+        return dict(result, resume_text=resume_text), True
+
+    def _run(self, interview_id, resume_path, resume_sha256, user_id):
+        started = time.monotonic()
+        try:
+            cache_key = self.cache.key(resume_sha256) if self.cache else None
+            analysis = self.cache.get(cache_key) if cache_key else None
+            if analysis:
+                print(f"Resume cache hit for interview {interview_id}")
+                self._mark_cached(interview_id)
+            else:
+                analysis, cacheable = self._analyse(interview_id, resume_path)
+                if cache_key and cacheable:
+                    self.cache.put(cache_key, analysis)
+
+            questions = analysis['questions']
+            self.db.interviews.update_one(
+                {'interview_id': interview_id},
+                {'$set': {
+                    'questions': questions,
+                    'resume_summary': analysis['resume_data'],
+                    'resume_profile': analysis.get('profile'),
+                    'question_source': self.question_source
+                }}
+            )
+
+            room_details = self._stage(interview_id, 'room', self.provision_room, interview_id, user_id)
+
+            self.db.interviews.update_one(
+                {'interview_id': interview_id},
+                {'$set': {
+                    'room_name': room_details['room_name'],
+                    'candidate_token': room_details['user_token'],
+                    'resume_processed': True,
+                    'status': 'ready',
+                    'current_question_index': 0,
+                    'processing.stage': 'done',
+                    'processing_time': f"{time.monotonic() - started:.1f} seconds"
+                }}
+            )
+            print(f"Resume pipeline finished for interview {interview_id} with {len(questions)} questions")
+        except Exception as e:
+            # The stage that was running is the one that failed
+            interview = self.db.interviews.find_one({'interview_id': interview_id}, {'processing.stage': 1}) or {}
+            stage = interview.get('processing', {}).get('stage', 'extract')
+            print(f"Error in resume pipeline stage '{stage}' for interview {interview_id}: {str(e)}")
+            import traceback
+            print(traceback.format_exc())
+            self._set_stage(interview_id, stage, STAGE_FAILED, {
+                'status': 'failed',
+                'processing.error': str(e)
+            })
+
+    def progress(self, interview):
+        """Public progress view of an interview document."""
+        processing = interview.get('processing', {})
+        stages = processing.get('stages', {})
+        completed = sum(1 for stage in STAGES if stages.get(stage, {}).get('status') in (STAGE_COMPLETED, STAGE_SKIPPED))
+        return {
+            'interview_id': interview['interview_id'],
+            'status': interview.get('status'),
+            'stage': processing.get('stage'),
+            'stages': {stage: stages.get(stage, {}).get('status', STAGE_PENDING) for stage in STAGES},
+            'progress': round(completed / len(STAGES), 2),
+            'questions_generated': len(interview.get('questions', [])),
+            'error': processing.get('error')
+        }
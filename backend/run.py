@@ -0,0 +1,16 @@
+"""Development server: `python run.py` (or `python app.py`, which hands off to this script).
+
+Process pools spawn fresh interpreters that re-import the main script. This
+script imports app.py only when it runs as __main__, so transcription,
+PDF-extraction and render workers import just the modules of the task they
+run instead of rebuilding the app's clients, indexes and threads.
+"""
+import os
+
+if __name__ == '__main__':
+    from app import app, start_services
+
+    # The debug reloader's parent process only watches files, so only the serving process starts services
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_services()
+    app.run(debug=True)
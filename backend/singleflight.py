@@ -0,0 +1,169 @@
+import hashlib
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from pymongo.errors import DuplicateKeyError
+
+LEASE_RUNNING = 'running'
+LEASE_DONE = 'done'
+
+
+def request_key(**kwargs):
+    """Hash of model, messages and parameters identifying an LLM request."""
+    canonical = json.dumps(kwargs, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def response_to_dict(response):
+    """Plain-data copy of a chat completion, enough for the app's call sites."""
+    usage = getattr(response, 'usage', None)
+    return {
+        'model': getattr(response, 'model', None),
+        'choices': [
+            {'index': c.index, 'finish_reason': c.finish_reason, 'content': c.message.content}
+            for c in response.choices
+        ],
+        'usage': {
+            'prompt_tokens': getattr(usage, 'prompt_tokens', 0),
+            'completion_tokens': getattr(usage, 'completion_tokens', 0),
+            'total_tokens': getattr(usage, 'total_tokens', 0)
+        } if usage is not None else None
+    }
+
+
+def response_from_dict(data):
+    """Rebuild a response object with the SDK's attribute layout."""
+    return SimpleNamespace(
+        model=data.get('model'),
+        choices=[
+            SimpleNamespace(index=c['index'], finish_reason=c['finish_reason'],
+                            message=SimpleNamespace(role='assistant', content=c['content']))
+            for c in data['choices']
+        ],
+        usage=SimpleNamespace(**data['usage']) if data.get('usage') else None
+    )
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MongoLeaseStore:
+    """Coalesces identical requests across worker processes through MongoDB.
+
+    The first worker to insert the lease document runs the request; others
+    poll it until the result is stored. A lease whose owner died expires
+    after lease_seconds and is taken over. Finished results stay readable
+    for result_ttl_seconds, which also absorbs retries that arrive just after
+    the original finished.
+    """
+
+    def __init__(self, db, lease_seconds=120, result_ttl_seconds=30, poll_interval=0.2):
+        self.collection = db.llm_inflight
+        self.lease_seconds = lease_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self.poll_interval = poll_interval
+        try:
+            self.collection.create_index('expires_at', expireAfterSeconds=0)
+        except Exception as e:
+            print(f"Error creating LLM lease index: {str(e)}")
+
+    def _acquire(self, key, owner):
+        """True if this worker now owns the lease for key."""
+        now = datetime.now(timezone.utc)
+        lease = {'status': LEASE_RUNNING, 'owner': owner, 'expires_at': now + timedelta(seconds=self.lease_seconds)}
+        try:
+            self.collection.insert_one(dict(lease, _id=key))
+            return True
+        except DuplicateKeyError:
+            pass
+        # Take over a lease whose owner stopped renewing it
+        taken = self.collection.find_one_and_update(
+            {'_id': key, 'status': LEASE_RUNNING, 'expires_at': {'$lt': now}},
+            {'$set': lease}
+        )
+        return taken is not None
+
+    def run(self, key, fn, deadline):
+        """Return (response, shared)."""
+        owner = uuid.uuid4().hex
+        while True:
+            if self._acquire(key, owner):
+                try:
+                    response = fn()
+                except Exception:
+                    # Let a waiting worker try the request itself
+                    self.collection.delete_one({'_id': key, 'owner': owner})
+                    raise
+                self.collection.update_one(
+                    {'_id': key, 'owner': owner},
+                    {'$set': {
+                        'status': LEASE_DONE,
+                        'response': response_to_dict(response),
+                        'expires_at': datetime.now(timezone.utc) + timedelta(seconds=self.result_ttl_seconds)
+                    }}
+                )
+                return response, False
+
+            while time.monotonic() < deadline:
+                lease = self.collection.find_one({'_id': key})
+                if lease is None:
+                    break  # owner failed or the result expired; try to run it ourselves
+                if lease['status'] == LEASE_DONE:
+                    return response_from_dict(lease['response']), True
+                if lease['expires_at'].replace(tzinfo=timezone.utc) < datetime.now(timezone.utc):
+                    break
+                time.sleep(self.poll_interval)
+            else:
+                raise TimeoutError("Timed out waiting for an identical in-flight LLM request")
+
+
+class Singleflight:
+    """Concurrent identical calls share one execution and its result.
+
+    Threads in this worker wait on the first caller's in-memory result; with
+    a lease store the first caller additionally coordinates with other
+    worker processes.
+    """
+
+    def __init__(self, lease_store=None):
+        self.lease_store = lease_store
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, timeout):
+        """Run fn once per key at a time; returns (result, shared)."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError("Timed out waiting for an identical in-flight LLM request")
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        shared = False
+        try:
+            if self.lease_store:
+                call.result, shared = self.lease_store.run(key, fn, time.monotonic() + timeout)
+            else:
+                call.result = fn()
+            return call.result, shared
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
@@ -0,0 +1,270 @@
+import asyncio
+import json
+import threading
+from datetime import datetime, timezone
+
+import websockets
+
+from audio_decode import SAMPLE_RATE, pcm16_to_float32, find_quiet_cut
+from transcription import NO_SPEECH_TEXT
+from vad import detect_speech
+
+
+class StreamingSession:
+    """One candidate answer being streamed, decoded and transcribed incrementally."""
+
+    def __init__(self, server, websocket, interview_id, question_index, question):
+        self.server = server
+        self.websocket = websocket
+        self.websocket_open = True
+        self.interview_id = interview_id
+        self.question_index = question_index
+        self.question = question
+        self.pcm = bytearray()
+        self.committed_samples = 0
+        self.segments = []
+        self.decoder = None
+        self.reader_task = None
+        self.transcribe_task = None
+        self.received_bytes = 0
+
+    async def start(self):
+        # One ffmpeg process per answer: webm chunks in on stdin, 16 kHz PCM out on stdout
+        self.decoder = await asyncio.create_subprocess_exec(
+            self.server.ffmpeg_binary,
+            "-hide_banner", "-loglevel", "error",
+            "-i", "pipe:0",
+            "-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(SAMPLE_RATE),
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        self.reader_task = asyncio.create_task(self._read_pcm())
+
+    async def _read_pcm(self):
+        while True:
+            data = await self.decoder.stdout.read(65536)
+            if not data:
+                return
+            self.pcm.extend(data)
+            self._maybe_transcribe_segment()
+
+    async def feed(self, chunk):
+        self.received_bytes += len(chunk)
+        self.decoder.stdin.write(chunk)
+        await self.decoder.stdin.drain()
+
+    def _samples(self):
+        return pcm16_to_float32(bytes(self.pcm))
+
+    def _maybe_transcribe_segment(self):
+        if self.transcribe_task and not self.transcribe_task.done():
+            return
+        pending = len(self.pcm) // 2 - self.committed_samples
+        if pending < self.server.segment_seconds * SAMPLE_RATE:
+            return
+        self.transcribe_task = asyncio.create_task(self._transcribe_segment())
+
+    async def _transcribe_segment(self):
+        samples = self._samples()
+        window = samples[self.committed_samples:]
+        cut = find_quiet_cut(window)
+        text = await self.server.transcribe(window[:cut], self._prompt())
+        self.committed_samples += cut
+        if text:
+            self.segments.append(text)
+        await self.server.persist_partial(self)
+        # More audio may have arrived while Whisper was running
+        self._maybe_transcribe_segment()
+
+    def _prompt(self):
+        # Previous text keeps vocabulary and casing consistent across windows
+        return " ".join(self.segments)[-200:] or None
+
+    def partial_text(self):
+        return " ".join(self.segments).strip()
+
+    async def finish(self):
+        """Flush the decoder, transcribe the remaining tail and return the full text."""
+        if self.decoder.stdin and not self.decoder.stdin.is_closing():
+            self.decoder.stdin.close()
+        await self.reader_task
+        await self.decoder.wait()
+        if self.transcribe_task:
+            try:
+                await self.transcribe_task
+            except Exception as e:
+                # Whatever was not committed is covered by the tail pass below
+                print(f"Error transcribing streamed segment: {str(e)}")
+
+        tail = self._samples()[self.committed_samples:]
+        if len(tail) > 0:
+            text = await self.server.transcribe(tail, self._prompt())
+            self.committed_samples += len(tail)
+            if text:
+                self.segments.append(text)
+        return self.partial_text() or NO_SPEECH_TEXT
+
+    async def abort(self):
+        if self.decoder and self.decoder.returncode is None:
+            self.decoder.kill()
+            await self.decoder.wait()
+
+
+class StreamingTranscriptionServer:
+    """Websocket endpoint that transcribes answers while the candidate is still speaking.
+
+    Protocol, per connection:
+      client -> {"type": "start", "interview_id": ..., "question_index": N}
+      client -> binary MediaRecorder chunks
+      server -> {"type": "partial", "text": ..., "seconds": ...} after every window
+      client -> {"type": "stop"}
+      server -> {"type": "final", "text": ...}
+
+    Partial transcripts are written to the interview's partial_responses as
+    they are produced. If the connection drops, whatever audio was received
+    is transcribed and stored as the answer.
+    """
+
+    def __init__(self, db, registry, ffmpeg_binary='ffmpeg', host='0.0.0.0', port=8765, segment_seconds=5.0,
+                 max_message_size=1024 * 1024, skip_silence=True, on_response=None):
+        self.db = db
+        self.on_response = on_response
+        self.registry = registry
+        self.ffmpeg_binary = ffmpeg_binary
+        self.host = host
+        self.port = port
+        self.segment_seconds = segment_seconds
+        self.max_message_size = max_message_size
+        self.skip_silence = skip_silence
+        self._thread = None
+
+    async def transcribe(self, samples, prompt=None):
+        if self.skip_silence and detect_speech(samples).is_silent:
+            # Pauses between sentences never reach the model
+            return ''
+        # Whisper is blocking, keep it off the event loop
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            None,
+            lambda: self.registry.transcribe(samples, initial_prompt=prompt, fp16=False)
+        )
+        return result["text"].strip()
+
+    async def persist_partial(self, session):
+        text = session.partial_text()
+        seconds = session.committed_samples / float(SAMPLE_RATE)
+        await asyncio.get_running_loop().run_in_executor(None, lambda: self.db.interviews.update_one(
+            {'interview_id': session.interview_id},
+            {'$set': {f'partial_responses.{session.question_index}': {
+                'question_index': session.question_index,
+                'question': session.question,
+                'transcription': text,
+                'transcribed_seconds': seconds,
+                'updated_at': datetime.now(timezone.utc)
+            }}}
+        ))
+        if session.websocket_open:
+            try:
+                await session.websocket.send(json.dumps({'type': 'partial', 'text': text, 'seconds': seconds}))
+            except websockets.ConnectionClosed:
+                session.websocket_open = False
+
+    def _store_final(self, session, transcription, complete):
+        response_data = {
+            'question_index': session.question_index,
+            'question': session.question,
+            'transcription': transcription,
+            'timestamp': datetime.now(timezone.utc),
+            'audio_processed': True,
+            'streamed': True,
+            'stream_complete': complete
+        }
+        # Only the first final transcript of a question is stored, however often the store is retried
+        result = self.db.interviews.update_one(
+            {'interview_id': session.interview_id, 'responses.question_index': {'$ne': session.question_index}},
+            {
+                '$push': {'responses': response_data},
+                '$unset': {f'partial_responses.{session.question_index}': ''}
+            }
+        )
+        if not result.modified_count:
+            self.db.interviews.update_one(
+                {'interview_id': session.interview_id},
+                {'$unset': {f'partial_responses.{session.question_index}': ''}}
+            )
+            print(f"Response for interview {session.interview_id}, question {session.question_index} already stored")
+            return False
+        print(f"Stored streamed response for interview {session.interview_id}, question {session.question_index}: '{transcription}'")
+        if self.on_response:
+            self.on_response(session.interview_id, response_data)
+        return True
+
+    async def _handle(self, websocket, *args):
+        session = None
+        try:
+            start = json.loads(await websocket.recv())
+            if start.get('type') != 'start' or not start.get('interview_id'):
+                await websocket.send(json.dumps({'type': 'error', 'message': 'Expected a start message'}))
+                return
+
+            interview_id = start['interview_id']
+            question_index = int(start.get('question_index', 0))
+            interview = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: self.db.interviews.find_one({'interview_id': interview_id}, {'questions': 1})
+            )
+            if not interview:
+                await websocket.send(json.dumps({'type': 'error', 'message': 'Interview not found'}))
+                return
+
+            questions = interview.get('questions', [])
+            question = questions[question_index] if question_index < len(questions) else 'Unknown question'
+            session = StreamingSession(self, websocket, interview_id, question_index, question)
+            await session.start()
+            print(f"Streaming transcription started for interview {interview_id}, question {question_index}")
+
+            async for message in websocket:
+                if isinstance(message, bytes):
+                    await session.feed(message)
+                    continue
+                if json.loads(message).get('type') == 'stop':
+                    break
+
+            transcription = await session.finish()
+            await asyncio.get_running_loop().run_in_executor(None, self._store_final, session, transcription, True)
+            # Stored: a client that disconnects before reading the final message must not store it again
+            session = None
+            await websocket.send(json.dumps({'type': 'final', 'text': transcription}))
+        except websockets.ConnectionClosed:
+            print("Streaming connection closed before the answer was finished")
+        except Exception as e:
+            print(f"Error in streaming transcription: {str(e)}")
+            import traceback
+            print(traceback.format_exc())
+        finally:
+            if session is not None:
+                # Connection dropped mid-answer: keep what was received
+                session.websocket_open = False
+                try:
+                    if session.received_bytes:
+                        transcription = await session.finish()
+                        await asyncio.get_running_loop().run_in_executor(
+                            None, self._store_final, session, transcription, False
+                        )
+                    else:
+                        await session.abort()
+                except Exception as e:
+                    print(f"Error saving interrupted stream: {str(e)}")
+                    await session.abort()
+
+    async def _serve(self):
+        async with websockets.serve(self._handle, self.host, self.port, max_size=self.max_message_size):
+            print(f"Streaming transcription server listening on ws://{self.host}:{self.port}")
+            await asyncio.Future()
+
+    def start_in_background(self):
+        """Run the websocket server on its own event loop in a daemon thread."""
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._serve()), daemon=True)
+        self._thread.start()
+        return self._thread
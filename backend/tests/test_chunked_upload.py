@@ -0,0 +1,86 @@
+import mongomock
+import mongomock.gridfs
+import pytest
+
+from audio_storage import AudioStore
+from chunked_upload import UPLOAD_ABANDONED, ChunkedUploadError, ChunkedUploadManager
+
+mongomock.gridfs.enable_gridfs_integration()
+
+
+@pytest.fixture
+def uploads():
+    db = mongomock.MongoClient().ai_interviewer
+    return ChunkedUploadManager(db, AudioStore(db, chunk_size=4))
+
+
+def assembled(uploads, upload, total_chunks):
+    file_id, size, _ = uploads.assemble(uploads.get_open('i1', 0, upload['upload_id']), total_chunks)
+    return uploads.audio_store.read(file_id)
+
+
+def test_chunks_out_of_order_are_assembled_in_sequence(uploads):
+    upload = uploads.start('i1', 0, recording_id='r1')
+    for seq, data in [(2, b'ccc'), (0, b'aaa'), (1, b'bbb')]:
+        uploads.put_chunk(upload, seq, data)
+    assert uploads.status(upload)['received_chunks'] == [0, 1, 2]
+    assert assembled(uploads, upload, 3) == b'aaabbbccc'
+
+
+def test_a_duplicate_chunk_overwrites_itself(uploads):
+    upload = uploads.start('i1', 0, recording_id='r1')
+    uploads.put_chunk(upload, 0, b'aaa')
+    uploads.put_chunk(upload, 0, b'aaa')
+    uploads.put_chunk(upload, 1, b'bbb')
+    assert uploads.chunks.count_documents({'upload_id': upload['upload_id']}) == 2
+    assert assembled(uploads, upload, 2) == b'aaabbb'
+
+
+def test_missing_chunks_are_listed(uploads):
+    upload = uploads.start('i1', 0, recording_id='r1')
+    uploads.put_chunk(upload, 0, b'aaa')
+    uploads.put_chunk(upload, 3, b'ddd')
+    with pytest.raises(ChunkedUploadError, match=r"Missing chunks: \[1, 2\]"):
+        uploads.assemble(upload, 4)
+
+
+def test_the_same_recording_resumes_its_upload(uploads):
+    first = uploads.start('i1', 0, recording_id='r1')
+    uploads.put_chunk(first, 0, b'aaa')
+    resumed = uploads.start('i1', 0, recording_id='r1')
+    assert resumed['upload_id'] == first['upload_id']
+    assert resumed['received_chunks'] == [0]
+
+
+def test_a_new_recording_never_reuses_chunks_of_an_unfinished_one(uploads):
+    old = uploads.start('i1', 0, recording_id='r1')
+    uploads.put_chunk(old, 0, b'old0')
+    uploads.put_chunk(old, 1, b'old1')
+
+    new = uploads.start('i1', 0, recording_id='r2')
+    assert new['upload_id'] != old['upload_id']
+    assert new['received_chunks'] == []
+    assert uploads.uploads.find_one({'upload_id': old['upload_id']})['status'] == UPLOAD_ABANDONED
+    # A late chunk of the old recording is addressed to the old upload, which is no longer open
+    assert uploads.get_open('i1', 0, old['upload_id']) is None
+
+    uploads.put_chunk(uploads.get_open('i1', 0, new['upload_id']), 0, b'new0')
+    with pytest.raises(ChunkedUploadError, match=r"Missing chunks: \[1\]"):
+        uploads.assemble(uploads.get_open('i1', 0, new['upload_id']), 2)
+
+
+def test_start_without_a_recording_id_is_always_a_new_recording(uploads):
+    first = uploads.start('i1', 0)
+    uploads.put_chunk(first, 0, b'aaa')
+    second = uploads.start('i1', 0)
+    assert second['upload_id'] != first['upload_id']
+    assert second['received_chunks'] == []
+
+
+def test_finalized_upload_rejects_more_chunks(uploads):
+    upload = uploads.start('i1', 0, recording_id='r1')
+    uploads.put_chunk(upload, 0, b'aaa')
+    uploads.mark_finalized(upload, 'job-1')
+    with pytest.raises(ChunkedUploadError):
+        uploads.put_chunk(uploads.uploads.find_one({'upload_id': upload['upload_id']}), 1, b'bbb')
+    assert uploads.find_finalized('i1', 0, upload['upload_id'])['job_id'] == 'job-1'
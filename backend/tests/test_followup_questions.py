@@ -0,0 +1,62 @@
+import threading
+import time
+
+import mongomock
+
+from followup_questions import FOLLOWUP_PENDING, FOLLOWUP_READY, FollowUpPlanner
+
+
+def make_planner(deadline_seconds=2.0, answer_pending=None, generate_followup=lambda *args: None):
+    db = mongomock.MongoClient().ai_interviewer
+    db.interviews.insert_one({'interview_id': 'i1', 'adaptive': True, 'questions': ['Q1', 'Q2']})
+    return db, FollowUpPlanner(db, generate_followup=generate_followup, deadline_seconds=deadline_seconds,
+                               poll_interval=0.01, answer_pending=answer_pending)
+
+
+def test_resolve_without_a_followup_returns_the_planned_question_at_once():
+    _, planner = make_planner()
+    started = time.monotonic()
+    assert planner.resolve('i1', 1, 'Q2') == ('Q2', 'planned')
+    assert time.monotonic() - started < 0.5
+
+
+def test_resolve_returns_a_ready_followup():
+    db, planner = make_planner()
+    db.interviews.update_one({'interview_id': 'i1'}, {'$set': {'followups.1': {
+        'status': FOLLOWUP_READY, 'question': 'Why that index?'}}})
+    assert planner.resolve('i1', 1, 'Q2') == ('Why that index?', 'followup')
+    assert db.interviews.find_one({'interview_id': 'i1'})['followups']['1']['used'] is True
+
+
+def test_resolve_falls_back_when_a_pending_followup_misses_the_deadline():
+    db, planner = make_planner(deadline_seconds=0.05)
+    db.interviews.update_one({'interview_id': 'i1'}, {'$set': {'followups.1': {'status': FOLLOWUP_PENDING}}})
+    assert planner.resolve('i1', 1, 'Q2') == ('Q2', 'planned')
+    followup = db.interviews.find_one({'interview_id': 'i1'})['followups']['1']
+    assert (followup['used'], followup['waited']) == (False, True)
+
+
+def test_resolve_waits_for_the_previous_answer_still_being_transcribed():
+    transcribing = threading.Event()
+    transcribing.set()
+    pending = []
+    db, planner = make_planner(
+        answer_pending=lambda interview_id, question_index: pending.append(question_index) or transcribing.is_set(),
+        generate_followup=lambda question, answer, planned: f"You said {answer!r}, why?"
+    )
+
+    def finish_transcription():
+        time.sleep(0.2)
+        planner.on_response('i1', {'question_index': 0, 'question': 'Q1', 'transcription': 'an index'})
+        transcribing.clear()
+
+    threading.Thread(target=finish_transcription).start()
+    assert planner.resolve('i1', 1, 'Q2') == ("You said 'an index', why?", 'followup')
+    assert set(pending) == {0}
+
+
+def test_resolve_stops_waiting_for_a_transcription_at_the_deadline():
+    _, planner = make_planner(deadline_seconds=0.1, answer_pending=lambda interview_id, question_index: True)
+    started = time.monotonic()
+    assert planner.resolve('i1', 1, 'Q2') == ('Q2', 'planned')
+    assert 0.1 <= time.monotonic() - started < 1
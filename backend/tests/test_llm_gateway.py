@@ -0,0 +1,86 @@
+import time
+
+import pytest
+
+from llm_gateway import FakeProvider, LLMGateway, LLMGatewayError, RetryableProviderError
+
+MESSAGES = [{'role': 'user', 'content': 'Summarise this resume'}]
+
+
+class ScriptedProvider(FakeProvider):
+    """FakeProvider that raises the given errors, one per call, before answering."""
+
+    def __init__(self, errors=(), **kwargs):
+        super().__init__(latency_ms=0, jitter_ms=0, seed=1, **kwargs)
+        self.errors = list(errors)
+        self.calls = 0
+
+    def create(self, timeout, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return super().create(timeout, **kwargs)
+
+
+def gateway(provider, **options):
+    return LLMGateway(provider, **dict({'backoff_base': 0.01, 'backoff_max': 0.02}, **options))
+
+
+def test_a_caller_fails_once_the_queue_timeout_passes():
+    llm = gateway(FakeProvider(latency_ms=0, jitter_ms=0), max_concurrency=1, queue_timeout=0.2)
+    stream = llm.stream('report', messages=MESSAGES)
+    next(stream)  # holds the only slot
+    started = time.monotonic()
+    with pytest.raises(LLMGatewayError, match='no LLM slot free'):
+        llm.chat('summary', messages=MESSAGES)
+    assert 0.15 <= time.monotonic() - started < 1.0
+    assert llm.stats()['call_sites']['summary']['errors'] == 1
+    stream.close()
+
+
+def test_the_deadline_covers_every_retry():
+    provider = ScriptedProvider(errors=[RetryableProviderError('busy')] * 1000)
+    llm = gateway(provider, timeout=0.3, max_retries=1000)
+    started = time.monotonic()
+    with pytest.raises(LLMGatewayError):
+        llm.chat('summary', messages=MESSAGES)
+    assert time.monotonic() - started < 0.6
+    assert 1 < provider.calls < 1000
+
+
+def test_retryable_errors_are_retried():
+    provider = ScriptedProvider(errors=[RetryableProviderError('busy'), RetryableProviderError('busy')])
+    llm = gateway(provider, max_retries=3)
+    response = llm.chat('summary', messages=MESSAGES)
+    assert response.choices[0].message.content
+    assert provider.calls == 3
+    assert llm.stats()['call_sites']['summary']['retries'] == 2
+
+
+def test_retries_stop_after_max_retries():
+    provider = ScriptedProvider(errors=[RetryableProviderError('busy')] * 5)
+    llm = gateway(provider, max_retries=2)
+    with pytest.raises(LLMGatewayError, match='busy'):
+        llm.chat('summary', messages=MESSAGES)
+    assert provider.calls == 3
+
+
+def test_non_retryable_errors_fail_immediately():
+    provider = ScriptedProvider(errors=[ValueError('bad request')])
+    llm = gateway(provider, max_retries=3)
+    with pytest.raises(ValueError):
+        llm.chat('summary', messages=MESSAGES)
+    assert provider.calls == 1
+    stats = llm.stats()
+    assert stats['call_sites']['summary']['retries'] == 0
+    assert stats['in_flight'] == 0
+
+
+def test_an_abandoned_stream_releases_its_slot():
+    llm = gateway(FakeProvider(latency_ms=0, jitter_ms=0), max_concurrency=1, queue_timeout=0.2)
+    stream = llm.stream('report', messages=MESSAGES)
+    next(stream)
+    assert llm.stats()['in_flight'] == 1
+    stream.close()
+    assert llm.stats()['in_flight'] == 0
+    assert llm.chat('summary', messages=MESSAGES).choices[0].message.content
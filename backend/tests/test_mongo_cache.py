@@ -0,0 +1,50 @@
+from datetime import datetime
+
+import mongomock
+
+from mongo_cache import MongoCache
+from resume_cache import MongoResumeCache
+from transcription_cache import MongoTranscriptionCache
+
+
+def make_cache(max_entries=10):
+    db = mongomock.MongoClient().ai_interviewer
+    return MongoCache(db.cache, db.cache_stats, 'v1', max_entries, ttl_seconds=3600, value_field='details')
+
+
+def test_get_returns_what_put_stored_and_counts_hits_and_misses():
+    cache = make_cache()
+    assert cache.get('k') is None
+    cache.put('k', {'text': 'hello'})
+    assert cache.get('k') == {'text': 'hello'}
+    assert cache.collection.find_one({'_id': 'k'})['details'] == {'text': 'hello'}
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
+
+
+def test_evict_drops_least_recently_used_entries():
+    cache = make_cache(max_entries=2)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, key)
+    # Mongo keeps milliseconds, so spell out the order in which entries were last used
+    for minute, key in enumerate(('b', 'c', 'a')):
+        cache.collection.update_one({'_id': key}, {'$set': {'last_used_at': datetime(2026, 1, 1, 0, minute)}})
+
+    assert cache.evict() == 1
+    assert cache.get('b') is None
+    assert cache.get('a') == 'a'
+    assert cache.get('c') == 'c'
+
+
+def test_resume_and_transcription_caches_keep_their_collections():
+    db = mongomock.MongoClient().ai_interviewer
+    resume_cache = MongoResumeCache(db, 'v1')
+    transcription_cache = MongoTranscriptionCache(db, 'v1')
+    resume_cache.put('r', {'questions': []})
+    transcription_cache.put('t', {'text': 'hi'})
+
+    assert db.resume_cache.find_one({'_id': 'r'})['analysis'] == {'questions': []}
+    assert db.transcription_cache.find_one({'_id': 't'})['details'] == {'text': 'hi'}
+    assert transcription_cache.stats()['backend'] == 'mongo'
+    assert 'backend' not in resume_cache.stats()
@@ -0,0 +1,115 @@
+import mongomock
+
+from report_batches import BATCHED, DONE, FAILED, QUEUED, BatchFailedError, ReportBatchQueue
+
+
+class InlineExecutor:
+    """Batch executor whose batches finish as soon as they are submitted."""
+
+    name = 'inline'
+
+    def __init__(self):
+        self._batches = {}
+
+    def submit(self, requests):
+        batch_id = f"inline-{len(self._batches)}"
+        self._batches[batch_id] = {custom_id: f"report for {request['prompt']}" for custom_id, request in requests.items()}
+        return batch_id
+
+    def poll(self, batch_id):
+        return self._batches.pop(batch_id)
+
+
+def make_queue():
+    results = []
+    queue = ReportBatchQueue(
+        mongomock.MongoClient().ai_interviewer, InlineExecutor(),
+        on_result=lambda interview_id, text: results.append((interview_id, text)),
+        on_error=lambda interview_id, error: results.append((interview_id, error))
+    )
+    return queue, results
+
+
+def run_batch(queue):
+    queue.submit_batch()
+    for batch in queue.batches.find({'status': BATCHED}):
+        queue._collect(batch)
+
+
+def test_enqueue_twice_while_queued_is_a_no_op():
+    queue, _ = make_queue()
+    assert queue.enqueue('i1', {'prompt': 'first'}) is True
+    assert queue.enqueue('i1', {'prompt': 'second'}) is False
+    assert queue.queue.find_one({'interview_id': 'i1'})['request'] == {'prompt': 'first'}
+
+
+def test_enqueue_while_batched_is_a_no_op():
+    queue, _ = make_queue()
+    queue.enqueue('i1', {'prompt': 'first'})
+    queue.submit_batch()
+    assert queue.enqueue('i1', {'prompt': 'second'}) is False
+    assert queue.queue.find_one({'interview_id': 'i1'})['status'] == BATCHED
+
+
+def test_enqueue_after_done_queues_the_new_request():
+    queue, results = make_queue()
+    queue.enqueue('i1', {'prompt': 'first'})
+    run_batch(queue)
+    assert queue.queue.find_one({'interview_id': 'i1'})['status'] == DONE
+
+    assert queue.enqueue('i1', {'prompt': 'second'}) is True
+    doc = queue.queue.find_one({'interview_id': 'i1'})
+    assert doc['status'] == QUEUED
+    assert doc['request'] == {'prompt': 'second'}
+    assert 'batch_id' not in doc
+
+    run_batch(queue)
+    assert results == [('i1', 'report for first'), ('i1', 'report for second')]
+
+
+def test_enqueue_after_failed_queues_the_new_request():
+    queue, _ = make_queue()
+    queue.enqueue('i1', {'prompt': 'first'})
+    queue.queue.update_one({'interview_id': 'i1'}, {'$set': {'status': FAILED}})
+    assert queue.enqueue('i1', {'prompt': 'retry'}) is True
+    assert queue.queue.find_one({'interview_id': 'i1'})['status'] == QUEUED
+
+
+class FlakyExecutor(InlineExecutor):
+    """Fails the next polls with the given errors before returning results."""
+
+    def __init__(self, errors):
+        super().__init__()
+        self.errors = list(errors)
+
+    def poll(self, batch_id):
+        if self.errors:
+            raise self.errors.pop(0)
+        return super().poll(batch_id)
+
+
+def test_transient_poll_error_leaves_the_batch_to_be_polled_again():
+    queue, results = make_queue()
+    queue.executor = FlakyExecutor([ConnectionError('connection reset')])
+    queue.enqueue('i1', {'prompt': 'first'})
+
+    run_batch(queue)
+    assert results == []
+    assert queue.batches.find_one()['status'] == BATCHED
+    assert queue.queue.find_one({'interview_id': 'i1'})['status'] == BATCHED
+
+    run_batch(queue)
+    assert results == [('i1', 'report for first')]
+    assert queue.queue.find_one({'interview_id': 'i1'})['status'] == DONE
+
+
+def test_failed_batch_reports_an_error_for_every_interview():
+    queue, results = make_queue()
+    queue.executor = FlakyExecutor([BatchFailedError('Batch ended with status expired')])
+    queue.enqueue('i1', {'prompt': 'first'})
+    queue.enqueue('i2', {'prompt': 'second'})
+
+    run_batch(queue)
+    assert sorted(interview_id for interview_id, _ in results) == ['i1', 'i2']
+    assert all(isinstance(error, BatchFailedError) for _, error in results)
+    assert queue.queue.count_documents({'status': FAILED}) == 2
@@ -0,0 +1,41 @@
+import csv
+import io
+import os
+import zipfile
+
+from report_export import CSV_FIELDS, _ZipSink, stream_report_zip
+
+
+def test_zip_sink_hands_out_each_byte_once():
+    sink = _ZipSink()
+    assert sink.write(b"ab") == 2
+    sink.write(memoryview(b"cd"))
+    assert sink.drain() == b"abcd"
+    assert sink.drain() == b""
+
+
+def test_zip_sink_is_not_seekable():
+    # ZipFile only streams with data descriptors when it cannot tell() or seek()
+    assert not hasattr(_ZipSink(), 'tell')
+    assert not hasattr(_ZipSink(), 'seek')
+
+
+def test_stream_report_zip_holds_pdfs_and_summary(tmp_path):
+    pdf_bytes = os.urandom(200 * 1024)
+    pdf_path = tmp_path / 'report.pdf'
+    pdf_path.write_bytes(pdf_bytes)
+    entries = [
+        ({'interview_id': 'i1', 'candidate_name': 'Ada', 'score': '8/10'}, str(pdf_path), 'i1_Ada.pdf'),
+        ({'interview_id': 'i2', 'candidate_name': 'Bo', 'report_status': 'queued'}, None, None),
+    ]
+
+    chunks = list(stream_report_zip(entries, chunk_size=16 * 1024))
+    assert len(chunks) > 2
+    with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as archive:
+        assert archive.namelist() == ['i1_Ada.pdf', 'reports.csv']
+        assert archive.read('i1_Ada.pdf') == pdf_bytes
+        rows = list(csv.DictReader(io.StringIO(archive.read('reports.csv').decode('utf-8'))))
+
+    assert list(rows[0]) == CSV_FIELDS
+    assert (rows[0]['interview_id'], rows[0]['pdf']) == ('i1', 'i1_Ada.pdf')
+    assert (rows[1]['interview_id'], rows[1]['pdf'], rows[1]['report_status']) == ('i2', '', 'queued')
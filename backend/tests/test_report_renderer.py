@@ -0,0 +1,54 @@
+from report_renderer import (ANSWER, BLANK, BODY, HEADING, QA_HEADING, QUESTION, ReportBlock, get_status_color,
+                             parse_report, render_report_pdf)
+
+REPORT = """CANDIDATE OVERVIEW
+The candidate has five years of backend experience.
+
+SCORE: 7/10
+RECOMMENDATION SUMMARY
+Clear communicator.
+
+INTERVIEW QUESTIONS & ANSWERS:
+Question 1: How would you speed up a slow query?
+Response: Add an index.
+Answer score: 8/10
+stray line
+"""
+
+
+def test_parse_report_types_every_block():
+    parsed = parse_report(REPORT)
+    assert parsed.score == "7/10"
+    assert parsed.blocks == [
+        ReportBlock(HEADING, "CANDIDATE OVERVIEW"),
+        ReportBlock(BODY, "The candidate has five years of backend experience."),
+        ReportBlock(BLANK, ""),
+        ReportBlock(BODY, "Clear communicator."),
+        ReportBlock(BLANK, ""),
+        ReportBlock(QA_HEADING, "INTERVIEW QUESTIONS & ANSWERS:"),
+        ReportBlock(QUESTION, "Question 1: How would you speed up a slow query?"),
+        ReportBlock(ANSWER, "Response: Add an index."),
+        ReportBlock(ANSWER, "Answer score: 8/10"),
+        ReportBlock(BLANK, ""),
+    ]
+
+
+def test_only_the_first_score_is_the_headline():
+    parsed = parse_report("SCORE: 6/10\nbody\nSCORE: 9/10\n")
+    assert parsed.score == "6/10"
+    assert parsed.blocks == [ReportBlock(BODY, "body"), ReportBlock(BLANK, "")]
+
+
+def test_report_without_score():
+    assert parse_report("Just text").score is None
+
+
+def test_status_colors():
+    assert get_status_color("Selected") == "#4CAF50"
+    assert get_status_color("Moved to Next Round") == "#2196F3"
+    assert get_status_color("Pending Review") == "#757575"
+
+
+def test_render_report_pdf_escapes_markup():
+    pdf = render_report_pdf("Answer uses <b> & <script> tags\n" + REPORT, candidate_name="A <B>")
+    assert pdf.startswith(b"%PDF")
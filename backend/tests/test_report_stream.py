@@ -0,0 +1,46 @@
+import mongomock
+import pytest
+
+from report_stream import REPORT_COMPLETE, ReportStreamWriter, parse_heading
+
+
+@pytest.mark.parametrize('line, expected', [
+    ("1. CANDIDATE OVERVIEW", ("CANDIDATE OVERVIEW", "")),
+    ("**2. STRENGTHS**", ("STRENGTHS", "")),
+    ("### 7. SCORE: 8/10", ("SCORE", "8/10")),
+    ("6. OVERALL RECOMMENDATION: **Next Round**", ("OVERALL RECOMMENDATION", "Next Round")),
+    ("  3. AREAS FOR IMPROVEMENT  ", ("AREAS FOR IMPROVEMENT", "")),
+])
+def test_numbered_headings_are_recognised(line, expected):
+    assert parse_heading(line) == expected
+
+
+@pytest.mark.parametrize('line', [
+    "The candidate explained 2. things well.",
+    "1. the candidate was articulate",
+    "STRENGTHS",
+    "",
+])
+def test_other_lines_are_not_headings(line):
+    assert parse_heading(line) is None
+
+
+def test_writer_persists_sections_as_they_complete():
+    db = mongomock.MongoClient().ai_interviewer
+    db.interviews.insert_one({'interview_id': 'i1'})
+    writer = ReportStreamWriter(db, 'i1', flush_interval=60)
+    writer.start()
+
+    writer.feed("1. CANDIDATE OVERVIEW\nStrong back")
+    writer.feed("end experience.\n2. SCO")
+    # A section closes once the next heading line is complete
+    assert db.interviews.find_one({'interview_id': 'i1'})['report_sections'] == []
+    writer.feed("RE: 8/10\n")
+    sections = db.interviews.find_one({'interview_id': 'i1'})['report_sections']
+    assert sections == [{'title': 'CANDIDATE OVERVIEW', 'content': 'Strong backend experience.'}]
+
+    text = writer.finish()
+    interview = db.interviews.find_one({'interview_id': 'i1'})
+    assert text == "1. CANDIDATE OVERVIEW\nStrong backend experience.\n2. SCORE: 8/10\n"
+    assert interview['report_status'] == REPORT_COMPLETE
+    assert interview['report_sections'][-1] == {'title': 'SCORE', 'content': '8/10'}
@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from resume_analysis import ResumeAnalysisError, parse_analysis, profile_summary
+
+PROFILE = {'skills': ['Python', ' '], 'experience': ['Backend at Acme'], 'education': [], 'achievements': []}
+
+
+def test_parse_analysis_returns_profile_and_questions():
+    content = json.dumps({'profile': PROFILE, 'questions': [' How did you scale Acme? ', 'Why Python?', 'Extra?']})
+    profile, questions = parse_analysis(content)
+
+    assert profile['skills'] == ['Python']
+    assert questions == ['How did you scale Acme?', 'Why Python?']
+    assert profile_summary(profile) == "Technical skills:\n- Python\nWork experience and projects:\n- Backend at Acme"
+
+
+def test_missing_profile_sections_default_to_empty():
+    profile, _ = parse_analysis(json.dumps({'profile': {'skills': ['Go']}, 'questions': ['A?', 'B?']}))
+    assert profile == {'skills': ['Go'], 'experience': [], 'education': [], 'achievements': []}
+
+
+@pytest.mark.parametrize('content, message', [
+    ('not json', 'not valid JSON'),
+    (json.dumps([]), "no 'profile'"),
+    (json.dumps({'profile': {'skills': 'Python'}, 'questions': ['A?', 'B?']}), "'skills' must be a list"),
+    (json.dumps({'profile': PROFILE, 'questions': ['Only one?', '  ']}), 'Expected 2 questions, got 1'),
+    (json.dumps({'profile': PROFILE}), "'questions' must be a list"),
+])
+def test_malformed_analyses_are_rejected(content, message):
+    with pytest.raises(ResumeAnalysisError, match=message):
+        parse_analysis(content)
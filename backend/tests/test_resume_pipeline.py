@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+
+import mongomock
+import pytest
+
+from resume_pipeline import ResumePipeline
+
+
+class RecordingPipeline(ResumePipeline):
+    def __init__(self, db):
+        super().__init__(db, extract_text=None, parse_resume=None, generate_questions=None,
+                         provision_room=None, stale_seconds=60)
+        self.submitted = []
+
+    def submit(self, interview_id, resume_path, resume_sha256, user_id):
+        self.submitted.append((interview_id, resume_path, resume_sha256, user_id))
+
+
+@pytest.fixture
+def pipeline():
+    return RecordingPipeline(mongomock.MongoClient().ai_interviewer)
+
+
+def add_interview(pipeline, interview_id, age_seconds, **fields):
+    processing = ResumePipeline.initial_processing_state()
+    processing['started_at'] = datetime.now(timezone.utc) - timedelta(seconds=age_seconds)
+    processing.update(fields.pop('processing', {}))
+    pipeline.db.interviews.insert_one(dict({
+        'interview_id': interview_id,
+        'resume_path': f'/uploads/{interview_id}.pdf',
+        'resume_sha256': 'abc',
+        'user_id': 'u1',
+        'status': 'processing',
+        'processing': processing
+    }, **fields))
+
+
+def test_a_stale_run_is_requeued_once(pipeline):
+    add_interview(pipeline, 'i1', age_seconds=120)
+    assert pipeline.requeue_stale_runs() == 1
+    assert pipeline.submitted == [('i1', '/uploads/i1.pdf', 'abc', 'u1')]
+    interview = pipeline.db.interviews.find_one({'interview_id': 'i1'})
+    assert interview['status'] == 'processing'
+    assert interview['processing']['requeued'] is True
+    # The fresh start time keeps the requeued run from being picked up again right away
+    assert pipeline.requeue_stale_runs() == 0
+
+
+def test_a_run_in_progress_is_left_alone(pipeline):
+    add_interview(pipeline, 'i1', age_seconds=10)
+    assert pipeline.requeue_stale_runs() == 0
+    assert pipeline.submitted == []
+
+
+def test_a_requeued_run_that_stalls_again_is_marked_failed(pipeline):
+    add_interview(pipeline, 'i1', age_seconds=120, processing={'requeued': True})
+    assert pipeline.requeue_stale_runs() == 0
+    interview = pipeline.db.interviews.find_one({'interview_id': 'i1'})
+    assert interview['status'] == 'failed'
+    assert interview['processing']['error'] == 'Resume processing was interrupted'
+    assert pipeline.submitted == []
+
+
+def test_a_stale_run_without_its_resume_is_marked_failed(pipeline):
+    add_interview(pipeline, 'i1', age_seconds=120, resume_path=None)
+    pipeline.requeue_stale_runs()
+    assert pipeline.db.interviews.find_one({'interview_id': 'i1'})['status'] == 'failed'
+    assert pipeline.submitted == []
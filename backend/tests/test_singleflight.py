@@ -0,0 +1,110 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import mongomock
+import pytest
+
+from singleflight import MongoLeaseStore, Singleflight, request_key, response_from_dict, response_to_dict
+
+
+def completion(text):
+    return SimpleNamespace(
+        model='gpt-3.5-turbo',
+        choices=[SimpleNamespace(index=0, finish_reason='stop', message=SimpleNamespace(content=text))],
+        usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+    )
+
+
+def run_concurrently(flight, key, fn, callers=5):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do(key, fn, timeout=5))) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def slow(calls, value='report'):
+    def fn():
+        calls.append(1)
+        time.sleep(0.2)
+        return value
+    return fn
+
+
+def test_request_key_ignores_argument_order():
+    assert request_key(model='m', temperature=0.3) == request_key(temperature=0.3, model='m')
+    assert request_key(model='m', temperature=0.3) != request_key(model='m', temperature=0.7)
+
+
+def test_concurrent_identical_calls_run_once():
+    calls = []
+    results = run_concurrently(Singleflight(), 'k', slow(calls))
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert all(result == 'report' for result, _ in results)
+
+
+def test_waiters_see_the_leaders_error():
+    flight = Singleflight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.2)
+        raise RuntimeError('rate limited')
+
+    errors = []
+
+    def call():
+        try:
+            flight.do('k', fail, timeout=5)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    waiter = threading.Thread(target=call)
+    waiter.start()
+    leader.join()
+    waiter.join()
+    assert errors == ['rate limited', 'rate limited']
+
+
+def test_a_finished_key_runs_again():
+    calls = []
+    flight = Singleflight()
+    flight.do('k', slow(calls), timeout=5)
+    assert flight.do('k', slow(calls), timeout=5) == ('report', False)
+    assert len(calls) == 2
+
+
+def test_response_round_trips_through_plain_data():
+    restored = response_from_dict(response_to_dict(completion('Hello')))
+    assert restored.choices[0].message.content == 'Hello'
+    assert restored.usage.total_tokens == 15
+
+
+def test_lease_store_shares_the_result_across_workers():
+    db = mongomock.MongoClient().ai_interviewer
+    calls = []
+    fn = lambda: calls.append(1) or completion('shared')
+    # Two Singleflights stand in for two worker processes sharing one database
+    first, second = Singleflight(MongoLeaseStore(db)), Singleflight(MongoLeaseStore(db))
+
+    response, shared = first.do('k', fn, timeout=5)
+    assert (response.choices[0].message.content, shared) == ('shared', False)
+    response, shared = second.do('k', fn, timeout=5)
+    assert (response.choices[0].message.content, shared) == ('shared', True)
+    assert len(calls) == 1
+
+
+def test_lease_store_waiter_times_out_on_a_running_lease():
+    db = mongomock.MongoClient().ai_interviewer
+    store = MongoLeaseStore(db, poll_interval=0.01)
+    assert store._acquire('k', 'other-worker')
+    with pytest.raises(TimeoutError):
+        store.run('k', lambda: completion('never'), deadline=time.monotonic() + 0.05)
@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import mongomock
+import websockets
+
+import streaming_transcription
+from streaming_transcription import StreamingTranscriptionServer
+
+
+class FakeSession:
+    """Stands in for the ffmpeg-backed session; every finish() yields the same text."""
+
+    def __init__(self, server, websocket, interview_id, question_index, question):
+        self.interview_id = interview_id
+        self.question_index = question_index
+        self.question = question
+        self.websocket_open = True
+        self.received_bytes = 0
+
+    async def start(self):
+        pass
+
+    async def feed(self, chunk):
+        self.received_bytes += len(chunk)
+
+    async def finish(self):
+        return "I would add an index on the query fields."
+
+    async def abort(self):
+        pass
+
+
+class DisconnectingWebSocket:
+    """Sends start, one audio chunk and stop, then is gone before the final message."""
+
+    def __init__(self, interview_id):
+        self.messages = [b'audio', json.dumps({'type': 'stop'})]
+        self.start = json.dumps({'type': 'start', 'interview_id': interview_id, 'question_index': 0})
+
+    async def recv(self):
+        return self.start
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.messages:
+            raise StopAsyncIteration
+        return self.messages.pop(0)
+
+    async def send(self, message):
+        raise websockets.ConnectionClosed(None, None)
+
+
+def make_server():
+    db = mongomock.MongoClient().ai_interviewer
+    db.interviews.insert_one({'interview_id': 'i1', 'questions': ['How would you speed up a slow query?'], 'responses': []})
+    stored = []
+    server = StreamingTranscriptionServer(db, registry=None, on_response=lambda i, r: stored.append(r))
+    return db, server, stored
+
+
+def test_disconnect_after_stop_stores_the_answer_once(monkeypatch):
+    monkeypatch.setattr(streaming_transcription, 'StreamingSession', FakeSession)
+    db, server, stored = make_server()
+
+    asyncio.run(server._handle(DisconnectingWebSocket('i1')))
+
+    responses = db.interviews.find_one({'interview_id': 'i1'})['responses']
+    assert len(responses) == 1
+    assert responses[0]['stream_complete'] is True
+    assert len(stored) == 1
+
+
+def test_store_final_ignores_a_second_answer_for_the_same_question():
+    db, server, stored = make_server()
+    session = FakeSession(server, None, 'i1', 0, 'How would you speed up a slow query?')
+
+    assert server._store_final(session, 'first', True) is True
+    assert server._store_final(session, 'second', False) is False
+
+    responses = db.interviews.find_one({'interview_id': 'i1'})['responses']
+    assert [r['transcription'] for r in responses] == ['first']
+    assert len(stored) == 1
@@ -0,0 +1,57 @@
+import random
+
+from transcript_budget import budget_transcript, clean_answer, compact_answer, count_tokens
+
+WORDS = "index query latency cache queue retry shard replica tracing profile planner throughput memory".split()
+
+
+def long_answer(rng, sentences=20):
+    return ' '.join(' '.join(rng.choice(WORDS) for _ in range(12)) + '.' for _ in range(sentences))
+
+
+def test_clean_answer_drops_fillers_and_repeated_sentences():
+    assert clean_answer("Um, I used a queue. I used a queue. Uh it worked.") == "I used a queue. it worked."
+
+
+def test_compact_answer_stays_within_max_tokens():
+    answer = long_answer(random.Random(0))
+    compacted = compact_answer(answer, 60)
+    assert count_tokens(compacted) <= 60
+    assert compacted.endswith('...')
+
+
+def test_short_transcript_is_kept_verbatim():
+    text, stats = budget_transcript([("How do you scale reads?", "With replicas and a cache.")], 3000)
+    assert text == "Q1: How do you scale reads?\nA1: With replicas and a cache."
+    assert (stats['compacted_answers'], stats['dropped_answers'], stats['overrun_tokens']) == (0, 0, 0)
+
+
+def test_long_interview_stays_within_the_budget():
+    rng = random.Random(1)
+    items = [(f"Question {i} about systems design?", long_answer(rng)) for i in range(100)]
+    text, stats = budget_transcript(items, 3000)
+
+    assert count_tokens(text) == stats['prompt_tokens'] <= 3000
+    assert stats['dropped_answers'] > 0
+    assert stats['overrun_tokens'] == 0
+    assert "Left out to fit the token budget:" in text
+
+
+def test_answers_with_the_least_content_are_left_out_first():
+    rng = random.Random(2)
+    items = [(f"Question {i}?", long_answer(rng, 3)) for i in range(10)]
+    items[4] = ("Question 4?", "Yeah, I mean, it was okay, you know, really.")
+    text, stats = budget_transcript(items, 240, min_answer_tokens=20)
+
+    assert stats['dropped_answers'] >= 1
+    assert "A5:" not in text
+    note = text.rsplit("\n\n", 1)[-1]
+    assert note.startswith("Left out to fit the token budget: ")
+    assert "Q5" in note.rstrip('.').split(': ', 1)[1].split(', ')
+
+
+def test_overrun_is_reported_when_even_the_questions_do_not_fit():
+    items = [(f"Question {i} about systems design?", "An answer.") for i in range(50)]
+    _, stats = budget_transcript(items, 20)
+    assert stats['dropped_answers'] == 50
+    assert stats['overrun_tokens'] == stats['prompt_tokens'] - 20 > 0
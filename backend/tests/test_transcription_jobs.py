@@ -0,0 +1,54 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import mongomock
+import pytest
+
+# transcription_jobs loads the transcription backends, which import whisper
+pytest.importorskip('whisper')
+
+from transcription_jobs import TranscriptionJobQueue, _terminate_pool
+
+
+def hung_pool():
+    executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+    executor.submit(time.sleep, 60)
+    deadline = time.monotonic() + 30
+    while not executor._processes and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return executor, list(executor._processes.values())
+
+
+def wait_dead(processes, timeout=10):
+    deadline = time.monotonic() + timeout
+    while any(p.is_alive() for p in processes) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return not any(p.is_alive() for p in processes)
+
+
+def test_terminate_pool_kills_a_worker_stuck_in_a_call():
+    executor, processes = hung_pool()
+    assert processes
+    _terminate_pool(executor)
+    assert wait_dead(processes)
+
+
+def test_reset_replaces_the_pool_and_kills_its_workers():
+    queue = TranscriptionJobQueue(mongomock.MongoClient().ai_interviewer, audio_store=None, backend='process')
+    executor, processes = hung_pool()
+    queue._executor = executor
+
+    queue._reset_executor(executor)
+    assert queue._executor is None
+    assert wait_dead(processes)
+
+
+def test_reset_of_an_already_replaced_pool_keeps_the_new_one():
+    queue = TranscriptionJobQueue(mongomock.MongoClient().ai_interviewer, audio_store=None, backend='local')
+    old = queue._get_executor()
+    queue._executor = None
+    new = queue._get_executor()
+
+    queue._reset_executor(old)
+    assert queue._executor is new
@@ -0,0 +1,51 @@
+import numpy as np
+
+from vad import detect_speech
+
+RATE = 16000
+
+
+def tone(seconds, amplitude=0.3, frequency=220):
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def hum(seconds, amplitude=0.001):
+    return np.random.default_rng(0).normal(0, amplitude, int(RATE * seconds)).astype(np.float32)
+
+
+def test_silence_is_reported_as_silent():
+    region = detect_speech(np.zeros(RATE * 2, dtype=np.float32))
+    assert region.is_silent
+    assert region.speech_seconds == 0
+    assert region.audio_seconds == 2
+
+
+def test_steady_hum_is_not_speech():
+    assert detect_speech(hum(2)).is_silent
+
+
+def test_speech_between_pauses_is_trimmed_with_padding():
+    samples = np.concatenate([hum(1), tone(1), hum(1)])
+    region = detect_speech(samples, padding_ms=250)
+
+    assert not region.is_silent
+    assert abs(region.start / RATE - 0.75) < 0.05
+    assert abs(region.end / RATE - 2.25) < 0.05
+    assert abs(region.skipped_seconds - 1.5) < 0.1
+
+
+def test_a_short_click_is_too_short_to_be_speech():
+    samples = np.concatenate([hum(1), tone(0.06), hum(1)])
+    assert detect_speech(samples, min_speech_ms=200).is_silent
+
+
+def test_clip_shorter_than_a_frame_is_silent():
+    region = detect_speech(tone(0.01))
+    assert region.is_silent
+    assert region.total == 160
+
+
+def test_speech_without_pauses_is_kept_whole():
+    region = detect_speech(tone(2))
+    assert (region.start, region.end) == (0, RATE * 2)
@@ -0,0 +1,186 @@
+import math
+import re
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional; token counts are estimated without it
+    tiktoken = None
+
+FILLER_PATTERN = re.compile(r"\b(?:um+|uh+|erm+|hmm+|you know|i mean)\b[,.]?\s*", re.IGNORECASE)
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+WORD_PATTERN = re.compile(r"[a-z0-9+#]+")
+STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from had has have how i if in into is it its
+just like me my of on or our so some such than that the their them then there these they this to too
+us very was we were what when which while who will with would you your yeah okay ok really actually
+""".split())
+
+_encodings = {}
+
+
+def count_tokens(text, model='gpt-3.5-turbo'):
+    """Tokens in text for model, or an estimate of four characters per token without tiktoken."""
+    if not text:
+        return 0
+    if tiktoken is None:
+        return math.ceil(len(text) / 4)
+    encoding = _encodings.get(model)
+    if encoding is None:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding('cl100k_base')
+        _encodings[model] = encoding
+    return len(encoding.encode(text))
+
+
+def tokenizer_name():
+    return 'tiktoken' if tiktoken is not None else 'estimate'
+
+
+def clean_answer(answer):
+    """Drop filler words and sentences repeated verbatim, which carry no information for the assessor."""
+    text = FILLER_PATTERN.sub('', ' '.join(answer.split()))
+    seen = set()
+    sentences = []
+    for sentence in SENTENCE_PATTERN.split(text):
+        key = ' '.join(WORD_PATTERN.findall(sentence.lower()))
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        sentences.append(sentence.strip())
+    return ' '.join(sentences)
+
+
+def content_words(text):
+    """Distinct words of text that carry meaning, used to rank text by the information it holds."""
+    return set(w for w in WORD_PATTERN.findall(text.lower()) if w not in STOPWORDS and len(w) > 2)
+
+
+def _truncate(text, max_tokens, model):
+    words = text.split()
+    # Binary search for the longest word prefix that fits
+    low, high = 0, len(words)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if count_tokens(' '.join(words[:mid]), model) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return ' '.join(words[:low])
+
+
+def compact_answer(answer, max_tokens, model='gpt-3.5-turbo'):
+    """Extractive summary of answer within max_tokens.
+
+    Sentences are ranked by how many content words they add that earlier
+    picks do not already cover, and the best ones are kept in their
+    original order, joined by an ellipsis where text was cut.
+    """
+    if count_tokens(answer, model) <= max_tokens:
+        return answer
+    sentences = [s.strip() for s in SENTENCE_PATTERN.split(answer) if s.strip()]
+    if len(sentences) < 2:
+        return _truncate(answer, max_tokens - 1, model) + ' ...'
+
+    words = [content_words(s) for s in sentences]
+    lengths = [count_tokens(s, model) for s in sentences]
+    chosen = set()
+    covered = set()
+    used = 0
+    while True:
+        best, best_score = None, 0.0
+        for i, sentence_words in enumerate(words):
+            if i in chosen or used + lengths[i] + 2 > max_tokens:
+                continue
+            # New information per token; the opening sentence usually frames the answer
+            score = len(sentence_words - covered) / math.sqrt(lengths[i] or 1) + (0.5 if i == 0 else 0.0)
+            if score > best_score:
+                best, best_score = i, score
+        if best is None:
+            break
+        chosen.add(best)
+        covered |= words[best]
+        used += lengths[best] + 2
+
+    if not chosen:
+        return _truncate(sentences[0], max_tokens - 1, model) + ' ...'
+    parts = []
+    for i in sorted(chosen):
+        if parts and i - 1 not in chosen:
+            parts.append('...')
+        parts.append(sentences[i])
+    if max(chosen) < len(sentences) - 1:
+        parts.append('...')
+    return ' '.join(parts)
+
+
+def _allowances(answer_tokens, kept, remaining, min_answer_tokens):
+    """Share remaining tokens among the kept answers, shortest first."""
+    allowance = {}
+    order = sorted(kept, key=lambda i: answer_tokens[i])
+    for position, i in enumerate(order):
+        share = max(min_answer_tokens, remaining // (len(order) - position))
+        allowance[i] = min(answer_tokens[i], share)
+        remaining = max(0, remaining - allowance[i])
+    return allowance
+
+
+def budget_transcript(qa_items, budget_tokens, model='gpt-3.5-turbo', min_answer_tokens=40):
+    """Render (question, answer) pairs as a Q/A transcript of at most budget_tokens.
+
+    Every answer is cleaned of filler first. Answers are then granted tokens
+    shortest first: each gets an equal share of what is left, answers that
+    fit their share are kept verbatim and the unused remainder flows to the
+    longer ones, which are compacted to their share. When even
+    min_answer_tokens per answer does not fit, the answers with the fewest
+    content words are left out and listed in one closing line. Returns
+    (text, stats); stats report left-out answers and any tokens over budget.
+    """
+    questions = [f"Q{i+1}: {question}\nA{i+1}: " for i, (question, _) in enumerate(qa_items)]
+    answers = [clean_answer(answer) for _, answer in qa_items]
+    answer_tokens = [count_tokens(answer, model) for answer in answers]
+    question_tokens = [count_tokens(q, model) for q in questions]
+    separator_tokens = count_tokens("\n\n", model)
+    original_tokens = sum(count_tokens(f"{q}{a}", model) for q, (_, a) in zip(questions, qa_items))
+
+    # Least informative answers go first when the transcript does not fit
+    drop_order = sorted(range(len(answers)), key=lambda i: (len(content_words(answers[i])), -answer_tokens[i], i))
+    kept = set(range(len(answers)))
+    for i in drop_order:
+        needed = sum(question_tokens[j] + min(answer_tokens[j], min_answer_tokens) + separator_tokens for j in kept)
+        if needed <= budget_tokens:
+            break
+        kept.discard(i)
+
+    while True:
+        dropped = [i for i in range(len(answers)) if i not in kept]
+        note = f"Left out to fit the token budget: {', '.join(f'Q{i+1}' for i in dropped)}." if dropped else ''
+        remaining = budget_tokens - count_tokens(note, model) - sum(question_tokens[i] + separator_tokens for i in kept)
+        allowance = _allowances(answer_tokens, kept, max(0, remaining), min_answer_tokens)
+
+        compacted = 0
+        pairs = []
+        for i in sorted(kept):
+            answer = answers[i]
+            if answer_tokens[i] > allowance[i]:
+                answer = compact_answer(answer, allowance[i], model)
+                compacted += 1
+            pairs.append(questions[i] + answer)
+        text = "\n\n".join(pairs + ([note] if note else []))
+        prompt_tokens = count_tokens(text, model)
+        # Token counts of the parts do not quite add up to the count of the joined text
+        if prompt_tokens <= budget_tokens or not kept:
+            break
+        kept.discard(next(i for i in drop_order if i in kept))
+
+    return text, {
+        'budget_tokens': budget_tokens,
+        'original_tokens': original_tokens,
+        'prompt_tokens': prompt_tokens,
+        'answers': len(answers),
+        'compacted_answers': compacted,
+        'dropped_answers': len(dropped),
+        'overrun_tokens': max(0, prompt_tokens - budget_tokens),
+        'tokenizer': tokenizer_name()
+    }
@@ -0,0 +1,115 @@
+import os
+
+from audio_decode import decode_audio_bytes, audio_duration_seconds, AudioDecodeError
+from vad import detect_speech
+
+NO_SPEECH_TEXT = "No speech detected in audio recording"
+
+
+def read_audio_source(audio_source):
+    """Return encoded audio bytes from either raw bytes or a file path."""
+    if isinstance(audio_source, (bytes, bytearray)):
+        return bytes(audio_source)
+    if not os.path.exists(audio_source):
+        raise FileNotFoundError(f"Audio file not found at {audio_source}")
+    with open(audio_source, 'rb') as f:
+        return f.read()
+
+
+def run_transcription(audio_source, registry, ffmpeg_binary="ffmpeg", trim_silence=True, cache=None):
+    """Decode and transcribe audio, raising on failure.
+
+    Returns a dict with the text and how much of the clip was actually sent
+    to the model. Used directly by the background job workers so they can
+    tell permanent decode failures apart from errors worth retrying.
+    """
+    audio_data = read_audio_source(audio_source)
+    print(f"Starting Whisper transcription for {len(audio_data)} bytes of audio")
+
+    # Decode straight to a 16 kHz mono float32 buffer via ffmpeg stdin/stdout
+    samples = decode_audio_bytes(audio_data, ffmpeg_binary=ffmpeg_binary)
+    print(f"Decoded {len(samples)} samples ({audio_duration_seconds(samples):.2f}s of audio)")
+
+    # Retried or duplicate uploads decode to the same samples and skip the model
+    cache_key = None
+    if cache is not None:
+        try:
+            cache_key = cache.key(samples)
+            cached = cache.get(cache_key)
+            if cached:
+                print(f"Transcription cache hit for {cache_key[:12]}")
+                cached['cache_hit'] = True
+                return cached
+        except Exception as e:
+            print(f"Error reading transcription cache: {str(e)}")
+
+    details = transcribe_samples(samples, registry, trim_silence)
+    details['cache_hit'] = False
+
+    if cache_key is not None:
+        try:
+            cache.put(cache_key, details)
+        except Exception as e:
+            print(f"Error writing transcription cache: {str(e)}")
+
+    return details
+
+
+def transcribe_samples(samples, registry, trim_silence=True):
+    """Transcribe a decoded 16 kHz clip, trimming silence first if asked."""
+    audio_seconds = audio_duration_seconds(samples)
+    details = {
+        'text': NO_SPEECH_TEXT,
+        'audio_seconds': round(audio_seconds, 2),
+        'speech_seconds': round(audio_seconds, 2),
+        'skipped_seconds': 0.0,
+        'model_invoked': False
+    }
+
+    if trim_silence:
+        # Drop leading/trailing silence; fully silent clips never reach the model
+        region = detect_speech(samples)
+        details['speech_seconds'] = round(region.speech_seconds, 2)
+        details['skipped_seconds'] = round(region.skipped_seconds, 2)
+        if region.is_silent:
+            print(f"No speech detected by VAD, skipped {region.audio_seconds:.2f}s of audio")
+            return details
+        samples = samples[region.start:region.end]
+        print(f"VAD trimmed {region.skipped_seconds:.2f}s of silence, {region.speech_seconds:.2f}s left")
+
+    # Transcribe using the shared Whisper model (loaded once per process)
+    print(f"Transcribing audio...")
+    result = registry.transcribe(samples)
+    transcription = result["text"].strip()
+    details['model_invoked'] = True
+
+    print(f"=== WHISPER TRANSCRIPTION RESULT ===")
+    print(f"Transcribed text: '{transcription}'")
+    print(f"=====================================")
+
+    if not transcription:
+        transcription = NO_SPEECH_TEXT
+        print("Warning: Empty transcription result")
+
+    details['text'] = transcription
+    return details
+
+
+def transcribe(audio_source, registry, ffmpeg_binary="ffmpeg", trim_silence=True, cache=None):
+    """Transcribe audio to text, returning an error message instead of raising."""
+    try:
+        return run_transcription(audio_source, registry, ffmpeg_binary, trim_silence, cache)['text']
+    except FileNotFoundError as e:
+        error_msg = f"Audio file not found error: {str(e)}"
+        print(error_msg)
+        return f"Error during Whisper transcription: {error_msg}"
+    except AudioDecodeError as e:
+        error_msg = str(e)
+        print(error_msg)
+        return f"Error during audio conversion: {error_msg}"
+    except Exception as e:
+        error_msg = f"Error transcribing audio: {str(e)}"
+        print(error_msg)
+        import traceback
+        print(traceback.format_exc())
+        return f"Error during Whisper transcription: {str(e)}"
@@ -0,0 +1,98 @@
+import whisper
+
+from model_registry import ModelRegistry
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:  # faster-whisper is optional
+    WhisperModel = None
+
+
+class WhisperBackend:
+    """openai-whisper on PyTorch, the original engine."""
+
+    engine = 'whisper'
+
+    def __init__(self, model_name='base'):
+        self.model_name = model_name
+        self.registry = ModelRegistry(default_model=model_name, loader=whisper.load_model)
+
+    @property
+    def spec(self):
+        return f"{self.engine}:{self.model_name}"
+
+    def load(self):
+        return self.registry.get()
+
+    def transcribe(self, samples, **options):
+        options.setdefault('fp16', False)
+        return self.registry.transcribe(samples, **options)
+
+    def warm_in_background(self):
+        return self.registry.warm_in_background()
+
+    def stats(self):
+        stats = self.registry.stats()
+        stats['backend'] = self.spec
+        return stats
+
+
+class FasterWhisperBackend:
+    """CTranslate2 (faster-whisper) engine, int8-quantized on CPU by default."""
+
+    engine = 'faster-whisper'
+
+    def __init__(self, model_name='base', compute_type='int8', device='cpu', cpu_threads=0, beam_size=5):
+        if WhisperModel is None:
+            raise ImportError("faster-whisper is not installed. Install it with: pip install faster-whisper")
+        self.model_name = model_name
+        self.compute_type = compute_type
+        self.beam_size = beam_size
+        self.registry = ModelRegistry(
+            default_model=model_name,
+            loader=lambda name: WhisperModel(name, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+        )
+
+    @property
+    def spec(self):
+        return f"{self.engine}:{self.model_name}:{self.compute_type}"
+
+    def load(self):
+        return self.registry.get()
+
+    def transcribe(self, samples, **options):
+        # Only the options both engines understand are passed through
+        kwargs = {'beam_size': self.beam_size}
+        for key in ('initial_prompt', 'language'):
+            if options.get(key) is not None:
+                kwargs[key] = options[key]
+
+        def run(model):
+            segments, info = model.transcribe(samples, **kwargs)
+            # Segments are generated lazily, consume them while holding the lock
+            return {'text': " ".join(segment.text.strip() for segment in segments), 'language': info.language}
+
+        return self.registry.run(run)
+
+    def warm_in_background(self):
+        # A dummy clip would be decoded lazily, so warming only loads the model
+        return self.registry.warm_in_background(run_inference=False)
+
+    def stats(self):
+        stats = self.registry.stats()
+        stats['backend'] = self.spec
+        return stats
+
+
+def create_backend(spec):
+    """Build a backend from a spec such as 'whisper:base' or 'faster-whisper:small:int8'."""
+    parts = spec.split(':')
+    engine = parts[0]
+    model_name = parts[1] if len(parts) > 1 and parts[1] else 'base'
+    if engine == 'whisper':
+        return WhisperBackend(model_name)
+    if engine == 'faster-whisper':
+        compute_type = parts[2] if len(parts) > 2 and parts[2] else 'int8'
+        return FasterWhisperBackend(model_name, compute_type=compute_type)
+    raise ValueError(f"Unknown transcription backend: {spec}")
+
@@ -0,0 +1,93 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from pymongo import MongoClient
+
+from mongo_cache import MongoCache
+
+
+def audio_cache_key(samples, version):
+    """Hash decoded samples together with the model/config version."""
+    digest = hashlib.sha256()
+    digest.update(version.encode('utf-8'))
+    digest.update(samples.tobytes())
+    return digest.hexdigest()
+
+
+class MongoTranscriptionCache(MongoCache):
+    """Transcription cache shared by every worker through MongoDB."""
+
+    def __init__(self, db, version, max_entries=10000, ttl_seconds=30 * 24 * 3600):
+        super().__init__(db.transcription_cache, db.transcription_cache_stats, version, max_entries, ttl_seconds,
+                         value_field='details', name='transcription cache')
+
+    def key(self, samples):
+        return audio_cache_key(samples, self.version)
+
+    def stats(self):
+        return {'backend': 'mongo', **super().stats()}
+
+
+class MemoryTranscriptionCache:
+    """Per-process LRU transcription cache with a time-to-live."""
+
+    def __init__(self, version, max_entries=1000, ttl_seconds=24 * 3600):
+        self.version = version
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, samples):
+        return audio_cache_key(samples, self.version)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(entry[1])
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, details):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), dict(details))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'backend': 'memory',
+                'version': self.version,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0
+            }
+
+
+def create_transcription_cache(backend, version, mongo_uri=None, db_name='ai_interviewer', max_entries=10000,
+                               ttl_seconds=30 * 24 * 3600):
+    """Build the configured cache; backend is 'mongo', 'memory' or 'off'.
+
+    Takes plain settings rather than a client so worker processes can build
+    their own instance from the same configuration.
+    """
+    if backend == 'mongo':
+        return MongoTranscriptionCache(MongoClient(mongo_uri)[db_name], version, max_entries, ttl_seconds)
+    if backend == 'memory':
+        return MemoryTranscriptionCache(version, max_entries, ttl_seconds)
+    return None
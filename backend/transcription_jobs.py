@@ -0,0 +1,318 @@
+import multiprocessing
+import time
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+
+from audio_decode import AudioDecodeError
+from transcription_backends import create_backend
+from transcription import run_transcription
+from transcription_cache import create_transcription_cache
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+
+PENDING_STATUSES = [JOB_QUEUED, JOB_RUNNING]
+
+# State owned by each worker process of the 'process' backend
+_worker_backend = None
+_worker_ffmpeg_binary = None
+_worker_trim_silence = True
+_worker_cache = None
+
+
+def _init_worker_process(backend_spec, ffmpeg_binary, trim_silence, cache_config):
+    """Load the transcription model once when a worker process starts."""
+    global _worker_backend, _worker_ffmpeg_binary, _worker_trim_silence, _worker_cache
+    _worker_backend = create_backend(backend_spec)
+    _worker_ffmpeg_binary = ffmpeg_binary
+    _worker_trim_silence = trim_silence
+    if cache_config:
+        _worker_cache = create_transcription_cache(**cache_config)
+    _worker_backend.load()
+
+
+def _transcribe_in_worker_process(audio_data):
+    return run_transcription(audio_data, _worker_backend, _worker_ffmpeg_binary, _worker_trim_silence, _worker_cache)
+
+
+def _terminate_pool(executor):
+    """Stop a process pool, killing a worker stuck in a call; shutdown() alone leaves that process running."""
+    if hasattr(executor, 'terminate_workers'):
+        executor.terminate_workers()
+        return
+    processes = list((getattr(executor, '_processes', None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+class TranscriptionJobQueue:
+    """Runs answer transcriptions in the background and stores the results.
+
+    Jobs are persisted in the transcription_jobs collection and their audio in
+    the AudioStore, so a restarted worker can pick up whatever was still pending. The
+    'process' backend transcribes in a bounded pool of worker processes; the
+    'local' backend uses threads and the caller's model registry, which is
+    what tests and single-process development use.
+    """
+
+    def __init__(self, db, audio_store, backend='process', workers=2, job_timeout=120, max_attempts=3,
+                 retry_backoff=2.0, registry=None, backend_spec='whisper:base', ffmpeg_binary='ffmpeg', trim_silence=True,
+                 cache=None, cache_config=None, on_response=None):
+        self.db = db
+        # Called with (interview_id, response) once a transcription is stored
+        self.on_response = on_response
+        self.audio_store = audio_store
+        self.backend = backend
+        self.workers = workers
+        self.job_timeout = job_timeout
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.registry = registry
+        self.backend_spec = backend_spec
+        self.ffmpeg_binary = ffmpeg_binary
+        self.trim_silence = trim_silence
+        # 'local' workers share the app's cache; worker processes build their own from cache_config
+        self.cache = cache
+        self.cache_config = cache_config
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        # Supervisor threads claim jobs, wait on the executor and write results
+        self._supervisors = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='transcription-job')
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                if self.backend == 'process':
+                    # Spawn rather than fork: the parent holds threads and possibly a loaded model
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=_init_worker_process,
+                        initargs=(self.backend_spec, self.ffmpeg_binary, self.trim_silence, self.cache_config)
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='transcription-worker')
+            return self._executor
+
+    def _reset_executor(self, executor):
+        """Replace a process pool with a hung or crashed worker; new work goes to a fresh pool.
+
+        The old pool's processes are terminated so they do not keep a loaded
+        model in memory. Other jobs running in it fail with BrokenProcessPool
+        and are retried; their reset is a no-op once the pool was replaced.
+        """
+        with self._executor_lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        _terminate_pool(executor)
+
+    def _run(self, executor, audio_data):
+        if self.backend == 'process':
+            return executor.submit(_transcribe_in_worker_process, audio_data)
+        return executor.submit(run_transcription, audio_data, self.registry, self.ffmpeg_binary, self.trim_silence,
+                               self.cache)
+
+    def find_duplicate(self, interview_id, question_index, audio_sha256):
+        """Return the job already created for this exact upload, if it has not failed."""
+        job = self.db.transcription_jobs.find_one(
+            {
+                'interview_id': interview_id,
+                'question_index': question_index,
+                'audio_sha256': audio_sha256,
+                'status': {'$ne': JOB_FAILED}
+            },
+            {'job_id': 1}
+        )
+        return self.get(job['job_id']) if job else None
+
+    def submit(self, interview_id, question_index, question, audio_file_id, audio_size, audio_sha256=None):
+        """Create a job for audio already saved in the AudioStore and schedule it."""
+        job_id = str(uuid.uuid4())
+        self.db.transcription_jobs.insert_one({
+            'job_id': job_id,
+            'interview_id': interview_id,
+            'question_index': question_index,
+            'question': question,
+            'audio_file_id': audio_file_id,
+            'audio_size': audio_size,
+            'audio_sha256': audio_sha256,
+            'status': JOB_QUEUED,
+            'attempts': 0,
+            'max_attempts': self.max_attempts,
+            'created_at': datetime.now(timezone.utc)
+        })
+        print(f"Queued transcription job {job_id} for interview {interview_id}, question {question_index}")
+        self._supervisors.submit(self._process, job_id)
+        return job_id
+
+    def get(self, job_id):
+        """Return the public status of a job, or None if it does not exist."""
+        job = self.db.transcription_jobs.find_one({'job_id': job_id})
+        if not job:
+            return None
+        return {
+            'job_id': job['job_id'],
+            'interview_id': job['interview_id'],
+            'question_index': job['question_index'],
+            'status': job['status'],
+            'attempts': job.get('attempts', 0),
+            'transcription': job.get('transcription'),
+            'error': job.get('last_error')
+        }
+
+    def _claim(self, job_id):
+        return self.db.transcription_jobs.find_one_and_update(
+            {'job_id': job_id, 'status': JOB_QUEUED},
+            {
+                '$set': {'status': JOB_RUNNING, 'started_at': datetime.now(timezone.utc)},
+                '$inc': {'attempts': 1}
+            },
+            return_document=True
+        )
+
+    def _process(self, job_id):
+        while True:
+            job = self._claim(job_id)
+            if not job:
+                # Already taken by another worker, or finished
+                return
+
+            attempt = job['attempts']
+            print(f"Running transcription job {job_id} (attempt {attempt}/{job['max_attempts']})")
+            executor = self._get_executor()
+            try:
+                future = self._run(executor, self.audio_store.read(job['audio_file_id']))
+                details = future.result(timeout=self.job_timeout)
+                self._complete(job, details)
+                return
+            except AudioDecodeError as e:
+                # The audio itself is unreadable, retrying will not help
+                self._fail(job, str(e), f"Error during audio conversion: {str(e)}")
+                return
+            except FutureTimeoutError:
+                # The stuck call cannot be interrupted; its worker is killed along with the pool
+                error = f"Transcription timed out after {self.job_timeout} seconds"
+                future.cancel()
+                if self.backend == 'process':
+                    self._reset_executor(executor)
+            except BrokenProcessPool as e:
+                error = f"Transcription worker crashed: {str(e)}"
+                self._reset_executor(executor)
+            except Exception as e:
+                error = f"Error transcribing audio: {str(e)}"
+
+            print(f"Transcription job {job_id} attempt {attempt} failed: {error}")
+            if attempt >= job['max_attempts']:
+                self._fail(job, error, f"Error during Whisper transcription: {error}")
+                return
+
+            self.db.transcription_jobs.update_one(
+                {'job_id': job_id},
+                {'$set': {'status': JOB_QUEUED, 'last_error': error}}
+            )
+            # Exponential backoff between attempts
+            time.sleep(self.retry_backoff * (2 ** (attempt - 1)))
+
+    def _store_response(self, job, transcription, details=None):
+        response_data = {
+            'question_index': job['question_index'],
+            'question': job['question'],
+            'transcription': transcription,
+            'timestamp': datetime.now(timezone.utc),
+            'audio_processed': True,
+            'job_id': job['job_id']
+        }
+        if details:
+            response_data['audio_seconds'] = details['audio_seconds']
+            response_data['skipped_seconds'] = details['skipped_seconds']
+        # Guard on job_id so a retried job never appends a second response
+        self.db.interviews.update_one(
+            {'interview_id': job['interview_id'], 'responses.job_id': {'$ne': job['job_id']}},
+            {'$push': {'responses': response_data}}
+        )
+        return response_data
+
+    def _complete(self, job, details):
+        transcription = details['text']
+        response_data = self._store_response(job, transcription, details)
+        # Before the job stops counting as pending, so a follow-up resolver waiting on it sees its work started
+        if self.on_response:
+            try:
+                self.on_response(job['interview_id'], response_data)
+            except Exception as e:
+                print(f"Error in response callback of transcription job {job['job_id']}: {str(e)}")
+        self.db.transcription_jobs.update_one(
+            {'job_id': job['job_id']},
+            {
+                '$set': {
+                    'status': JOB_COMPLETED,
+                    'transcription': transcription,
+                    'audio_seconds': details['audio_seconds'],
+                    'skipped_seconds': details['skipped_seconds'],
+                    'model_invoked': details['model_invoked'],
+                    'cache_hit': details.get('cache_hit', False),
+                    'completed_at': datetime.now(timezone.utc)
+                }
+            }
+        )
+        # Failed jobs keep their audio for debugging, finished ones do not need it
+        self.audio_store.delete(job['audio_file_id'])
+        print(f"Transcription job {job['job_id']} completed: '{transcription}'")
+
+    def _fail(self, job, error, transcription):
+        # Store the error text as the answer so the report notes the missing response
+        self._store_response(job, transcription)
+        self.db.transcription_jobs.update_one(
+            {'job_id': job['job_id']},
+            {'$set': {
+                'status': JOB_FAILED,
+                'last_error': error,
+                'transcription': transcription,
+                'completed_at': datetime.now(timezone.utc)
+            }}
+        )
+        print(f"Transcription job {job['job_id']} failed: {error}")
+
+    def requeue_stale_jobs(self):
+        """Reschedule jobs left queued or running by a previous worker."""
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=self.job_timeout * 2)
+        self.db.transcription_jobs.update_many(
+            {'status': JOB_RUNNING, 'started_at': {'$lt': stale_before}},
+            {'$set': {'status': JOB_QUEUED}}
+        )
+        count = 0
+        for job in self.db.transcription_jobs.find({'status': JOB_QUEUED}, {'job_id': 1}):
+            self._supervisors.submit(self._process, job['job_id'])
+            count += 1
+        if count:
+            print(f"Requeued {count} pending transcription jobs")
+        return count
+
+    def has_pending(self, interview_id, question_index):
+        """True while a transcription of this answer is queued or running."""
+        return self.db.transcription_jobs.count_documents(
+            {'interview_id': interview_id, 'question_index': question_index, 'status': {'$in': PENDING_STATUSES}},
+            limit=1
+        ) > 0
+
+    def wait_for_interview(self, interview_id, timeout=60, poll_interval=0.5):
+        """Block until the interview has no pending jobs; return True if none remain."""
+        deadline = time.monotonic() + timeout
+        while True:
+            pending = self.db.transcription_jobs.count_documents(
+                {'interview_id': interview_id, 'status': {'$in': PENDING_STATUSES}}
+            )
+            if pending == 0:
+                return True
+            if time.monotonic() >= deadline:
+                print(f"Timed out waiting for {pending} transcription jobs of interview {interview_id}")
+                return False
+            time.sleep(poll_interval)
@@ -0,0 +1,65 @@
+import numpy as np
+
+from audio_decode import SAMPLE_RATE
+
+
+class SpeechRegion:
+    """Result of voice activity detection on one clip."""
+
+    def __init__(self, start, end, total, speech_frames, sample_rate=SAMPLE_RATE):
+        self.start = start
+        self.end = end
+        self.total = total
+        self.speech_frames = speech_frames
+        self.sample_rate = sample_rate
+
+    @property
+    def is_silent(self):
+        return self.end <= self.start
+
+    @property
+    def audio_seconds(self):
+        return self.total / float(self.sample_rate)
+
+    @property
+    def speech_seconds(self):
+        return max(0, self.end - self.start) / float(self.sample_rate)
+
+    @property
+    def skipped_seconds(self):
+        return self.audio_seconds - self.speech_seconds
+
+
+def detect_speech(samples, sample_rate=SAMPLE_RATE, frame_ms=30, min_level_db=-50.0, noise_margin_db=12.0,
+                  min_speech_ms=200, padding_ms=250):
+    """Find the span between the first and last voiced frame of a clip.
+
+    Frames are scored by RMS level in dBFS. A frame counts as speech when it
+    is louder than both an absolute floor and the clip's own noise floor
+    (10th percentile level) plus a margin, so steady background hum is not
+    mistaken for an answer. Clips with less than min_speech_ms of voiced
+    frames are reported as silent.
+    """
+    total = len(samples)
+    frame = int(sample_rate * frame_ms / 1000)
+    if total < frame:
+        return SpeechRegion(0, 0, total, 0, sample_rate)
+
+    usable = total - total % frame
+    frames = samples[:usable].reshape(-1, frame)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+    level_db = 20.0 * np.log10(np.maximum(rms, 1e-10))
+
+    noise_floor = np.percentile(level_db, 10)
+    # Without pauses the noise floor is the speech level itself, so never ask
+    # for more than the loudest frame minus the margin
+    threshold = max(min_level_db, min(noise_floor + noise_margin_db, level_db.max() - noise_margin_db))
+    voiced = np.flatnonzero(level_db > threshold)
+
+    if voiced.size * frame_ms < min_speech_ms:
+        return SpeechRegion(0, 0, total, int(voiced.size), sample_rate)
+
+    padding = int(sample_rate * padding_ms / 1000)
+    start = max(0, int(voiced[0]) * frame - padding)
+    end = min(total, (int(voiced[-1]) + 1) * frame + padding)
+    return SpeechRegion(start, end, total, int(voiced.size), sample_rate)
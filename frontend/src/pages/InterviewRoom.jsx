@@ -364,11 +364,30 @@ const InterviewRoom = () => {
       
       const recorder = new MediaRecorder(stream, options);
       const chunks = [];
+      const uploadBase = `/interview/${interviewId}/answers/${questionIndex}/upload`;
+      const chunkUploads = [];
+
+      // Open a resumable upload so chunks can be sent while the candidate is still talking
+      let uploadId = null;
+      try {
+        // A new recording id makes the server drop chunks left over from an earlier attempt at this answer
+        const startResponse = await api.post(uploadBase, {
+          content_type: options.mimeType || 'audio/webm',
+          recording_id: crypto.randomUUID()
+        });
+        uploadId = startResponse.data.upload_id;
+      } catch (startError) {
+        console.warn('Chunked upload unavailable, will upload after recording:', startError);
+      }
 
       recorder.ondataavailable = (event) => {
         console.log('Data available, size:', event.data.size);
         if (event.data.size > 0) {
+          const seq = chunks.length;
           chunks.push(event.data);
+          if (uploadId) {
+            chunkUploads.push(uploadChunk(uploadBase, uploadId, seq, event.data));
+          }
         }
       };
 
@@ -379,7 +398,10 @@ const InterviewRoom = () => {
         console.log('Created blob, size:', audioBlob.size, 'type:', audioBlob.type);
         
         if (audioBlob.size > 0) {
-          await uploadRecording(audioBlob);
+          const finalized = uploadId && await finalizeChunkedUpload(uploadBase, uploadId, chunks, chunkUploads);
+          if (!finalized) {
+            await uploadRecording(audioBlob);
+          }
         } else {
           console.error('No audio data recorded');
           alert('No audio was recorded. Please try again.');
@@ -424,57 +446,86 @@ const InterviewRoom = () => {
     }
   };
 
-  const uploadRecording = async (audioBlob) => {
-    try {
-      console.log('Uploading audio blob, size:', audioBlob.size, 'type:', audioBlob.type);
-      
-      // Convert blob to base64
-      const reader = new FileReader();
-      reader.onloadend = async () => {
-        try {
-          const base64Audio = reader.result;
-          console.log('Base64 audio length:', base64Audio.length);
-
-          const response = await api.post(
-            `/interview/${interviewId}/record-response`,
-            {
-              question_index: questionIndex,
-              audio_blob: base64Audio
-            }
-          );
+  const uploadChunk = async (uploadBase, uploadId, seq, data, attempts = 3) => {
+    for (let attempt = 1; attempt <= attempts; attempt++) {
+      try {
+        await api.put(`${uploadBase}/chunks/${seq}`, data, {
+          params: { upload_id: uploadId },
+          headers: { 'Content-Type': 'application/octet-stream' }
+        });
+        return true;
+      } catch (chunkError) {
+        console.warn(`Chunk ${seq} upload failed (attempt ${attempt}):`, chunkError);
+      }
+    }
+    return false;
+  };
 
-          console.log('Recording uploaded and transcribed:', response.data);
-          
-          // Show transcription to user for verification
-          if (response.data.transcription) {
-            const transcriptionPreview = response.data.transcription.length > 100 
-              ? response.data.transcription.substring(0, 100) + '...' 
-              : response.data.transcription;
-            
-            console.log('Transcription:', transcriptionPreview);
-            // You could show this in a toast notification if desired
-          }
+  const finalizeChunkedUpload = async (uploadBase, uploadId, chunks, chunkUploads) => {
+    try {
+      await Promise.all(chunkUploads);
 
-          // Move to next question after successful recording
+      for (let attempt = 1; attempt <= 2; attempt++) {
+        try {
+          const response = await api.post(`${uploadBase}/finalize`, {
+            upload_id: uploadId,
+            total_chunks: chunks.length
+          });
+          console.log('Chunked upload finalized:', response.data);
           setTimeout(() => {
             handleNextQuestion();
-          }, 1000); // Small delay to let user see the result
-          
-        } catch (uploadError) {
-          console.error('Error in upload request:', uploadError);
-          alert(`Failed to upload recording: ${uploadError.response?.data?.message || uploadError.message}`);
+          }, 1000);
+          return true;
+        } catch (finalizeError) {
+          // The server lists what it has; resend only the missing chunks and try again
+          const received = new Set(finalizeError.response?.data?.received_chunks || []);
+          if (finalizeError.response?.status !== 409) throw finalizeError;
+          await Promise.all(
+            chunks.map((chunk, seq) => (received.has(seq) ? true : uploadChunk(uploadBase, uploadId, seq, chunk)))
+          );
         }
-      };
-      
-      reader.onerror = (error) => {
-        console.error('Error reading audio file:', error);
-        alert('Failed to process audio file. Please try again.');
-      };
+      }
+    } catch (error) {
+      console.error('Chunked upload failed, falling back to single upload:', error);
+    }
+    return false;
+  };
+
+  const uploadRecording = async (audioBlob) => {
+    try {
+      console.log('Uploading audio blob, size:', audioBlob.size, 'type:', audioBlob.type);
+
+      // Send the raw blob as multipart so the server can stream it to storage
+      const formData = new FormData();
+      formData.append('question_index', questionIndex);
+      formData.append('audio', audioBlob, 'answer.webm');
+
+      const response = await api.post(
+        `/interview/${interviewId}/record-response`,
+        formData,
+        { headers: { 'Content-Type': 'multipart/form-data' } }
+      );
+
+      console.log('Recording uploaded for transcription:', response.data);
+
+      // Show transcription to user for verification
+      if (response.data.transcription) {
+        const transcriptionPreview = response.data.transcription.length > 100 
+          ? response.data.transcription.substring(0, 100) + '...' 
+          : response.data.transcription;
+        
+        console.log('Transcription:', transcriptionPreview);
+        // You could show this in a toast notification if desired
+      }
+
+      // Move to next question after successful recording
+      setTimeout(() => {
+        handleNextQuestion();
+      }, 1000); // Small delay to let user see the result
       
-      reader.readAsDataURL(audioBlob);
     } catch (error) {
       console.error('Error uploading recording:', error);
-      alert('Failed to upload recording. Please try again.');
+      alert(`Failed to upload recording: ${error.response?.data?.message || error.message}`);
     }
   };
 
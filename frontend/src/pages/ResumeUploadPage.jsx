@@ -13,10 +13,24 @@ import { Upload as UploadIcon } from '@mui/icons-material';
 import api from '../config/axios';
 import './ResumeUploadPage.css';
 
+const PROCESSING_POLL_INTERVAL_MS = 1000;
+
+const STAGE_LABELS = {
+  store: 'Uploading resume',
+  extract: 'Reading your resume',
+  parse: 'Analysing your experience',
+  questions: 'Preparing questions',
+  room: 'Setting up the interview room',
+  done: 'Starting interview',
+};
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
 const ResumeUploadPage = () => {
   const [file, setFile] = useState(null);
   const [uploading, setUploading] = useState(false);
   const [error, setError] = useState('');
+  const [stage, setStage] = useState('');
   const navigate = useNavigate();
 
   const handleFileChange = (e) => {
@@ -32,6 +46,21 @@ const ResumeUploadPage = () => {
     }
   };
 
+  // The resume is processed in the background; wait until the interview is ready
+  const waitForInterview = async (statusUrl) => {
+    for (;;) {
+      const { data } = await api.get(statusUrl);
+      setStage(data.stage);
+      if (data.status === 'failed') {
+        throw new Error(data.error || 'Failed to prepare the interview.');
+      }
+      if (data.status !== 'processing') {
+        return;
+      }
+      await sleep(PROCESSING_POLL_INTERVAL_MS);
+    }
+  };
+
   const handleUpload = async (e) => {
     e.preventDefault();
     if (!file) {
@@ -41,6 +70,7 @@ const ResumeUploadPage = () => {
 
     setUploading(true);
     setError('');
+    setStage('store');
 
     const formData = new FormData();
     formData.append('resume', file);
@@ -53,13 +83,17 @@ const ResumeUploadPage = () => {
       });
 
       if (response.data) {
+        if (response.data.status_url) {
+          await waitForInterview(response.data.status_url);
+        }
         navigate(`/interview/${response.data.interview_id}`);
       }
     } catch (err) {
-      setError(err.response?.data?.message || 'Failed to upload resume. Please try again.');
+      setError(err.response?.data?.message || err.message || 'Failed to upload resume. Please try again.');
       console.error("Upload error:", err);
     } finally {
       setUploading(false);
+      setStage('');
     }
   };
 
@@ -130,7 +164,7 @@ const ResumeUploadPage = () => {
               disabled={!file || uploading}
               startIcon={uploading ? <CircularProgress size={20} /> : <UploadIcon />}
             >
-              {uploading ? 'Uploading...' : 'Start Interview'}
+              {uploading ? `${STAGE_LABELS[stage] || 'Uploading'}...` : 'Start Interview'}
             </Button>
           </Box>
         </form>